@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for CSVExtractor.analyze_dataframe on a wide synthetic frame
+
+Compares the original per-column loop (isnull().sum(), dropna() and unique()
+on every column) against the real CSVExtractor.analyze_dataframe with its
+defaults, once with column statistics (sketches) and once without. The
+synthetic frame mimics MoveDaily: many columns, most of them almost entirely
+empty.
+
+Usage:
+    python benchmarks/bench_analyze_dataframe.py [--rows 200000] [--columns 120]
+"""
+
+import io
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from ingestion.csv_extractor import CSVExtractor
+
+
+def legacy_analyze_dataframe(df: pd.DataFrame) -> dict:
+    """Per-column analysis loop as it was before the whole-frame rewrite."""
+    analysis = {"data_types": {}, "null_counts": {}, "sample_values": {}}
+    analysis["memory_usage_mb"] = round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+    for column in df.columns:
+        analysis["data_types"][column] = str(df[column].dtype)
+        analysis["null_counts"][column] = int(df[column].isnull().sum())
+        non_null_values = df[column].dropna()
+        if len(non_null_values) > 0:
+            unique_values = non_null_values.unique()
+            analysis["sample_values"][column] = [str(val) for val in unique_values[:3].tolist()]
+        else:
+            analysis["sample_values"][column] = []
+    return analysis
+
+
+def build_wide_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Build a wide frame with ids, numeric, text and mostly-empty columns."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind == 0:
+            data[f"id_{i}"] = np.arange(rows)
+        elif kind == 1:
+            data[f"amount_{i}"] = rng.normal(100, 25, rows).round(2)
+        elif kind == 2:
+            data[f"text_{i}"] = pd.Series(rng.integers(0, 50_000, rows)).map("value-{}".format)
+        else:
+            sparse = np.full(rows, np.nan)
+            filled = rng.random(rows) < 0.01
+            sparse[filled] = rng.integers(0, 10, filled.sum())
+            data[f"sparse_{i}"] = sparse
+    return pd.DataFrame(data)
+
+
+def time_call(func, repeat: int) -> float:
+    """Best wall time of repeat calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    df = build_wide_frame(args.rows, args.columns)
+    with_statistics = CSVExtractor(column_statistics=True)
+    without_statistics = CSVExtractor(column_statistics=False)
+    
+    # Both implementations must agree before timing them
+    legacy = legacy_analyze_dataframe(df)
+    for extractor in (without_statistics, with_statistics):
+        with redirect_stdout(io.StringIO()):
+            analysis = extractor.analyze_dataframe(df)
+        assert legacy["null_counts"] == analysis["null_counts"]
+        assert legacy["sample_values"] == analysis["sample_values"]
+    
+    print(f"\n⏱️  analyze_dataframe on {args.rows:,} rows x {args.columns} columns")
+    
+    before = time_call(lambda: legacy_analyze_dataframe(df), args.repeat)
+    plain = time_call(lambda: without_statistics.analyze_dataframe(df), args.repeat)
+    sketched = time_call(lambda: with_statistics.analyze_dataframe(df), args.repeat)
+    
+    print(f"   Before (per-column loop):           {before * 1000:8.1f} ms")
+    print(f"   analyze_dataframe, no statistics:   {plain * 1000:8.1f} ms  ({before / plain:.1f}x)")
+    print(f"   analyze_dataframe, with statistics: {sketched * 1000:8.1f} ms  ({before / sketched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Async Weaviate Uploader for Knowledge Base
+
+Same public surface as WeaviateUploader, on the Weaviate async client: the
+upload and verification methods are coroutines. DatasetMetadata,
+DataRelationship and DomainTag are independent collections, so upload_all
+uploads them concurrently, and within each collection the insert_many batches
+are in flight together. A semaphore bounds the requests in flight across all
+collections, so network latency overlaps without flooding Weaviate (and the
+Bedrock vectorizer behind it).
+
+Objects that fail with a transient error (timeouts, throttling, unavailable)
+are retried in a further round after a jittered backoff, for as long as the
+RetryPolicy allows; their deterministic UUIDs make a retry overwrite rather
+than duplicate an earlier attempt. Writes to the
+Bedrock-vectorized collections (DatasetMetadata, DomainTag) are paced by an
+optional AdaptiveRateLimiter. With a BatchEmbedder, DatasetMetadata vectors
+are computed client-side in large batches and inserted with the objects.
+
+Usage:
+    import asyncio
+    from ingestion.async_weaviate_uploader import AsyncWeaviateUploader
+    uploader = AsyncWeaviateUploader()
+    results = asyncio.run(uploader.run_upload_all(metadata_list, relationships_config, domain_tags_config))
+"""
+
+import asyncio
+import time
+import uuid as uuid_lib
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+
+from ingestion.embeddings import BatchEmbedder, embedding_text
+from ingestion.models import DatasetProfile
+from ingestion.rate_limiter import AdaptiveRateLimiter
+from ingestion.retry_policy import RetryPolicy, is_transient_error
+from ingestion.weaviate_uploader import WeaviateUploader
+
+from weaviate import WeaviateAsyncClient
+from weaviate.classes.data import DataObject
+from weaviate.connect import ConnectionParams
+
+
+class AsyncWeaviateUploader(WeaviateUploader):
+    """Uploads metadata to Weaviate collections concurrently with the async client."""
+
+    def __init__(self, max_concurrency: int = 8, batch_size: int = 16,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 embedder: Optional[BatchEmbedder] = None):
+        """
+        Initialize async Weaviate uploader.
+
+        Args:
+            max_concurrency: Maximum insert requests in flight across all collections
+            batch_size: Objects per insert_many request
+            retry_policy: Decides which failed objects are retried and when
+                (default: RetryPolicy())
+            rate_limiter: Paces writes to the vectorized collections
+            embedder: Computes DatasetMetadata vectors before upload (None leaves
+                vectorization to Weaviate)
+        """
+        super().__init__(rate_limiter=rate_limiter, retry_policy=retry_policy)
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.embedder = embedder
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Request semaphore, created in the running event loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def connect(self) -> bool:
+        """Connect to Weaviate instance."""
+        try:
+            connection_params = ConnectionParams.from_url(
+                url=self.weaviate_url,
+                grpc_port=self.grpc_port
+            )
+
+            self.client = WeaviateAsyncClient(connection_params=connection_params)
+            await self.retry_policy.call_async(self.client.connect)
+
+            if await self.client.is_ready():
+                print(f"✅ Connected to Weaviate (async) at {self.weaviate_url}")
+                return True
+            else:
+                print(f"❌ Weaviate not ready at {self.weaviate_url}")
+                return False
+
+        except Exception as e:
+            print(f"❌ Connection failed: {e}")
+            return False
+
+    async def disconnect(self):
+        """Disconnect from Weaviate."""
+        if self.client:
+            await self.client.close()
+            print("🔌 Disconnected from Weaviate")
+
+    async def _send_batch(self, collection: Any, batch: List[Tuple[Dict[str, Any], DataObject]],
+                          vectorized: bool) -> List[Optional[Union[Exception, str]]]:
+        """Insert one batch under the semaphore; returns an error (or None) per object."""
+        limiter = self.rate_limiter if vectorized else None
+        if limiter:
+            await limiter.acquire_async(len(batch))
+        async with self.semaphore:
+            started = time.monotonic()
+            try:
+                response = await collection.data.insert_many([data_object for _, data_object in batch])
+            except Exception as e:
+                errors = [e] * len(batch)
+            else:
+                errors = [
+                    response.errors[position].message if position in response.errors else None
+                    for position in range(len(batch))
+                ]
+        if limiter:
+            if any(error is not None and is_transient_error(error) for error in errors):
+                limiter.record_overload()
+            else:
+                limiter.record_success(time.monotonic() - started)
+        return errors
+
+    async def insert_objects(self, collection: Any, objects: List[Tuple[Dict[str, Any], DataObject]],
+                             vectorized: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Insert objects in concurrent batches, retrying transient failures in further rounds.
+
+        Args:
+            collection: Async Weaviate collection
+            objects: (summary, DataObject) pairs; the summary is what gets reported
+            vectorized: The collection vectorizes on insert (writes are rate limited)
+
+        Returns:
+            Tuple of (successful summaries with "attempt", failed summaries with "error")
+        """
+        successful, failed = [], []
+        pending = list(objects)
+        self.retry_policy.record_request(len(pending))
+        started = time.monotonic()
+        attempt = 1
+        while pending:
+            batches = [pending[start:start + self.batch_size] for start in range(0, len(pending), self.batch_size)]
+            outcomes = await asyncio.gather(*(self._send_batch(collection, batch, vectorized) for batch in batches))
+            pending, delays = [], []
+            elapsed = time.monotonic() - started
+            for batch, errors in zip(batches, outcomes):
+                for (summary, data_object), error in zip(batch, errors):
+                    if error is None:
+                        successful.append({**summary, "attempt": attempt})
+                        continue
+                    delay = self.retry_policy.retry_delay(error, attempt, elapsed)
+                    if delay is None:
+                        failed.append({**summary, "error": str(error)})
+                    else:
+                        pending.append((summary, data_object))
+                        delays.append(delay)
+            if pending:
+                await asyncio.sleep(max(delays))
+            attempt += 1
+        return successful, failed
+
+    async def upload_dataset_metadata(self, metadata_list: List[Union[DatasetProfile, Dict[str, Any]]],
+                                      prepare: Optional[Callable[[DatasetProfile], Dict[str, Any]]] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Upload DatasetMetadata objects to Weaviate.
+
+        Args:
+            metadata_list: List of DatasetProfile objects or metadata dictionaries
+            prepare: Builds the Weaviate properties of a profile that Weaviate
+                vectorizes (default: prepare_dataset_metadata_for_weaviate).
+                Objects embedded client-side are built from the full profile.
+
+        Returns:
+            Tuple of (success, results_summary)
+        """
+        if not self.client:
+            return False, {"error": "Not connected to Weaviate"}
+
+        print(f"\n📤 Uploading {len(metadata_list)} DatasetMetadata objects (async)...")
+        prepare = prepare or self.prepare_dataset_metadata_for_weaviate
+
+        try:
+            collection = self.client.collections.get("DatasetMetadata")
+
+            failed_uploads = []
+            objects = []
+            profiles = []
+            for i, metadata in enumerate(metadata_list):
+                is_valid, errors = self.validate_metadata_object(metadata)
+                if not is_valid:
+                    failed_uploads.append({
+                        "index": i,
+                        "table_name": metadata.get('tableName', 'Unknown'),
+                        "errors": errors
+                    })
+                    continue
+
+                profile = self.as_profile(metadata)
+                weaviate_props = (self.prepare_dataset_metadata_for_weaviate(profile) if self.embedder
+                                  else prepare(profile))
+                table_name = weaviate_props['tableName']
+                zone = weaviate_props['zone']
+                consistent_uuid = self.generate_consistent_uuid(table_name, zone)
+                summary = {
+                    "index": i,
+                    "table_name": table_name,
+                    "zone": zone,
+                    "uuid": consistent_uuid,
+                    "record_count": weaviate_props['recordCount']
+                }
+                objects.append((summary, DataObject(properties=weaviate_props, uuid=consistent_uuid)))
+                profiles.append(profile)
+
+            vectorized = True
+            if self.embedder and objects:
+                # One embedding request per provider batch instead of one Bedrock call per insert
+                vectors = await asyncio.to_thread(
+                    self.embedder.embed, [embedding_text(data_object.properties) for _, data_object in objects]
+                )
+                # Objects left to Weaviate's vectorizer (failed embeddings) get the prepared properties
+                objects = [
+                    (summary, DataObject(properties=data_object.properties if vector is not None else prepare(profile),
+                                         uuid=data_object.uuid, vector=vector))
+                    for (summary, data_object), profile, vector in zip(objects, profiles, vectors)
+                ]
+                vectorized = any(vector is None for vector in vectors)
+                print(f"   🧮 Embedded {len(objects)} objects client-side "
+                      f"({self.embedder.metrics()['requests']} requests)")
+
+            successful_uploads, failed = await self.insert_objects(collection, objects, vectorized=vectorized)
+            for failure in failed:
+                failed_uploads.append({
+                    "index": failure["index"],
+                    "table_name": failure["table_name"],
+                    "errors": [f"Upload error: {failure['error']}"]
+                })
+            for upload in successful_uploads:
+                # Track for relationship building
+                self.uploaded_datasets[upload["table_name"]] = upload["uuid"]
+                print(f"   ✅ {upload['table_name']}: {upload['uuid']}")
+            for failure in failed_uploads:
+                print(f"   ❌ {failure['table_name']}: {'; '.join(failure['errors'])}")
+
+            print(f"✅ DatasetMetadata upload completed")
+            print(f"   Successful: {len(successful_uploads)}")
+            print(f"   Failed: {len(failed_uploads)}")
+
+            results = {
+                "total_attempted": len(metadata_list),
+                "successful": len(successful_uploads),
+                "failed": len(failed_uploads),
+                "successful_uploads": successful_uploads,
+                "failed_uploads": failed_uploads,
+                "uploaded_datasets_map": self.uploaded_datasets.copy()
+            }
+
+            return len(failed_uploads) == 0, results
+
+        except Exception as e:
+            print(f"❌ Batch upload failed: {e}")
+            return False, {"error": str(e)}
+
+    async def upload_relationships(self, relationships_config: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Upload DataRelationship objects to Weaviate.
+
+        Args:
+            relationships_config: Relationships configuration from YAML
+
+        Returns:
+            Tuple of (success, results_summary)
+        """
+        if not self.client:
+            return False, {"error": "Not connected to Weaviate"}
+
+        relationships = relationships_config.get('relationships', [])
+        print(f"\n🔗 Uploading {len(relationships)} DataRelationship objects (async)...")
+
+        try:
+            collection = self.client.collections.get("DataRelationship")
+
+            objects = []
+            for i, relationship in enumerate(relationships):
+                rel_props = {
+                    "fromTableName": str(relationship.get('from_table', '')),
+                    "fromColumn": str(relationship.get('from_column', '')),
+                    "toTableName": str(relationship.get('to_table', '')),
+                    "toColumn": str(relationship.get('to_column', '')),
+                    "relationshipType": str(relationship.get('relationship_type', 'foreign_key')),
+                    "cardinality": str(relationship.get('cardinality', 'many-to-one')),
+                    "suggestedJoinType": str(relationship.get('suggested_join_type', 'INNER')),
+                    "businessMeaning": str(relationship.get('business_meaning', ''))
+                }
+
+                # Generate UUID for relationship
+                rel_id = f"{rel_props['fromTableName']}.{rel_props['fromColumn']}_to_{rel_props['toTableName']}.{rel_props['toColumn']}"
+                rel_uuid = str(uuid_lib.uuid5(uuid_lib.NAMESPACE_DNS, rel_id))
+                summary = {
+                    "index": i,
+                    "relationship": f"{rel_props['fromTableName']} -> {rel_props['toTableName']}",
+                    "uuid": rel_uuid
+                }
+                objects.append((summary, DataObject(properties=rel_props, uuid=rel_uuid)))
+
+            # DataRelationship has no vectorizer, so it is not rate limited
+            successful_uploads, failed = await self.insert_objects(collection, objects, vectorized=False)
+            failed_uploads = [{"index": failure["index"], "error": failure["error"]} for failure in failed]
+
+            print(f"✅ Relationship upload completed")
+            print(f"   Successful: {len(successful_uploads)}")
+            print(f"   Failed: {len(failed_uploads)}")
+
+            results = {
+                "total_attempted": len(relationships),
+                "successful": len(successful_uploads),
+                "failed": len(failed_uploads),
+                "successful_uploads": successful_uploads,
+                "failed_uploads": failed_uploads
+            }
+
+            return len(failed_uploads) == 0, results
+
+        except Exception as e:
+            print(f"❌ Relationship upload failed: {e}")
+            return False, {"error": str(e)}
+
+    async def upload_domain_tags(self, domain_tags_config: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Upload DomainTag objects to Weaviate.
+
+        Args:
+            domain_tags_config: Domain tags configuration from YAML
+
+        Returns:
+            Tuple of (success, results_summary)
+        """
+        if not self.client:
+            return False, {"error": "Not connected to Weaviate"}
+
+        domain_tags = domain_tags_config.get('domain_tags', [])
+        print(f"\n🏷️  Uploading {len(domain_tags)} DomainTag objects (async)...")
+
+        try:
+            collection = self.client.collections.get("DomainTag")
+
+            objects = []
+            for i, tag in enumerate(domain_tags):
+                tag_props = {
+                    "tagName": str(tag.get('tag_name', '')),
+                    "tagDescription": str(tag.get('tag_description', '')),
+                    "businessPriority": str(tag.get('business_priority', 'Medium')),
+                    "dataSensitivity": str(tag.get('data_sensitivity', 'Internal'))
+                }
+
+                # Generate UUID for tag
+                tag_uuid = str(uuid_lib.uuid5(uuid_lib.NAMESPACE_DNS, tag_props['tagName']))
+                summary = {"index": i, "tag_name": tag_props['tagName'], "uuid": tag_uuid}
+                objects.append((summary, DataObject(properties=tag_props, uuid=tag_uuid)))
+
+            successful_uploads, failed = await self.insert_objects(collection, objects)
+            failed_uploads = [
+                {"index": failure["index"], "tag_name": failure["tag_name"], "error": failure["error"]}
+                for failure in failed
+            ]
+
+            print(f"✅ Domain tag upload completed")
+            print(f"   Successful: {len(successful_uploads)}")
+            print(f"   Failed: {len(failed_uploads)}")
+
+            results = {
+                "total_attempted": len(domain_tags),
+                "successful": len(successful_uploads),
+                "failed": len(failed_uploads),
+                "successful_uploads": successful_uploads,
+                "failed_uploads": failed_uploads
+            }
+
+            return len(failed_uploads) == 0, results
+
+        except Exception as e:
+            print(f"❌ Domain tag upload failed: {e}")
+            return False, {"error": str(e)}
+
+    async def upload_all(self, metadata_list: List[Union[DatasetProfile, Dict[str, Any]]],
+                         relationships_config: Optional[Dict[str, Any]] = None,
+                         domain_tags_config: Optional[Dict[str, Any]] = None,
+                         prepare: Optional[Callable[[DatasetProfile], Dict[str, Any]]] = None) -> Dict[str, Tuple[bool, Dict[str, Any]]]:
+        """
+        Upload the three collections concurrently.
+
+        Args:
+            metadata_list: DatasetMetadata objects to upload
+            relationships_config: Relationships configuration (skipped if None)
+            domain_tags_config: Domain tags configuration (skipped if None)
+            prepare: Builds the Weaviate properties of a profile (see upload_dataset_metadata)
+
+        Returns:
+            Dictionary of "datasets" / "relationships" / "domain_tags" -> (success, results)
+        """
+        uploads = {}
+        if metadata_list:
+            uploads["datasets"] = self.upload_dataset_metadata(metadata_list, prepare)
+        if relationships_config:
+            uploads["relationships"] = self.upload_relationships(relationships_config)
+        if domain_tags_config:
+            uploads["domain_tags"] = self.upload_domain_tags(domain_tags_config)
+        outcomes = await asyncio.gather(*uploads.values())
+        return dict(zip(uploads, outcomes))
+
+    async def run_upload_all(self, *args, **kwargs) -> Optional[Dict[str, Tuple[bool, Dict[str, Any]]]]:
+        """Connect, upload_all and disconnect in one event loop (None if the connection failed)."""
+        if not await self.connect():
+            return None
+        try:
+            return await self.upload_all(*args, **kwargs)
+        finally:
+            await self.disconnect()
+
+    async def verify_upload_success(self) -> Dict[str, Any]:
+        """
+        Verify that uploads were successful by querying Weaviate.
+
+        Returns:
+            Dictionary with verification results
+        """
+        if not self.client:
+            return {"error": "Not connected to Weaviate"}
+
+        print(f"\n🔍 Verifying upload success...")
+
+        async def count(collection_name: str) -> Dict[str, Any]:
+            try:
+                result = await self.client.collections.get(collection_name).query.fetch_objects(limit=100)
+                print(f"   ✅ {collection_name}: {len(result.objects)} objects")
+                return {"count": len(result.objects), "status": "success"}
+            except Exception as e:
+                print(f"   ❌ {collection_name}: {e}")
+                return {"count": 0, "status": "error", "error": str(e)}
+
+        collections = ["DatasetMetadata", "DataRelationship", "DomainTag"]
+        counts = await asyncio.gather(*(count(collection_name) for collection_name in collections))
+        return dict(zip(collections, counts))
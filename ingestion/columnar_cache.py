@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Columnar Cache for Weaviate Knowledge Base
+
+Every stage that touches data (profiling, relationship discovery, validation)
+would otherwise re-parse CSV text. The columnar cache keeps a typed,
+zstd-compressed Parquet copy of each extracted CSV file so later stages read
+only the columns they need, without parsing the rest of the file.
+
+Copies live in a `.columnar` directory next to the raw file and are named
+after the source file and its fingerprint (size and modification time), so a
+changed CSV never matches an old copy; stale copies are removed when a new one
+is written. The typed DataFrame that profiling already produced is written
+as is; files profiled another way are converted with Arrow's streaming CSV
+reader.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    from ingestion.columnar_cache import ColumnarCache
+    cache = ColumnarCache()
+    df = cache.read(csv_path, columns=['ID', 'EmailAddress'])   # None if no current copy
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+# Optional dependency (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Key of the copy's own entry in the Parquet key-value metadata
+METADATA_KEY = b'ingestion.columnar'
+
+
+class ColumnarCache:
+    """Typed Parquet copies of CSV files, keyed by the source fingerprint."""
+
+    def __init__(self, directory_name: str = '.columnar', compression: str = 'zstd',
+                 block_size: int = 16 * 1024 * 1024):
+        """
+        Initialize columnar cache.
+
+        Args:
+            directory_name: Directory (next to each raw file) holding the copies
+            compression: Parquet compression codec
+            block_size: Bytes per block when converting CSV with Arrow's streaming reader
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the columnar cache")
+        self.directory_name = directory_name
+        self.compression = compression
+        self.block_size = block_size
+
+    @staticmethod
+    def fingerprint(file_path: Path) -> str:
+        """Short hash of the source file's size and modification time."""
+        stat = Path(file_path).stat()
+        return hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:16]
+
+    def path_for(self, file_path: Path) -> Path:
+        """Location of the copy matching the current state of a source file."""
+        file_path = Path(file_path)
+        return file_path.parent / self.directory_name / f"{file_path.name}.{self.fingerprint(file_path)}.parquet"
+
+    def current(self, file_path: Path) -> Optional[Path]:
+        """
+        The copy of a source file, if one matches its current fingerprint.
+
+        Args:
+            file_path: Path to the CSV file
+
+        Returns:
+            Path of the Parquet copy, or None
+        """
+        try:
+            copy_path = self.path_for(file_path)
+        except OSError:
+            return None
+        return copy_path if copy_path.is_file() else None
+
+    # Writing
+
+    def write_frame(self, file_path: Path, df: pd.DataFrame, info: Dict[str, Any]) -> Path:
+        """
+        Write a parsed (typed) DataFrame as the copy of a CSV file.
+
+        Args:
+            file_path: Path to the CSV file the frame was read from
+            df: The parsed file
+            info: Read details stored with the copy (at least "encoding")
+
+        Returns:
+            Path of the Parquet copy
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        return self._write(file_path, [table], table.schema, {
+            **info, "logical_dtypes": df.attrs.get("logical_dtypes", {})
+        })
+
+    def write_table(self, file_path: Path, table: Any, info: Dict[str, Any]) -> Path:
+        """Write an Arrow table read from a CSV file as its copy."""
+        return self._write(file_path, [table], table.schema, info)
+
+    def write_csv(self, file_path: Path, encoding: str) -> Path:
+        """
+        Convert a CSV file block by block with Arrow's streaming reader.
+
+        Column types are inferred from the first block; if a later block does
+        not fit them, the file is converted again with every column as text.
+
+        Args:
+            file_path: Path to the CSV file
+            encoding: Encoding of the CSV file
+
+        Returns:
+            Path of the Parquet copy
+        """
+        read_options = pa_csv.ReadOptions(encoding=encoding, block_size=self.block_size)
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+        try:
+            reader = pa_csv.open_csv(file_path, read_options=read_options, convert_options=convert_options)
+            return self._write(file_path, reader, reader.schema, {"encoding": encoding})
+        except pa.ArrowInvalid:
+            names = pa_csv.open_csv(file_path, read_options=read_options).schema.names
+            convert_options = pa_csv.ConvertOptions(
+                strings_can_be_null=True, column_types={name: pa.string() for name in names}
+            )
+            reader = pa_csv.open_csv(file_path, read_options=read_options, convert_options=convert_options)
+            return self._write(file_path, reader, reader.schema, {"encoding": encoding})
+
+    def _write(self, file_path: Path, parts: Any, schema: Any, info: Dict[str, Any]) -> Path:
+        """Write tables or record batches to a temporary file, then move it into place."""
+        copy_path = self.path_for(file_path)
+        copy_path.parent.mkdir(parents=True, exist_ok=True)
+        schema = schema.with_metadata({**(schema.metadata or {}), METADATA_KEY: json.dumps(info).encode('utf-8')})
+        temp_path = copy_path.with_suffix(f'.tmp{os.getpid()}')
+        try:
+            with pq.ParquetWriter(temp_path, schema, compression=self.compression) as writer:
+                for part in parts:
+                    if isinstance(part, pa.RecordBatch):
+                        writer.write_batch(part)
+                    else:
+                        writer.write_table(part.replace_schema_metadata(schema.metadata))
+            os.replace(temp_path, copy_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        self.remove_stale(file_path, keep=copy_path)
+        return copy_path
+
+    def remove_stale(self, file_path: Path, keep: Optional[Path] = None) -> None:
+        """Delete copies of a source file made from earlier versions of it."""
+        file_path = Path(file_path)
+        for copy_path in (file_path.parent / self.directory_name).glob(f"{file_path.name}.*.parquet"):
+            if copy_path != keep:
+                copy_path.unlink(missing_ok=True)
+
+    # Reading
+
+    def info(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Read details recorded with the current copy (None without one)."""
+        copy_path = self.current(file_path)
+        if copy_path is None:
+            return None
+        metadata = pq.read_schema(copy_path).metadata or {}
+        return json.loads(metadata.get(METADATA_KEY, b'{}'))
+
+    def read(self, file_path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Read columns of a CSV file from its current copy.
+
+        Args:
+            file_path: Path to the CSV file
+            columns: Columns to read (default: all)
+
+        Returns:
+            DataFrame (with df.attrs["logical_dtypes"] for downcast columns), or
+            None if there is no current copy
+        """
+        copy_path = self.current(file_path)
+        if copy_path is None:
+            return None
+        table = pq.read_table(copy_path, columns=columns)
+        df = table.to_pandas()
+        info = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b'{}'))
+        # Only the read columns (pyarrow restores the attrs of the whole frame)
+        df.attrs.pop("logical_dtypes", None)
+        logical_dtypes = {
+            column: dtype for column, dtype in info.get("logical_dtypes", {}).items() if column in df.columns
+        }
+        if logical_dtypes:
+            df.attrs["logical_dtypes"] = logical_dtypes
+        return df
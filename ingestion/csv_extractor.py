@@ -12,142 +12,1381 @@ Usage:
 """
 
 import os
+import codecs
+import numpy as np
 import pandas as pd
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+from ingestion.columnar_cache import ColumnarCache
+from ingestion.csv_scanner import CSVRecordScanner
+from ingestion.datetime_detection import DatetimeDetector, INFERRED_FORMAT
+from ingestion.extraction_cache import ExtractionCache
+from ingestion.models import ColumnProfile, DatasetProfile, DetailedColumnInfo, ProfileValidationError
+from ingestion.semantic_types import SemanticTypeDetector
+from ingestion.sketches import ColumnSketch, HeavyHitters
+
+# Optional Arrow backend (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 class CSVExtractor:
     """Extracts technical and business metadata from CSV files."""
     
-    def __init__(self, data_dir: str = "data_sources"):
+    def __init__(self, data_dir: str = "data_sources", streaming: bool = False,
+                 streaming_threshold_mb: float = 512, chunk_memory_mb: float = 64,
+                 encoding_sample_bytes: int = 64 * 1024, encoding_scan_full: bool = True,
+                 cache_dir: Optional[str] = None, cache_content_hash: bool = False,
+                 backend: str = "pandas", profile_mode: str = "full",
+                 column_statistics: bool = True, partition_workers: int = 4,
+                 dtype_plan: bool = True, dtype_sample_rows: int = 10000,
+                 sparse_null_ratio: Optional[float] = 0.95, embed_sparse_columns: bool = False,
+                 detect_semantic_types: bool = True, columnar_copy: bool = False):
         """
         Initialize CSV extractor.
         
         Args:
             data_dir: Directory containing CSV files
+            streaming: Always profile CSV files chunk by chunk instead of loading them whole
+            streaming_threshold_mb: Files larger than this are streamed even if streaming is False
+            chunk_memory_mb: In-memory budget for a single chunk when streaming
+            encoding_sample_bytes: Size of the byte prefix sniffed for encoding detection
+            encoding_scan_full: Verify the detected encoding over the whole file with an
+                incremental decoder (no CSV parsing) instead of trusting the prefix
+            cache_dir: Directory for the persistent extraction cache (None disables caching)
+            cache_content_hash: Include a content hash in the cache fingerprint
+            backend: CSV parsing backend, "pandas" or "arrow" (multithreaded, needs
+                pyarrow; falls back to pandas when unavailable or when Arrow fails)
+            profile_mode: "full" profiles types, nulls and samples; "schema_only" only
+                reads the CSV header and counts records
+            column_statistics: Build mergeable sketches per column for approximate
+                distinct counts, top values and quantiles (bounded memory per column)
+            partition_workers: Threads used to profile the parts of a partitioned dataset
+            dtype_plan: Read whole CSV files with compact dtypes inferred from a
+                leading sample (see infer_dtype_plan) instead of low_memory=False
+            dtype_sample_rows: Rows read to infer the dtype plan
+            sparse_null_ratio: Columns with a larger share of nulls are flagged sparse
+                and stored in compact form (None disables sparse detection)
+            embed_sparse_columns: Include sparse columns in columnSemanticsConcatenated
+                (by default the vectorized text is spent on populated columns)
+            detect_semantic_types: Fill semanticType of columns without a YAML entry
+                from a bounded sample of their values (see ingestion.semantic_types)
+            columnar_copy: Keep a typed Parquet copy of each CSV file (see
+                ingestion.columnar_cache) and profile unchanged files from it; needs pyarrow
         """
         self.data_dir = Path(data_dir)
+        self.streaming = streaming
+        self.streaming_threshold_mb = streaming_threshold_mb
+        self.chunk_memory_mb = chunk_memory_mb
+        self.encoding_sample_bytes = encoding_sample_bytes
+        self.encoding_scan_full = encoding_scan_full
+        if backend not in ("pandas", "arrow"):
+            raise ValueError(f"Unknown CSV backend: {backend}")
+        if backend == "arrow" and not PYARROW_AVAILABLE:
+            print(f"⚠️  pyarrow not installed - using pandas CSV backend")
+            backend = "pandas"
+        self.backend = backend
+        if profile_mode not in ("full", "schema_only"):
+            raise ValueError(f"Unknown profile mode: {profile_mode}")
+        self.profile_mode = profile_mode
+        self.column_statistics = column_statistics
+        self.partition_workers = partition_workers
+        self.dtype_plan = dtype_plan
+        self.dtype_sample_rows = dtype_sample_rows
+        if sparse_null_ratio is not None and not 0 <= sparse_null_ratio <= 1:
+            raise ValueError(f"sparse_null_ratio must be between 0 and 1: {sparse_null_ratio}")
+        self.sparse_null_ratio = sparse_null_ratio
+        self.embed_sparse_columns = embed_sparse_columns
+        self.datetime_detector = DatetimeDetector()
+        self.detect_semantic_types = detect_semantic_types
+        self.semantic_detector = SemanticTypeDetector()
+        self.cache = ExtractionCache(cache_dir, use_content_hash=cache_content_hash) if cache_dir else None
+        if columnar_copy and not PYARROW_AVAILABLE:
+            print(f"⚠️  pyarrow not installed - columnar copies disabled")
+        self.columnar_cache = ColumnarCache() if columnar_copy and PYARROW_AVAILABLE else None
         print(f"🔧 CSV Extractor initialized")
         print(f"   Data directory: {self.data_dir}")
+        print(f"   CSV backend: {self.backend}")
+        if profile_mode != "full":
+            print(f"   Profile mode: {profile_mode}")
+        if self.cache:
+            print(f"   Extraction cache: {self.cache.cache_dir}")
+        if self.columnar_cache:
+            print(f"   Columnar copies: ON ({self.columnar_cache.directory_name}/ next to each CSV)")
+        if streaming:
+            print(f"   Streaming mode: ON ({chunk_memory_mb} MB per chunk)")
+    
+    def get_cache_options(self) -> Dict[str, Any]:
+        """
+        Extractor options that influence extraction results.
+        
+        These are part of the cache fingerprint, so changing any of them
+        invalidates previously cached results.
+        
+        Returns:
+            Dictionary of result-affecting options
+        """
+        return {
+            "streaming": self.streaming,
+            "streaming_threshold_mb": self.streaming_threshold_mb,
+            "backend": self.backend,
+            "profile_mode": self.profile_mode,
+            "column_statistics": self.column_statistics,
+            "dtype_plan": self.dtype_plan,
+            "sparse_null_ratio": self.sparse_null_ratio,
+            "embed_sparse_columns": self.embed_sparse_columns,
+            "detect_semantic_types": self.detect_semantic_types,
+            "dtype_sample_rows": self.dtype_sample_rows,
+            "columnar_copy": self.columnar_cache is not None
+        }
+    
+    def get_file_metadata(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Collect file-level information (existence, size, modification time).
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Returns:
+            File metadata dict in the shape used by read_csv_safely
+        """
+        metadata = {
+            "file_exists": False,
+            "file_size_bytes": 0,
+            "last_modified": None,
+            "read_success": False,
+            "error_message": None,
+            "encoding_used": "utf-8",
+            "encoding_confidence": None
+        }
+        
+        if not file_path.exists():
+            metadata["error_message"] = f"File not found: {file_path}"
+            return metadata
+        
+        stat = file_path.stat()
+        metadata["file_exists"] = True
+        metadata["file_size_bytes"] = stat.st_size
+        metadata["last_modified"] = datetime.fromtimestamp(
+            stat.st_mtime, tz=timezone.utc
+        ).isoformat()
+        return metadata
+    
+    # Bytes that are undefined in cp1252 (decoding them raises UnicodeDecodeError)
+    CP1252_UNDEFINED_BYTES = (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+    
+    def detect_encoding(self, file_path: Path) -> Tuple[str, float]:
+        """
+        Detect the text encoding of a file without parsing it as CSV.
+        
+        The first encoding_sample_bytes are sniffed for a BOM and UTF-8 validity.
+        If the sample is valid UTF-8, the rest of the file is run through an
+        incremental UTF-8 decoder (when encoding_scan_full is set) so the parse
+        that follows succeeds on the first try. Otherwise the bytes are classified
+        as cp1252 or latin-1 depending on which 0x80-0x9F bytes occur.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Tuple of (encoding name, confidence between 0 and 1)
+        """
+        block_size = 1024 * 1024
+        
+        with open(file_path, 'rb') as f:
+            sample = f.read(self.encoding_sample_bytes)
+            
+            # Byte order marks are conclusive
+            if sample.startswith(codecs.BOM_UTF8):
+                return 'utf-8-sig', 1.0
+            if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+                return 'utf-16', 1.0
+            
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            is_utf8 = True
+            saw_non_ascii = not sample.isascii()
+            block = sample
+            try:
+                decoder.decode(sample, final=False)
+                if self.encoding_scan_full:
+                    while True:
+                        block = f.read(block_size)
+                        if not block:
+                            break
+                        saw_non_ascii = saw_non_ascii or not block.isascii()
+                        decoder.decode(block, final=False)
+                decoder.decode(b'', final=True)
+            except UnicodeDecodeError:
+                is_utf8 = False
+            
+            if is_utf8:
+                if self.encoding_scan_full or len(sample) < self.encoding_sample_bytes:
+                    return 'utf-8', 1.0
+                # Only a prefix was checked; non-ASCII UTF-8 sequences make it very likely
+                return 'utf-8', 0.95 if saw_non_ascii else 0.8
+            
+            # Not UTF-8: decide between cp1252 and latin-1 from the C1 byte range,
+            # which is the only place the two encodings differ
+            has_c1 = False
+            has_undefined = False
+            while block:
+                has_c1 = has_c1 or any(0x80 <= b <= 0x9F for b in set(block))
+                has_undefined = has_undefined or any(bytes([b]) in block for b in self.CP1252_UNDEFINED_BYTES)
+                if has_undefined or not self.encoding_scan_full:
+                    break
+                block = f.read(block_size)
+        
+        if has_undefined:
+            return 'latin-1', 0.6
+        if has_c1:
+            return 'cp1252', 0.9
+        # cp1252 and latin-1 decode these bytes identically
+        return 'cp1252', 0.8
+    
+    def resolve_encoding(self, file_path: Path, metadata: Dict[str, Any]) -> List[str]:
+        """
+        Detect the encoding of a file and record it in the file metadata.
+        
+        Args:
+            file_path: Path to the file
+            metadata: File metadata dict to update
+            
+        Returns:
+            Encodings to parse with, in order: the detected one, then latin-1 as a
+            fallback that can decode any byte sequence
+        """
+        encoding, confidence = self.detect_encoding(file_path)
+        metadata["encoding_used"] = encoding
+        metadata["encoding_confidence"] = confidence
+        print(f"🔤 Detected {encoding} encoding for {file_path.name} (confidence {confidence:.2f})")
+        
+        if encoding in ('latin-1', 'utf-16'):
+            return [encoding]
+        return [encoding, 'latin-1']
     
     def read_csv_safely(self, file_path: Path) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
         """
         Safely read CSV file and extract basic information.
         
+        With dtype_plan enabled the file is read with the dtypes inferred by
+        infer_dtype_plan; if the rest of the file does not fit the plan (e.g. a
+        text value in a column that looked numeric) it is re-read with defaults.
+        The estimated saving is stored in metadata["memory_saved_mb"].
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Returns:
+            Tuple of (DataFrame or None, metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        
+        try:
+            # Check if file exists
+            if not metadata["file_exists"]:
+                return None, metadata
+            
+            # Detect the encoding from the raw bytes so the CSV is parsed only once
+            encodings_to_try = self.resolve_encoding(file_path, metadata)
+            
+            for encoding in encodings_to_try:
+                try:
+                    df = None
+                    if self.dtype_plan:
+                        plan = self.infer_dtype_plan(file_path, encoding)
+                        try:
+                            df = pd.read_csv(file_path, encoding=encoding, dtype=plan["dtype"],
+                                             parse_dates=plan["parse_dates"],
+                                             date_format=plan["date_format"] or None)
+                        except (ValueError, TypeError, OverflowError) as e:
+                            print(f"⚠️  Dtype plan does not fit {file_path.name} ({e}) - reading with default dtypes")
+                        else:
+                            # Report downcast columns with their logical type
+                            df.attrs["logical_dtypes"] = self.planned_logical_dtypes(df, plan)
+                            planned_mb = float(df.memory_usage(deep=True).sum()) / 1024 / 1024
+                            ratio = plan["default_bytes_per_row"] / max(plan["planned_bytes_per_row"], 1e-9)
+                            metadata["memory_saved_mb"] = round(max(planned_mb * (ratio - 1), 0), 2)
+                    if df is None:
+                        df = pd.read_csv(file_path, encoding=encoding, low_memory=False)
+                    if encoding != metadata["encoding_used"]:
+                        metadata["encoding_used"] = encoding
+                        metadata["encoding_confidence"] = 0.5
+                    metadata["read_success"] = True
+                    print(f"✅ Successfully read {file_path.name} with {encoding} encoding")
+                    return df, metadata
+                except UnicodeDecodeError:
+                    continue
+                except Exception as e:
+                    # Parse errors do not depend on the encoding, so don't re-parse
+                    metadata["error_message"] = f"Error reading with {encoding}: {str(e)}"
+                    return None, metadata
+            
+            # If all encodings failed
+            metadata["error_message"] = "Could not read file with any encoding"
+            return None, metadata
+            
+        except Exception as e:
+            metadata["error_message"] = f"Unexpected error: {str(e)}"
+            return None, metadata
+    
+    def infer_dtype_plan(self, file_path: Path, encoding: str) -> Dict[str, Any]:
+        """
+        Infer compact read options for a CSV file from a bounded leading sample.
+        
+        Per column (as inferred by pandas on the sample):
+        - integers, and floats whose values are all whole numbers (ints with
+          nulls, 0.0/1.0 flags), become nullable Int64; they are reported with
+          the type a default read gives them (see planned_logical_dtypes)
+        - other floats become float32 when every sample value has few enough
+          significant digits to survive the round trip
+        - text columns whose sample values all parse as datetimes (see
+          DatetimeDetector) are parsed, with an explicit format when one matched
+        - low-cardinality text becomes category; other text becomes
+          pyarrow-backed strings when pyarrow is installed
+        
+        Args:
+            file_path: Path to CSV file
+            encoding: Encoding to read with
+            
+        Returns:
+            Dictionary with dtype, parse_dates and date_format for pd.read_csv, logical_dtypes
+            (types to report for downcast columns) and the sample's bytes per row
+            with default and with planned dtypes
+        """
+        sample = pd.read_csv(file_path, encoding=encoding, nrows=self.dtype_sample_rows, low_memory=False)
+        plan = {"dtype": {}, "parse_dates": [], "date_format": {}, "logical_dtypes": {}}
+        
+        for column in sample.columns:
+            values = sample[column].dropna()
+            if values.empty:
+                continue  # No evidence in the sample, let pandas infer
+            
+            kind = sample[column].dtype.kind
+            if kind in 'iuf':
+                numbers = values.to_numpy(dtype=np.float64)
+                if not np.isfinite(numbers).all():
+                    continue
+                if kind in 'iu' or np.array_equal(numbers, np.round(numbers)):
+                    # Narrower nullable ints wrap silently on overflow, Int64 raises
+                    plan["dtype"][column] = 'Int64'
+                    if kind == 'f':
+                        plan["logical_dtypes"][column] = 'float64'
+                elif self._fits_float32(numbers):
+                    plan["dtype"][column] = 'float32'
+                    plan["logical_dtypes"][column] = 'float64'
+            elif kind == 'O' or pd.api.types.is_string_dtype(sample[column].dtype):
+                datetime_format = self.datetime_detector.detect_format(column, values)
+                if datetime_format:
+                    plan["parse_dates"].append(column)
+                    if datetime_format != INFERRED_FORMAT:
+                        plan["date_format"][column] = datetime_format
+                elif values.nunique() <= max(len(values) // 2, 1):
+                    plan["dtype"][column] = 'category'
+                elif PYARROW_AVAILABLE:
+                    plan["dtype"][column] = 'string[pyarrow]'
+        
+        rows = max(len(sample), 1)
+        plan["default_bytes_per_row"] = float(sample.memory_usage(deep=True).sum()) / rows
+        planned = sample.astype(plan["dtype"])
+        for column in plan["parse_dates"]:
+            planned[column] = self.datetime_detector.parse(
+                planned[column], plan["date_format"].get(column, INFERRED_FORMAT)
+            )
+        plan["planned_bytes_per_row"] = float(planned.memory_usage(deep=True).sum()) / rows
+        return plan
+    
+    @staticmethod
+    def planned_logical_dtypes(df: pd.DataFrame, plan: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Types to report for columns read with a dtype plan.
+        
+        Int64 columns are reported as a default read would type them: float64
+        when the sample held floats or the column has nulls, otherwise int64 (as
+        the streaming and Arrow paths and dtype_plan=False do), so the SQL type
+        does not depend on the read path.
+        """
+        logical_dtypes = dict(plan["logical_dtypes"])
+        for column, dtype in plan["dtype"].items():
+            if dtype == 'Int64' and column not in logical_dtypes:
+                logical_dtypes[column] = 'float64' if df[column].hasnans else 'int64'
+        return logical_dtypes
+    
+    @staticmethod
+    def float_samples(samples: List[str]) -> List[str]:
+        """Integer sample values formatted as a default read shows a float64 column (0 -> 0.0)."""
+        return [str(float(value)) for value in samples]
+    
+    @staticmethod
+    def _fits_float32(numbers: np.ndarray, max_significant_digits: int = 6) -> bool:
+        """True if every value has a short decimal form that float32 represents exactly enough."""
+        for decimals in range(max_significant_digits + 1):
+            scaled = numbers * 10 ** decimals
+            if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6):
+                return bool(np.abs(scaled).max() < 10 ** max_significant_digits)
+        return False
+    
+    def analyze_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Analyze DataFrame to extract technical metadata.
+        
+        Null counts and dtypes are computed for the whole frame at once; sample
+        values come from first_distinct_samples, which only looks at as many
+        leading rows as it needs. With column statistics on, one value count per
+        column gives null counts, samples and sketches (see analyze_value_counts)
+        instead. Text columns holding datetimes are analyzed as
+        datetimes (see convert_datetime_columns); df itself is not modified.
+        
+        Args:
+            df: Pandas DataFrame
+            
+        Returns:
+            Dictionary with analysis results
+        """
+        analysis = {
+            "record_count": len(df),
+            "column_count": len(df.columns),
+            "columns_array": df.columns.tolist(),
+            "data_types": {},
+            "null_counts": {},
+            "sample_values": {},
+            "memory_usage_mb": 0
+        }
+        
+        try:
+            # Basic statistics
+            analysis["memory_usage_mb"] = round(float(df.memory_usage(deep=True).sum()) / 1024 / 1024, 2)
+            
+            # Whole-frame column analysis
+            df, analysis["datetime_ranges"] = self.convert_datetime_columns(df)
+            analysis["data_types"] = df.dtypes.astype(str).to_dict()
+            analysis["data_types"].update(df.attrs.get("logical_dtypes", {}))
+            if self.column_statistics:
+                self.analyze_value_counts(df, analysis)
+            else:
+                analysis["null_counts"] = {
+                    column: int(count) for column, count in df.isna().sum().items()
+                }
+                analysis["sample_values"] = self.first_distinct_samples(df)
+            for column, dtype in df.attrs.get("logical_dtypes", {}).items():
+                if dtype == 'float64' and column in df.columns and df[column].dtype.kind in 'iu':
+                    analysis["sample_values"][column] = self.float_samples(analysis["sample_values"][column])
+            if self.detect_semantic_types:
+                analysis["semantic_types"] = self.semantic_detector.detect_frame(df)
+            
+            print(f"📊 DataFrame analysis completed:")
+            print(f"   Records: {analysis['record_count']:,}")
+            print(f"   Columns: {analysis['column_count']}")
+            print(f"   Memory: {analysis['memory_usage_mb']} MB")
+            
+        except Exception as e:
+            print(f"⚠️  Error during DataFrame analysis: {e}")
+            
+        return analysis
+    
+    def convert_datetime_columns(self, df: pd.DataFrame, formats: Optional[Dict[str, str]] = None
+                                 ) -> Tuple[pd.DataFrame, Dict[str, Dict[str, str]]]:
+        """
+        Convert text columns that hold datetimes and get their ranges.
+        
+        The given frame is left unchanged: converted columns are set on a
+        shallow copy, so the other columns are not copied.
+        
+        Args:
+            df: DataFrame (or chunk) to convert
+            formats: Formats already detected per column (e.g. in an earlier chunk);
+                detected formats are added to it
+            
+        Returns:
+            Tuple of (frame with converted columns, which is df itself when none
+            were converted; dictionary of column -> {"min", "max"} ISO values for
+            every datetime column)
+        """
+        converted = df
+        ranges = {}
+        for column in df.columns:
+            values = df[column]
+            if DatetimeDetector.is_text(values):
+                known_format = formats.get(column) if formats is not None else None
+                parsed, fmt = self.datetime_detector.convert(column, values, known_format)
+                if parsed is None:
+                    continue
+                if converted is df:
+                    converted = df.copy(deep=False)
+                converted[column] = values = parsed
+                if formats is not None:
+                    formats[column] = fmt
+            if pd.api.types.is_datetime64_any_dtype(values.dtype):
+                value_range = DatetimeDetector.value_range(values)
+                if value_range:
+                    ranges[column] = value_range
+        return converted, ranges
+    
+    @staticmethod
+    def analyze_value_counts(df: pd.DataFrame, analysis: Dict[str, Any], sample_size: int = 3) -> None:
+        """
+        Get null counts, sample values and column sketches from one value count per column.
+        
+        Distinct text values come in order of first occurrence, so the first ones
+        are the samples first_distinct_samples would pick; numeric and
+        categorical columns, whose distinct values come sorted, get their
+        samples from first_distinct_samples.
+        
+        Args:
+            df: Pandas DataFrame
+            analysis: Analysis dictionary; null_counts, sample_values and
+                column_sketches are filled in
+            sample_size: Number of sample values per column
+        """
+        analysis["null_counts"], analysis["sample_values"], analysis["column_sketches"] = {}, {}, {}
+        sorted_columns = [
+            column for column, dtype in df.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype) or (isinstance(dtype, np.dtype) and dtype.kind in 'iuf')
+        ]
+        sorted_samples = CSVExtractor.first_distinct_samples(df, sample_size, columns=sorted_columns)
+        for column in df.columns:
+            values = df[column]
+            distinct_values, counts = HeavyHitters.count_values(values)
+            analysis["null_counts"][column] = len(values) - int(counts.sum())
+            if column in sorted_samples:
+                analysis["sample_values"][column] = sorted_samples[column]
+            else:
+                analysis["sample_values"][column] = [str(value) for value in distinct_values[:sample_size].tolist()]
+            analysis["column_sketches"][column] = ColumnSketch().add_counts(distinct_values, counts)
+    
+    @staticmethod
+    def first_distinct_samples(df: pd.DataFrame, sample_size: int = 3, initial_window: int = 64,
+                               columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Collect the first distinct non-null values of every column with early exit.
+        
+        Only a leading window of rows is inspected. Columns that already have
+        sample_size distinct values are finished; the window doubles for the
+        remaining ones until they are satisfied or the frame is exhausted. A
+        column with a few distinct values in its first rows is never hashed in
+        full, so the cost per column is bounded by the window it needed.
+        Plain numpy number columns are scanned on their arrays, without frame
+        operations.
+        
+        Args:
+            df: Pandas DataFrame
+            sample_size: Number of distinct values to collect per column
+            initial_window: Number of leading rows inspected in the first round
+            columns: Columns to sample (default: all)
+            
+        Returns:
+            Mapping of column name to a list of sample values as strings
+        """
+        requested = list(df.columns if columns is None else columns)
+        samples = {}
+        pending = []
+        total_rows = len(df)
+        window = max(initial_window, 1)
+        
+        for column in requested:
+            values = df[column]
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf':
+                samples[column] = CSVExtractor._first_distinct_numbers(values.to_numpy(), sample_size, window)
+            else:
+                pending.append(column)
+        
+        while pending:
+            block = df.iloc[:window]
+            exhausted = window >= total_rows
+            not_null = block[pending].notna()
+            still_pending = []
+            
+            for column in pending:
+                # Masking the array skips the Series index machinery
+                values = block[column].array[not_null[column].to_numpy()]
+                distinct = pd.unique(values)[:sample_size]
+                if len(distinct) >= sample_size or exhausted:
+                    # Convert to strings for JSON serialization
+                    samples[column] = [str(val) for val in distinct.tolist()]
+                else:
+                    still_pending.append(column)
+            
+            pending = still_pending
+            window *= 2
+        
+        return {column: samples[column] for column in requested}
+    
+    @staticmethod
+    def _first_distinct_numbers(data: np.ndarray, sample_size: int, window: int) -> List[str]:
+        """first_distinct_samples for one numpy number array."""
+        while True:
+            head = data[:window]
+            if head.dtype.kind == 'f':
+                head = head[~np.isnan(head)]
+            distinct = pd.unique(head)[:sample_size]
+            if len(distinct) >= sample_size or window >= len(data):
+                return [str(val) for val in distinct.tolist()]
+            window *= 2
+    
+    def read_csv_arrow(self, file_path: Path) -> Tuple[Optional[Any], Dict[str, Any]]:
+        """
+        Read a CSV file into an Arrow table with Arrow's multithreaded reader.
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Returns:
+            Tuple of (pyarrow.Table or None, metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        if not metadata["file_exists"]:
+            return None, metadata
+        
+        encodings_to_try = self.resolve_encoding(file_path, metadata)
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True)
+        
+        for encoding in encodings_to_try:
+            try:
+                read_options = pa_csv.ReadOptions(encoding=encoding, use_threads=True)
+                table = pa_csv.read_csv(file_path, read_options=read_options, convert_options=convert_options)
+                if encoding != metadata["encoding_used"]:
+                    metadata["encoding_used"] = encoding
+                    metadata["encoding_confidence"] = 0.5
+                metadata["read_success"] = True
+                print(f"✅ Successfully read {file_path.name} with Arrow ({encoding} encoding)")
+                return table, metadata
+            except (UnicodeDecodeError, pa.ArrowInvalid) as e:
+                # Arrow reports undecodable bytes as ArrowInvalid, so try the fallback encoding
+                metadata["error_message"] = f"Error reading with Arrow ({encoding}): {str(e)}"
+                continue
+            except Exception as e:
+                metadata["error_message"] = f"Error reading with Arrow ({encoding}): {str(e)}"
+                return None, metadata
+        
+        return None, metadata
+    
+    def analyze_arrow_table(self, table: Any, sample_size: int = 3,
+                            initial_window: int = 64) -> Dict[str, Any]:
+        """
+        Analyze an Arrow table to extract technical metadata.
+        
+        Produces the same shape as analyze_dataframe. Null counts are read from the
+        arrays (Arrow tracks them, nothing is scanned), data types are the dtypes
+        a pandas read reports (text datetimes are detected and parsed the same
+        way), and samples use Arrow compute kernels over a growing leading slice.
+        
+        Args:
+            table: pyarrow.Table
+            sample_size: Number of distinct sample values to keep per column
+            initial_window: Number of leading rows inspected in the first round
+            
+        Returns:
+            Dictionary with analysis results
+        """
+        analysis = {
+            "record_count": table.num_rows,
+            "column_count": table.num_columns,
+            "columns_array": table.column_names,
+            "data_types": {},
+            "null_counts": {},
+            "sample_values": {},
+            "memory_usage_mb": round(table.nbytes / 1024 / 1024, 2)
+        }
+        
+        try:
+            analysis["datetime_ranges"] = {}
+            for field, column in zip(table.schema, table.columns):
+                analysis["null_counts"][field.name] = int(column.null_count)
+                
+                # Dates and timestamps are reported like the datetimes the pandas path parses
+                if pa.types.is_date(field.type) or (pa.types.is_timestamp(field.type) and field.type.tz is None):
+                    column = column.cast(pa.timestamp('us'))
+                
+                # Text columns go through the same datetime detection as the pandas path
+                parsed = self.convert_arrow_datetime(field.name, column)
+                if parsed is not None:
+                    analysis["data_types"][field.name] = str(parsed.dtype)
+                    value_range = DatetimeDetector.value_range(parsed)
+                    if value_range:
+                        analysis["datetime_ranges"][field.name] = value_range
+                    analysis["sample_values"][field.name] = self.first_distinct_samples(
+                        parsed.to_frame(), sample_size, initial_window
+                    )[field.name]
+                    if self.column_statistics:
+                        analysis.setdefault("column_sketches", {})[field.name] = ColumnSketch().update(parsed)
+                    continue
+                
+                analysis["data_types"][field.name] = self.arrow_logical_dtype(column)
+                
+                # Arrow's reader already infers ISO timestamps
+                if pa.types.is_timestamp(column.type):
+                    value_range = self.arrow_value_range(column)
+                    if value_range:
+                        analysis["datetime_ranges"][field.name] = value_range
+                
+                # Early-exit distinct sampling over a doubling leading slice
+                window = initial_window
+                while True:
+                    head = pc.drop_null(column.slice(0, window))
+                    distinct = pc.unique(head).slice(0, sample_size).to_pylist()
+                    if len(distinct) >= sample_size or window >= table.num_rows:
+                        break
+                    window *= 2
+                analysis["sample_values"][field.name] = [str(val) for val in distinct]
+                if pa.types.is_integer(column.type) and analysis["data_types"][field.name] == 'float64':
+                    analysis["sample_values"][field.name] = self.float_samples(analysis["sample_values"][field.name])
+                
+                if self.column_statistics:
+                    analysis.setdefault("column_sketches", {})[field.name] = ColumnSketch().update(
+                        column.to_pandas()
+                    )
+            
+            if self.detect_semantic_types:
+                analysis["semantic_types"] = self.detect_arrow_semantic_types(table)
+            
+            print(f"📊 Arrow table analysis completed:")
+            print(f"   Records: {analysis['record_count']:,}")
+            print(f"   Columns: {analysis['column_count']}")
+            print(f"   Memory: {analysis['memory_usage_mb']} MB")
+            
+        except Exception as e:
+            print(f"⚠️  Error during Arrow table analysis: {e}")
+        
+        return analysis
+    
+    def detect_arrow_semantic_types(self, table: Any) -> Dict[str, str]:
+        """
+        Detect semantic types from an evenly spaced row sample of an Arrow table
+        (or record batch); only the sampled rows are converted to pandas.
+        """
+        if table.num_rows > self.semantic_detector.sample_rows:
+            positions = np.linspace(0, table.num_rows - 1, self.semantic_detector.sample_rows).astype(np.int64)
+            table = table.take(pa.array(positions))
+        return self.semantic_detector.detect_frame(table.to_pandas())
+    
+    @staticmethod
+    def arrow_logical_dtype(column: Any) -> str:
+        """
+        Dtype a default pandas read reports for an Arrow-inferred column, so both
+        backends map to the same SQL types: integers with nulls and all-null
+        columns are float64, booleans with nulls are object. Decimals and dates,
+        which pandas would report as object, are named 'decimal' and by their
+        Arrow date type so they map to DECIMAL and DATE.
+        
+        Args:
+            column: pyarrow.ChunkedArray
+            
+        Returns:
+            Pandas dtype as string
+        """
+        arrow_type = column.type
+        if pa.types.is_null(arrow_type):
+            return 'float64'
+        if pa.types.is_integer(arrow_type):
+            return 'float64' if column.null_count else 'int64'
+        if pa.types.is_floating(arrow_type):
+            return 'float64' if arrow_type.bit_width == 64 else 'float32'
+        if pa.types.is_boolean(arrow_type):
+            return 'object' if column.null_count else 'bool'
+        if pa.types.is_decimal(arrow_type):
+            return 'decimal'
+        if pa.types.is_date(arrow_type):
+            return str(arrow_type)
+        return str(column.slice(0, 0).to_pandas().dtype)
+    
+    def convert_arrow_datetime(self, column_name: str, column: Any) -> Optional[pd.Series]:
+        """
+        Parse an Arrow text column that holds datetimes.
+        
+        The format is detected on the leading non-null values, as in the pandas
+        path; only a column that matches is converted to pandas and parsed.
+        
+        Args:
+            column_name: Column name
+            column: pyarrow.ChunkedArray
+            
+        Returns:
+            Parsed datetime64 Series, or None if the column is not a text datetime
+        """
+        if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            return None
+        head = pc.drop_null(column).slice(0, self.datetime_detector.sample_size).to_pandas()
+        fmt = self.datetime_detector.detect_format(column_name, head)
+        if fmt is None:
+            return None
+        parsed, _ = self.datetime_detector.convert(column_name, column.to_pandas(), fmt)
+        return parsed
+    
+    @staticmethod
+    def arrow_value_range(column: Any) -> Optional[Dict[str, str]]:
+        """ISO-formatted min/max of an Arrow timestamp or date column (None if all null)."""
+        extremes = pc.min_max(column)
+        if not extremes["min"].is_valid:
+            return None
+        return {
+            "min": extremes["min"].as_py().isoformat(),
+            "max": extremes["max"].as_py().isoformat()
+        }
+    
+    def profile_csv_arrow(self, file_path: Path) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Read and analyze a CSV file with the Arrow backend.
+        
+        Args:
+            file_path: Path to CSV file
+            
+        Returns:
+            Tuple of (analysis dict or None, file metadata dict)
+        """
+        table, metadata = self.read_csv_arrow(file_path)
+        if table is None:
+            return None, metadata
+        analysis = self.analyze_arrow_table(table)
+        if self.columnar_cache:
+            self.write_columnar_copy(file_path, lambda info: self.columnar_cache.write_table(file_path, table, info),
+                                     metadata)
+        return analysis, metadata
+    
+    def detect_input_format(self, file_path: Path, yaml_config: Dict[str, Any]) -> str:
+        """
+        Decide how a dataset file should be read.
+        
+        The file suffix wins; otherwise the YAML dataset_info.format is used.
+        
+        Args:
+            file_path: Path to the dataset file
+            yaml_config: Complete YAML configuration dictionary
+            
+        Returns:
+            One of "csv", "parquet" or "feather"
+        """
+        suffix = file_path.suffix.lower()
+        if suffix in ('.parquet', '.pq'):
+            return 'parquet'
+        if suffix in ('.feather', '.arrow', '.ipc'):
+            return 'feather'
+        if suffix == '.csv':
+            return 'csv'
+        
+        declared = str(yaml_config.get('dataset_info', {}).get('format', 'CSV')).lower()
+        return declared if declared in ('parquet', 'feather') else 'csv'
+    
+    @staticmethod
+    def _collect_batch_samples(batches, analysis: Dict[str, Any], sample_size: int = 3,
+                               max_rows: int = 65536) -> int:
+        """
+        Fill analysis["sample_values"] from a stream of Arrow record batches.
+        
+        Stops as soon as every column has sample_size distinct values or max_rows
+        rows have been looked at.
+        
+        Args:
+            batches: Iterable of pyarrow.RecordBatch
+            analysis: Analysis dict whose sample_values are filled in place
+            sample_size: Number of distinct values to keep per column
+            max_rows: Upper bound on rows inspected for samples
+            
+        Returns:
+            Bytes of batch data that were loaded
+        """
+        samples = analysis["sample_values"]
+        seen = {name: set(values) for name, values in samples.items()}
+        rows_seen = 0
+        bytes_loaded = 0
+        
+        for batch in batches:
+            bytes_loaded += batch.nbytes
+            for name, column in zip(batch.schema.names, batch.columns):
+                if len(samples[name]) >= sample_size:
+                    continue
+                for value in pc.unique(pc.drop_null(column)).to_pylist():
+                    value_str = str(value)
+                    if value_str not in seen[name]:
+                        seen[name].add(value_str)
+                        samples[name].append(value_str)
+                        if len(samples[name]) >= sample_size:
+                            break
+            rows_seen += batch.num_rows
+            if rows_seen >= max_rows or all(len(v) >= sample_size for v in samples.values()):
+                break
+        
+        return bytes_loaded
+    
+    def profile_parquet(self, file_path: Path) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Profile a Parquet file from its footer metadata.
+        
+        Record count, columns and types come from the file footer, and null counts
+        from row-group statistics; no data pages are read for them. Only columns
+        whose row groups lack null-count statistics are read (as a one-column
+        projection). Sample values come from the first small record batches.
+        
+        Args:
+            file_path: Path to Parquet file
+            
+        Returns:
+            Tuple of (analysis dict or None, file metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        metadata["encoding_used"] = None
+        if not metadata["file_exists"]:
+            return None, metadata
+        
+        try:
+            parquet_file = pq.ParquetFile(file_path)
+            file_meta = parquet_file.metadata
+            schema = parquet_file.schema_arrow
+            
+            analysis = {
+                "record_count": file_meta.num_rows,
+                "column_count": len(schema.names),
+                "columns_array": list(schema.names),
+                # Schema types named like the dtypes of the other readers (large_string -> str)
+                "data_types": {field.name: self.arrow_logical_dtype(pa.chunked_array([], type=field.type))
+                               for field in schema},
+                "null_counts": {},
+                "sample_values": {name: [] for name in schema.names},
+                "memory_usage_mb": 0
+            }
+            
+            # Null counts from row-group statistics (top-level leaf columns only)
+            leaf_index = {
+                file_meta.schema.column(i).path: i for i in range(file_meta.num_columns)
+            }
+            missing_stats = []
+            for name in schema.names:
+                column_index = leaf_index.get(name)
+                null_count = 0 if column_index is not None else None
+                for rg in range(file_meta.num_row_groups):
+                    if null_count is None:
+                        break
+                    stats = file_meta.row_group(rg).column(column_index).statistics
+                    if stats is None or not stats.has_null_count:
+                        null_count = None
+                    else:
+                        null_count += stats.null_count
+                if null_count is None:
+                    missing_stats.append(name)
+                else:
+                    analysis["null_counts"][name] = int(null_count)
+            
+            bytes_loaded = 0
+            for name in missing_stats:
+                column = parquet_file.read(columns=[name]).column(0)
+                analysis["null_counts"][name] = int(column.null_count)
+                bytes_loaded += column.nbytes
+            
+            # Datetime ranges from row-group min/max statistics
+            analysis["datetime_ranges"] = {}
+            for field in schema:
+                if not (pa.types.is_timestamp(field.type) or pa.types.is_date(field.type)):
+                    continue
+                column_index = leaf_index.get(field.name)
+                value_range = None
+                for rg in range(file_meta.num_row_groups if column_index is not None else 0):
+                    stats = file_meta.row_group(rg).column(column_index).statistics
+                    if stats is None or not stats.has_min_max:
+                        value_range = None
+                        break
+                    value_range = DatetimeDetector.merge_ranges(
+                        value_range, {"min": stats.min.isoformat(), "max": stats.max.isoformat()}
+                    )
+                if value_range is None:
+                    column = parquet_file.read(columns=[field.name]).column(0)
+                    value_range = self.arrow_value_range(column)
+                    bytes_loaded += column.nbytes
+                if value_range:
+                    analysis["datetime_ranges"][field.name] = value_range
+            
+            # Small leading batches for sample values
+            bytes_loaded += self._collect_batch_samples(
+                parquet_file.iter_batches(batch_size=1024), analysis
+            )
+            if self.detect_semantic_types and file_meta.num_rows:
+                first_batch = next(parquet_file.iter_batches(batch_size=self.semantic_detector.sample_rows))
+                analysis["semantic_types"] = self.detect_arrow_semantic_types(first_batch)
+            analysis["memory_usage_mb"] = round(bytes_loaded / 1024 / 1024, 2)
+            
+            metadata["read_success"] = True
+            print(f"✅ Read Parquet footer for {file_path.name} ({file_meta.num_row_groups} row groups)")
+            if missing_stats:
+                print(f"   Null counts scanned for {len(missing_stats)} columns without statistics")
+            print(f"📊 Parquet metadata analysis completed:")
+            print(f"   Records: {analysis['record_count']:,}")
+            print(f"   Columns: {analysis['column_count']}")
+            return analysis, metadata
+            
+        except Exception as e:
+            metadata["error_message"] = f"Error reading Parquet metadata: {str(e)}"
+            return None, metadata
+    
+    def profile_feather(self, file_path: Path) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Profile a Feather (Arrow IPC) file through a memory map.
+        
+        Row and null counts are taken from the record batch headers. For
+        uncompressed files nothing is copied; compressed batches are decompressed
+        one at a time.
+        
+        Args:
+            file_path: Path to Feather file
+            
+        Returns:
+            Tuple of (analysis dict or None, file metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        metadata["encoding_used"] = None
+        if not metadata["file_exists"]:
+            return None, metadata
+        
+        try:
+            with pa.memory_map(str(file_path), 'r') as source:
+                reader = pa.ipc.open_file(source)
+                schema = reader.schema
+                
+                analysis = {
+                    "record_count": 0,
+                    "column_count": len(schema.names),
+                    "columns_array": list(schema.names),
+                    # Schema types named like the dtypes of the other readers (large_string -> str)
+                    "data_types": {field.name: self.arrow_logical_dtype(pa.chunked_array([], type=field.type))
+                                   for field in schema},
+                    "null_counts": {name: 0 for name in schema.names},
+                    "sample_values": {name: [] for name in schema.names},
+                    "memory_usage_mb": 0,
+                    "datetime_ranges": {}
+                }
+                datetime_columns = {
+                    field.name for field in schema
+                    if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type)
+                }
+                
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    analysis["record_count"] += batch.num_rows
+                    for name, column in zip(schema.names, batch.columns):
+                        analysis["null_counts"][name] += column.null_count
+                        if name in datetime_columns:
+                            analysis["datetime_ranges"][name] = DatetimeDetector.merge_ranges(
+                                analysis["datetime_ranges"].get(name), self.arrow_value_range(column)
+                            )
+                
+                analysis["datetime_ranges"] = {
+                    name: value_range for name, value_range in analysis["datetime_ranges"].items() if value_range
+                }
+                
+                bytes_loaded = self._collect_batch_samples(
+                    (reader.get_batch(i) for i in range(reader.num_record_batches)), analysis
+                )
+                if self.detect_semantic_types and reader.num_record_batches:
+                    analysis["semantic_types"] = self.detect_arrow_semantic_types(
+                        reader.get_batch(0).slice(0, self.semantic_detector.sample_rows)
+                    )
+                analysis["memory_usage_mb"] = round(bytes_loaded / 1024 / 1024, 2)
+            
+            metadata["read_success"] = True
+            print(f"✅ Read Feather batches for {file_path.name} ({reader.num_record_batches} batches)")
+            print(f"📊 Feather metadata analysis completed:")
+            print(f"   Records: {analysis['record_count']:,}")
+            print(f"   Columns: {analysis['column_count']}")
+            return analysis, metadata
+            
+        except Exception as e:
+            metadata["error_message"] = f"Error reading Feather file: {str(e)}"
+            return None, metadata
+    
+    @staticmethod
+    def merge_data_types(current: Optional[str], new: str) -> str:
+        """
+        Merge dtypes inferred for the same column in different chunks.
+        
+        Pandas infers types per chunk, so a column can be int64 in one chunk and
+        float64 in the next (e.g. once nulls appear). The merged type is the one a
+        single full read would have produced.
+        
+        Args:
+            current: Type merged so far (None if not seen yet)
+            new: Type inferred for the next chunk
+            
+        Returns:
+            Merged pandas dtype string
+        """
+        if current is None or current == new:
+            return new
+        if current == 'null' or new == 'null':
+            # Arrow's type for columns without values carries no type information
+            return new if current == 'null' else current
+        
+        current, new = CSVExtractor.normalize_dtype(current), CSVExtractor.normalize_dtype(new)
+        if current == new:
+            return new
+        
+        numeric_rank = {'bool': 0, 'int32': 1, 'int64': 2, 'float32': 3, 'float64': 4}
+        if current in numeric_rank and new in numeric_rank:
+            if 'bool' in (current, new):
+                return 'object'
+            return max(current, new, key=numeric_rank.get)
+        
+        return 'object'
+    
+    @staticmethod
+    def normalize_dtype(dtype: str) -> str:
+        """
+        Numpy equivalent of a nullable, extension or Arrow dtype name.
+        
+        Int64/Float64/boolean, category, string and Arrow names (double,
+        large_string, ...) become the dtype a default pandas read reports, so
+        types inferred by different readers can be ranked against each other.
+        """
+        aliases = {
+            'boolean': 'bool', 'double': 'float64', 'float': 'float32', 'halffloat': 'float32',
+            'int8': 'int32', 'int16': 'int32', 'uint8': 'int32', 'uint16': 'int32', 'uint32': 'int64',
+            'uint64': 'int64', 'category': 'object', 'str': 'object', 'string': 'object',
+            'large_string': 'object', 'string[python]': 'object', 'string[pyarrow]': 'object'
+        }
+        if dtype.startswith(('Int', 'UInt')):
+            return 'int64'
+        if dtype.startswith('Float'):
+            return 'float64'
+        if dtype.startswith(('datetime64', 'timestamp')) and ',' not in dtype:
+            return 'datetime64[ns]'
+        return aliases.get(dtype, dtype)
+    
+    def profile_csv_streaming(self, file_path: Path,
+                              sample_size: int = 3) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Profile a CSV file in a single pass over bounded-size chunks.
+        
+        Chunk size is derived from chunk_memory_mb: the first small chunk is used to
+        measure in-memory bytes per row, and every following chunk is sized (and
+        re-calibrated) so it stays within the budget. Peak memory therefore depends
+        on the chunk budget and the column count, not on the file size.
+        
+        Args:
+            file_path: Path to CSV file
+            sample_size: Number of distinct sample values to keep per column
+            
+        Returns:
+            Tuple of (analysis dict in the analyze_dataframe shape or None, file metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        if not metadata["file_exists"]:
+            return None, metadata
+        
+        budget_bytes = self.chunk_memory_mb * 1024 * 1024
+        encodings_to_try = self.resolve_encoding(file_path, metadata)
+        
+        for encoding in encodings_to_try:
+            try:
+                analysis = {
+                    "record_count": 0,
+                    "column_count": 0,
+                    "columns_array": [],
+                    "data_types": {},
+                    "null_counts": {},
+                    "sample_values": {},
+                    "memory_usage_mb": 0
+                }
+                dtypes_seen = {}
+                seen_samples = {}
+                datetime_formats = {}
+                datetime_ranges = {}
+                semantic_pending = set()
+                peak_chunk_bytes = 0
+                chunk_rows = 1000
+                chunk_count = 0
+                
+                with pd.read_csv(file_path, encoding=encoding, chunksize=chunk_rows) as reader:
+                    while True:
+                        try:
+                            chunk = reader.get_chunk(chunk_rows)
+                        except StopIteration:
+                            break
+                        
+                        if chunk_count == 0:
+                            analysis["columns_array"] = chunk.columns.tolist()
+                            analysis["column_count"] = len(chunk.columns)
+                            for column in chunk.columns:
+                                analysis["null_counts"][column] = 0
+                                analysis["sample_values"][column] = []
+                                seen_samples[column] = set()
+                            if self.column_statistics:
+                                analysis["column_sketches"] = {
+                                    column: ColumnSketch() for column in chunk.columns
+                                }
+                            if self.detect_semantic_types:
+                                analysis["semantic_types"] = {}
+                                semantic_pending = set(chunk.columns)
+                        chunk_count += 1
+                        
+                        rows = len(chunk)
+                        analysis["record_count"] += rows
+                        
+                        # Formats detected in the first chunk with values are reused
+                        chunk, chunk_ranges = self.convert_datetime_columns(chunk, datetime_formats)
+                        for column, value_range in chunk_ranges.items():
+                            datetime_ranges[column] = DatetimeDetector.merge_ranges(
+                                datetime_ranges.get(column), value_range
+                            )
+                        
+                        for column, null_count in chunk.isnull().sum().items():
+                            analysis["null_counts"][column] += int(null_count)
+                            
+                            # All-null chunks carry no type information (pandas reports float64)
+                            if null_count < rows:
+                                dtypes_seen[column] = self.merge_data_types(
+                                    dtypes_seen.get(column), str(chunk[column].dtype)
+                                )
+                            elif column not in analysis["data_types"]:
+                                analysis["data_types"][column] = str(chunk[column].dtype)
+                        
+                        pending_columns = [
+                            column for column in chunk.columns
+                            if len(analysis["sample_values"][column]) < sample_size
+                        ]
+                        if pending_columns:
+                            chunk_samples = self.first_distinct_samples(chunk[pending_columns], sample_size)
+                            for column, values in chunk_samples.items():
+                                samples = analysis["sample_values"][column]
+                                for value_str in values:
+                                    if len(samples) >= sample_size:
+                                        break
+                                    if value_str not in seen_samples[column]:
+                                        seen_samples[column].add(value_str)
+                                        samples.append(value_str)
+                        
+                        # Sketches are merged chunk by chunk, memory stays bounded per column
+                        for column, sketch in analysis.get("column_sketches", {}).items():
+                            sketch.update(chunk[column])
+                        
+                        # Semantic types: each column is classified once, from the first
+                        # chunk whose row sample holds enough of its values
+                        if semantic_pending:
+                            sample = self.semantic_detector.sample_frame(chunk)
+                            ready = [
+                                column for column in chunk.columns
+                                if column in semantic_pending
+                                and self.semantic_detector.has_enough_values(sample[column])
+                            ]
+                            if ready:
+                                analysis["semantic_types"].update(
+                                    self.semantic_detector.detect_frame(chunk, ready)
+                                )
+                                semantic_pending.difference_update(ready)
+                        
+                        # Re-calibrate the next chunk size from the measured footprint
+                        chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+                        peak_chunk_bytes = max(peak_chunk_bytes, chunk_bytes)
+                        if rows:
+                            bytes_per_row = max(chunk_bytes / rows, 1)
+                            chunk_rows = max(int(budget_bytes / bytes_per_row), 1)
+                        del chunk
+                
+                analysis["data_types"].update(dtypes_seen)
+                # A column that stopped parsing in a later chunk merged to object
+                analysis["datetime_ranges"] = {
+                    column: value_range for column, value_range in datetime_ranges.items()
+                    if analysis["data_types"].get(column, '').startswith('datetime64')
+                }
+                analysis["memory_usage_mb"] = round(peak_chunk_bytes / 1024 / 1024, 2)
+                if encoding != metadata["encoding_used"]:
+                    metadata["encoding_used"] = encoding
+                    metadata["encoding_confidence"] = 0.5
+                metadata["read_success"] = True
+                
+                print(f"✅ Streamed {file_path.name} with {encoding} encoding ({chunk_count} chunks)")
+                print(f"📊 Streaming analysis completed:")
+                print(f"   Records: {analysis['record_count']:,}")
+                print(f"   Columns: {analysis['column_count']}")
+                print(f"   Peak chunk memory: {analysis['memory_usage_mb']} MB")
+                return analysis, metadata
+                
+            except UnicodeDecodeError:
+                continue
+            except Exception as e:
+                metadata["error_message"] = f"Error streaming with {encoding}: {str(e)}"
+                return None, metadata
+        
+        if not metadata["error_message"]:
+            metadata["error_message"] = "Could not read file with any encoding"
+        return None, metadata
+    
+    def profile_csv_schema_only(self, file_path: Path) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Get columns and record count of a CSV file without parsing its fields.
+        
+        The header is parsed on its own and records are counted by scanning the
+        memory-mapped file for unquoted record terminators (quoted newlines in
+        free-text columns are handled). Type, null and sample profiling is
+        skipped entirely; the analysis is marked with profiled=False.
+        
         Args:
             file_path: Path to CSV file
             
         Returns:
-            Tuple of (DataFrame or None, metadata dict)
+            Tuple of (analysis dict or None, file metadata dict)
         """
-        metadata = {
-            "file_exists": False,
-            "file_size_bytes": 0,
-            "last_modified": None,
-            "read_success": False,
-            "error_message": None,
-            "encoding_used": "utf-8"
-        }
+        metadata = self.get_file_metadata(file_path)
+        if not metadata["file_exists"]:
+            return None, metadata
         
         try:
-            # Check if file exists
-            if not file_path.exists():
-                metadata["error_message"] = f"File not found: {file_path}"
+            encoding = self.resolve_encoding(file_path, metadata)[0]
+            if encoding.startswith('utf-16'):
+                metadata["error_message"] = "Schema-only scan does not support UTF-16 files"
                 return None, metadata
             
-            metadata["file_exists"] = True
-            metadata["file_size_bytes"] = file_path.stat().st_size
-            metadata["last_modified"] = datetime.fromtimestamp(
-                file_path.stat().st_mtime, tz=timezone.utc
-            ).isoformat()
-            
-            # Try to read CSV with different encodings if needed
-            encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            
-            for encoding in encodings_to_try:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding, low_memory=False)
-                    metadata["encoding_used"] = encoding
-                    metadata["read_success"] = True
-                    print(f"✅ Successfully read {file_path.name} with {encoding} encoding")
-                    return df, metadata
-                except UnicodeDecodeError:
-                    continue
-                except Exception as e:
-                    metadata["error_message"] = f"Error reading with {encoding}: {str(e)}"
-                    continue
+            scan = CSVRecordScanner().scan(file_path, encoding=encoding)
+            analysis = {
+                "record_count": scan["record_count"],
+                "column_count": len(scan["header"]),
+                "columns_array": scan["header"],
+                "data_types": {},
+                "null_counts": {},
+                "sample_values": {},
+                "memory_usage_mb": 0,
+                "profiled": False
+            }
+            metadata["read_success"] = True
             
-            # If all encodings failed
-            metadata["error_message"] = "Could not read file with any encoding"
-            return None, metadata
+            print(f"✅ Scanned {file_path.name} in schema-only mode")
+            print(f"   Records: {analysis['record_count']:,}")
+            print(f"   Columns: {analysis['column_count']}")
+            return analysis, metadata
             
         except Exception as e:
-            metadata["error_message"] = f"Unexpected error: {str(e)}"
+            metadata["error_message"] = f"Error scanning CSV: {str(e)}"
             return None, metadata
     
-    def analyze_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def should_stream(self, file_path: Path) -> bool:
         """
-        Analyze DataFrame to extract technical metadata.
+        Decide whether a file should be profiled in streaming mode.
         
         Args:
-            df: Pandas DataFrame
+            file_path: Path to CSV file
             
         Returns:
-            Dictionary with analysis results
+            True if streaming is forced or the file exceeds streaming_threshold_mb
         """
-        analysis = {
-            "record_count": len(df),
-            "column_count": len(df.columns),
-            "columns_array": df.columns.tolist(),
-            "data_types": {},
-            "null_counts": {},
-            "sample_values": {},
-            "memory_usage_mb": 0
-        }
-        
+        if self.streaming:
+            return True
         try:
-            # Basic statistics
-            analysis["memory_usage_mb"] = round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
-            
-            # Column analysis
-            for column in df.columns:
-                # Data type
-                analysis["data_types"][column] = str(df[column].dtype)
-                
-                # Null count
-                analysis["null_counts"][column] = int(df[column].isnull().sum())
-                
-                # Sample values (non-null, unique, first few)
-                non_null_values = df[column].dropna()
-                if len(non_null_values) > 0:
-                    unique_values = non_null_values.unique()
-                    # Get first 3 unique values as samples
-                    sample_count = min(3, len(unique_values))
-                    samples = unique_values[:sample_count].tolist()
-                    
-                    # Convert to strings for JSON serialization
-                    analysis["sample_values"][column] = [str(val) for val in samples]
-                else:
-                    analysis["sample_values"][column] = []
-            
-            print(f"📊 DataFrame analysis completed:")
-            print(f"   Records: {analysis['record_count']:,}")
-            print(f"   Columns: {analysis['column_count']}")
-            print(f"   Memory: {analysis['memory_usage_mb']} MB")
-            
-        except Exception as e:
-            print(f"⚠️  Error during DataFrame analysis: {e}")
-            
-        return analysis
+            size_mb = file_path.stat().st_size / 1024 / 1024
+        except OSError:
+            return False
+        return size_mb > self.streaming_threshold_mb
     
     def map_pandas_to_sql_types(self, pandas_dtype: str) -> str:
         """
-        Map Pandas data types to SQL-like types.
+        Map Pandas (or Arrow) data types to SQL-like types.
         
         Args:
-            pandas_dtype: Pandas dtype as string
+            pandas_dtype: Pandas dtype as string, or an Arrow type name when the
+                Arrow backend produced the analysis
             
         Returns:
             SQL-like type string
@@ -161,96 +1400,164 @@ class CSVExtractor:
             'string': 'VARCHAR',
             'bool': 'BOOLEAN',
             'datetime64[ns]': 'TIMESTAMP',
-            'category': 'VARCHAR'
+            'category': 'VARCHAR',
+            
+            # Arrow type names
+            'int8': 'INTEGER',
+            'int16': 'INTEGER',
+            'uint8': 'INTEGER',
+            'uint16': 'INTEGER',
+            'uint32': 'INTEGER',
+            'uint64': 'INTEGER',
+            'double': 'DECIMAL',
+            'float': 'FLOAT',
+            'halffloat': 'FLOAT',
+            'large_string': 'VARCHAR',
+            'date32[day]': 'DATE',
+            'date64[ms]': 'DATE',
+            'null': 'VARCHAR'
         }
         
+        # Arrow decimals of any precision and scale (decimal128(3, 2), ...)
+        if pandas_dtype.startswith('decimal'):
+            return 'DECIMAL'
+        
         # Handle nullable integer types
         if 'Int' in pandas_dtype:
             return 'INTEGER'
         elif 'Float' in pandas_dtype:
             return 'DECIMAL'
         
+        # Any time unit / timezone (datetime64[us], timestamp[ms], ...)
+        if pandas_dtype.startswith(('datetime64', 'timestamp')):
+            return 'TIMESTAMP'
+        
         return type_mapping.get(pandas_dtype, 'VARCHAR')
     
-    def create_detailed_column_info(self, df_analysis: Dict[str, Any], yaml_config: Dict[str, Any]) -> str:
+    def create_detailed_column_info(self, df_analysis: Dict[str, Any], yaml_config: Dict[str, Any]) -> DetailedColumnInfo:
         """
-        Create detailed column information JSON by combining technical analysis with YAML config.
+        Create detailed column information by combining technical analysis with YAML config.
+        
+        The structure stays in memory; it is serialized once, at the Weaviate
+        upload boundary (see ingestion.json_utils).
         
         Args:
             df_analysis: Technical analysis from DataFrame
             yaml_config: Human-supplied YAML configuration
             
         Returns:
-            JSON string with detailed column information
+            DetailedColumnInfo with one ColumnProfile per column
         """
         try:
             columns_info = []
             yaml_columns = yaml_config.get('columns', {})
+            profiled = df_analysis.get('profiled', True)
+            record_count = df_analysis.get('record_count', 0)
+            check_sparse = profiled and self.sparse_null_ratio is not None and record_count > 0
             
             for column_name in df_analysis['columns_array']:
-                # Get technical info
-                pandas_type = df_analysis['data_types'].get(column_name, 'object')
-                sql_type = self.map_pandas_to_sql_types(pandas_type)
-                null_count = df_analysis['null_counts'].get(column_name, 0)
+                # Get technical info (unknown when profiling was skipped)
+                if profiled:
+                    pandas_type = df_analysis['data_types'].get(column_name, 'object')
+                    sql_type = self.map_pandas_to_sql_types(pandas_type)
+                    null_count = df_analysis['null_counts'].get(column_name, 0)
+                else:
+                    pandas_type = None
+                    sql_type = 'UNKNOWN'
+                    null_count = None
                 sample_values = df_analysis['sample_values'].get(column_name, [])
+                sketch = df_analysis.get('column_sketches', {}).get(column_name)
+                value_range = df_analysis.get('datetime_ranges', {}).get(column_name)
+                detected_type = df_analysis.get('semantic_types', {}).get(column_name)
                 
                 # Get human-supplied info from YAML
                 yaml_column_info = yaml_columns.get(column_name, {})
                 
-                column_info = {
-                    "name": column_name,
-                    "dataType": sql_type,
-                    "pandasType": pandas_type,
-                    "nullCount": null_count,
-                    "sampleValues": sample_values,
+                column_info = ColumnProfile(
+                    name=column_name,
+                    data_type=sql_type,
+                    pandas_type=pandas_type,
+                    null_count=null_count,
+                    sample_values=sample_values,
                     
                     # Human-supplied metadata from YAML
-                    "description": yaml_column_info.get('description', f"Column {column_name}"),
-                    "semanticType": yaml_column_info.get('semantic_type', 'unknown'),
-                    "businessName": yaml_column_info.get('business_name', column_name),
-                    "dataClassification": yaml_column_info.get('data_classification', 'Internal'),
-                    "isPrimaryKey": yaml_column_info.get('is_primary_key', False),
-                    "isForeignKeyToTable": yaml_column_info.get('is_foreign_key_to_table'),
-                    "isForeignKeyToColumn": yaml_column_info.get('is_foreign_key_to_column')
-                }
+                    description=yaml_column_info.get('description', f"Column {column_name}"),
+                    semantic_type=yaml_column_info.get('semantic_type') or detected_type or 'unknown',
+                    business_name=yaml_column_info.get('business_name', column_name),
+                    data_classification=yaml_column_info.get('data_classification', 'Internal'),
+                    is_primary_key=yaml_column_info.get('is_primary_key', False),
+                    is_foreign_key_to_table=yaml_column_info.get('is_foreign_key_to_table'),
+                    is_foreign_key_to_column=yaml_column_info.get('is_foreign_key_to_column'),
+                    semantic_type_detected=not yaml_column_info.get('semantic_type') and detected_type is not None
+                )
+                
+                # Approximate statistics: approxDistinctCount, topValues, quantiles
+                if sketch is not None:
+                    stats = sketch.summary()
+                    column_info.approx_distinct_count = stats["approxDistinctCount"]
+                    column_info.top_values = stats["topValues"]
+                    column_info.quantiles = stats.get("quantiles")
+                
+                if value_range:
+                    column_info.min_value = value_range["min"]
+                    column_info.max_value = value_range["max"]
+                
+                # Mostly-empty columns are kept in compact form
+                if check_sparse:
+                    null_ratio = null_count / record_count
+                    if null_ratio > self.sparse_null_ratio:
+                        column_info.is_sparse = True
+                        column_info.null_ratio = round(null_ratio, 4)
                 
                 columns_info.append(column_info)
             
-            # Create full structure with column groups
-            detailed_info = {
-                "columns": columns_info,
-                "columnGroups": yaml_config.get('column_groups', {}),
-                "totalColumns": len(columns_info),
-                "generatedAt": datetime.now(timezone.utc).isoformat()
-            }
-            
-            return json.dumps(detailed_info, indent=2)
+            detailed_column_info = DetailedColumnInfo(
+                columns=columns_info,
+                column_groups=yaml_config.get('column_groups', {}),
+                profile_mode="full" if profiled else "schema_only",
+                sparse_null_ratio=self.sparse_null_ratio if check_sparse else None
+            )
+            if detailed_column_info.sparse_columns:
+                print(f"🕳️  {len(detailed_column_info.sparse_columns)} sparse columns "
+                      f"(>{self.sparse_null_ratio:.0%} null)")
+            return detailed_column_info
             
         except Exception as e:
             print(f"❌ Error creating detailed column info: {e}")
-            return json.dumps({"error": str(e), "columns": []})
+            return DetailedColumnInfo(error=str(e))
     
-    def create_column_semantics_concatenated(self, detailed_column_info_json: str) -> str:
+    def create_column_semantics_concatenated(self, detailed_column_info: DetailedColumnInfo) -> str:
         """
         Create concatenated string of column names and descriptions for semantic search.
         
+        Sparse columns are left out unless embed_sparse_columns is set; their
+        count is noted at the end so searches still see that they exist.
+        
         Args:
-            detailed_column_info_json: JSON string with detailed column info
+            detailed_column_info: Detailed column info from create_detailed_column_info
+                (its dict or JSON string form is accepted too)
             
         Returns:
             Concatenated string for semantic search
         """
         try:
-            column_data = json.loads(detailed_column_info_json)
-            columns = column_data.get('columns', [])
+            if isinstance(detailed_column_info, str):
+                detailed_column_info = json.loads(detailed_column_info)
+            if isinstance(detailed_column_info, dict):
+                detailed_column_info = DetailedColumnInfo.from_dict(detailed_column_info)
+            columns = detailed_column_info.columns
             
             semantic_parts = []
+            skipped_sparse = 0
             
             for column in columns:
-                name = column.get('name', '')
-                description = column.get('description', '')
-                business_name = column.get('businessName', '')
-                semantic_type = column.get('semanticType', '')
+                if column.is_sparse and not self.embed_sparse_columns:
+                    skipped_sparse += 1
+                    continue
+                name = column.name
+                description = column.description
+                business_name = column.business_name
+                semantic_type = column.semantic_type
                 
                 # Create semantic string for this column
                 parts = [f"{name}: {description}"]
@@ -263,6 +1570,9 @@ class CSVExtractor:
                 
                 semantic_parts.append(" ".join(parts))
             
+            if skipped_sparse:
+                semantic_parts.append(f"{skipped_sparse} mostly empty columns omitted")
+            
             result = "; ".join(semantic_parts)
             print(f"📝 Created column semantics string ({len(result)} characters)")
             return result
@@ -271,16 +1581,449 @@ class CSVExtractor:
             print(f"❌ Error creating column semantics: {e}")
             return "Error processing column semantics"
     
-    def extract_metadata(self, csv_file_path: str, yaml_config: Dict[str, Any]) -> Dict[str, Any]:
+    def profile_file(self, file_path: Path, yaml_config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
         """
-        Main method to extract complete metadata from CSV file and YAML config.
+        Profile a single dataset file with the reader that fits its format.
+        
+        Columnar formats are profiled from file metadata; CSV is parsed (large
+        files chunk by chunk, or only the header in schema-only mode).
+        
+        Args:
+            file_path: Path to the dataset file
+            yaml_config: Complete YAML configuration dictionary
+            
+        Returns:
+            Tuple of (analysis dict or None, file metadata dict)
+        """
+        input_format = self.detect_input_format(file_path, yaml_config)
+        df_analysis = None
+        if input_format in ('parquet', 'feather'):
+            if not PYARROW_AVAILABLE:
+                file_metadata = self.get_file_metadata(file_path)
+                file_metadata["error_message"] = f"pyarrow is required to read {input_format} files"
+                return None, file_metadata
+            if input_format == 'parquet':
+                return self.profile_parquet(file_path)
+            return self.profile_feather(file_path)
+        
+        if self.profile_mode == "schema_only":
+            return self.profile_csv_schema_only(file_path)
+        if self.should_stream(file_path):
+            return self.profile_csv_streaming(file_path)
+        
+        # Unchanged files are re-profiled from their typed columnar copy
+        if self.columnar_cache:
+            df, file_metadata = self.read_columnar_copy(file_path)
+            if df is not None:
+                return self.analyze_dataframe(df), file_metadata
+        
+        if self.backend == "arrow":
+            df_analysis, file_metadata = self.profile_csv_arrow(file_path)
+            if df_analysis is None and file_metadata["file_exists"]:
+                print(f"⚠️  Arrow backend failed ({file_metadata['error_message']}) - falling back to pandas")
+        if df_analysis is None:
+            df, file_metadata = self.read_csv_safely(file_path)
+            if df is not None:
+                if self.columnar_cache:
+                    # Converted first so the copy keeps datetime columns typed
+                    df, _ = self.convert_datetime_columns(df)
+                df_analysis = self.analyze_dataframe(df)
+                if self.columnar_cache:
+                    self.write_columnar_copy(
+                        file_path, lambda info: self.columnar_cache.write_frame(file_path, df, info), file_metadata
+                    )
+                del df
+        return df_analysis, file_metadata
+    
+    def write_columnar_copy(self, file_path: Path, write: Any, file_metadata: Dict[str, Any]) -> None:
+        """
+        Write the columnar copy of a CSV file; failures only cost the copy.
+        
+        Args:
+            file_path: Path to CSV file
+            write: Callable taking the read details to store and writing the copy
+            file_metadata: File metadata from reading the CSV
+        """
+        info = {
+            "encoding": file_metadata["encoding_used"],
+            "encoding_confidence": file_metadata.get("encoding_confidence"),
+            "memory_saved_mb": file_metadata.get("memory_saved_mb", 0)
+        }
+        try:
+            copy_path = write(info)
+            print(f"🗂️  Columnar copy written: {copy_path.name} ({copy_path.stat().st_size / 1024 / 1024:.2f} MB)")
+        except Exception as e:
+            print(f"⚠️  Could not write columnar copy of {file_path.name}: {e}")
+    
+    def ensure_columnar_copy(self, file_path: Path, encoding: str) -> None:
+        """Convert a CSV file to its columnar copy unless a current one exists."""
+        if self.columnar_cache.current(file_path) is None:
+            self.write_columnar_copy(
+                file_path, lambda info: self.columnar_cache.write_csv(file_path, info["encoding"]),
+                {"encoding_used": encoding}
+            )
+    
+    def read_columnar_copy(self, file_path: Path,
+                           columns: Optional[List[str]] = None) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+        """
+        Read a CSV file (or some of its columns) from its current columnar copy.
+        
+        Args:
+            file_path: Path to CSV file
+            columns: Columns to read (default: all)
+            
+        Returns:
+            Tuple of (DataFrame, or None without a current copy, file metadata dict)
+        """
+        metadata = self.get_file_metadata(file_path)
+        info = self.columnar_cache.info(file_path) if metadata["file_exists"] else None
+        if info is None:
+            return None, metadata
+        try:
+            df = self.columnar_cache.read(file_path, columns)
+        except Exception as e:
+            print(f"⚠️  Could not read columnar copy of {file_path.name}: {e}")
+            return None, metadata
+        metadata["encoding_used"] = info.get("encoding", metadata["encoding_used"])
+        metadata["encoding_confidence"] = info.get("encoding_confidence")
+        metadata["memory_saved_mb"] = info.get("memory_saved_mb", 0)
+        metadata["read_success"] = True
+        print(f"✅ Read {file_path.name} from its columnar copy")
+        return df, metadata
+    
+    def profile_columns(self, csv_file_path: str, columns: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Re-profile some columns of a CSV file (e.g. after editing their YAML).
+        
+        Reads only those columns, from the columnar copy when there is a
+        current one and otherwise from the CSV file itself.
         
         Args:
             csv_file_path: Path to CSV file (relative to data_dir)
+            columns: Columns to profile
+            
+        Returns:
+            Analysis dict for the columns, or None if the file could not be read
+        """
+        file_path = Path(csv_file_path) if os.path.isabs(csv_file_path) else self.data_dir / csv_file_path
+        df = None
+        if self.columnar_cache:
+            df, _ = self.read_columnar_copy(file_path, columns)
+        if df is None:
+            encoding = self.resolve_encoding(file_path, self.get_file_metadata(file_path))[0]
+            try:
+                df = pd.read_csv(file_path, usecols=columns, encoding=encoding)
+            except Exception as e:
+                print(f"❌ Failed to read {columns} from {file_path.name}: {e}")
+                return None
+        return self.analyze_dataframe(df)
+    
+    def should_copy_columnar(self, file_path: Path, yaml_config: Dict[str, Any]) -> bool:
+        """True for single CSV files in full profile mode (columnar inputs need no copy)."""
+        return (self.profile_mode == "full" and file_path.is_file()
+                and self.detect_input_format(file_path, yaml_config) == 'csv')
+    
+    @staticmethod
+    def is_partitioned_path(csv_file_path: str) -> bool:
+        """True if a dataset path is a glob pattern rather than a single file."""
+        return any(char in csv_file_path for char in '*?[')
+    
+    def resolve_partitions(self, file_path: Path, yaml_config: Dict[str, Any]) -> Optional[List[Path]]:
+        """
+        Expand a partitioned dataset location into its part files.
+        
+        A dataset is partitioned when its path is a glob (e.g.
+        raw/MoveDaily/dt=*/part-*.csv) or a directory; directories are searched
+        with dataset_info.partition_pattern (default: all CSV files below it).
+        
+        Args:
+            file_path: Resolved dataset path (file, directory or glob)
+            yaml_config: Complete YAML configuration dictionary
+            
+        Returns:
+            Sorted list of part files, or None for a single-file dataset
+        """
+        if self.is_partitioned_path(str(file_path)):
+            anchor = Path(file_path.anchor) if file_path.is_absolute() else Path('.')
+            pattern = str(file_path.relative_to(anchor)) if file_path.is_absolute() else str(file_path)
+            return sorted(path for path in anchor.glob(pattern) if path.is_file())
+        
+        if file_path.is_dir():
+            pattern = yaml_config.get('dataset_info', {}).get('partition_pattern', '**/*.csv')
+            return sorted(path for path in file_path.glob(pattern) if path.is_file())
+        
+        return None
+    
+    @staticmethod
+    def partition_values(part_path: Path) -> Dict[str, str]:
+        """
+        Hive-style partition values (key=value directory names) of a part file.
+        
+        Args:
+            part_path: Path to a part file
+            
+        Returns:
+            Dictionary of partition keys to values, e.g. {"dt": "2024-01-31"}
+        """
+        values = {}
+        for segment in part_path.parent.parts:
+            if '=' in segment:
+                key, value = segment.split('=', 1)
+                values[key] = value
+        return values
+    
+    @staticmethod
+    def analysis_to_state(df_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of an analysis dict with sketches serialized (JSON-compatible)."""
+        state = dict(df_analysis)
+        if "column_sketches" in state:
+            state["column_sketches"] = {
+                column: sketch.to_state() for column, sketch in state["column_sketches"].items()
+            }
+        return state
+    
+    @staticmethod
+    def analysis_from_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild an analysis dict serialized with analysis_to_state."""
+        df_analysis = dict(state)
+        if "column_sketches" in df_analysis:
+            df_analysis["column_sketches"] = {
+                column: ColumnSketch.from_state(sketch_state)
+                for column, sketch_state in df_analysis["column_sketches"].items()
+            }
+        return df_analysis
+    
+    def profile_partition(self, part_path: Path, yaml_config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], bool]:
+        """
+        Profile one part file, reusing its cached analysis if the part is unchanged.
+        
+        Args:
+            part_path: Path to the part file
+            yaml_config: Complete YAML configuration dictionary
+            
+        Returns:
+            Tuple of (analysis dict or None, file metadata dict, served from cache)
+        """
+        # Part analyses do not depend on the YAML beyond the declared format
+        part_config = {"format": yaml_config.get('dataset_info', {}).get('format', 'CSV')}
+        part_options = dict(self.get_cache_options(), partition_part=True)
+        
+        if self.cache:
+            cached = self.cache.get(part_path, part_config, part_options)
+            if cached is not None:
+                return self.analysis_from_state(cached["analysis"]), cached["file_metadata"], True
+        
+        df_analysis, file_metadata = self.profile_file(part_path, yaml_config)
+        if df_analysis is not None and file_metadata["read_success"] and self.cache:
+            self.cache.put(part_path, part_config, part_options, {
+                "analysis": self.analysis_to_state(df_analysis),
+                "file_metadata": file_metadata
+            })
+        return df_analysis, file_metadata, False
+    
+    def merge_analyses(self, analyses: List[Dict[str, Any]], sample_size: int = 3) -> Dict[str, Any]:
+        """
+        Merge the analyses of several parts of one dataset.
+        
+        Counts and null counts are summed (a column missing from a part counts as
+        null for that part's rows), types are merged like streamed chunks, samples
+        are filled in part order and sketches are merged.
+        
+        Args:
+            analyses: Part analyses in the analyze_dataframe shape
+            sample_size: Number of distinct sample values to keep per column
+            
+        Returns:
+            Merged analysis dict
+        """
+        merged = {
+            "record_count": 0,
+            "column_count": 0,
+            "columns_array": [],
+            "data_types": {},
+            "null_counts": {},
+            "sample_values": {},
+            "memory_usage_mb": 0
+        }
+        typed_columns = {}
+        datetime_ranges = {}
+        profiled = all(analysis.get("profiled", True) for analysis in analyses)
+        if not profiled:
+            merged["profiled"] = False
+        
+        for analysis in analyses:
+            for column in analysis["columns_array"]:
+                if column not in merged["null_counts"]:
+                    merged["columns_array"].append(column)
+                    # Rows of earlier parts that did not have this column
+                    merged["null_counts"][column] = merged["record_count"]
+                    merged["sample_values"][column] = []
+            
+            for column in merged["columns_array"]:
+                if column in analysis["columns_array"]:
+                    merged["null_counts"][column] += analysis["null_counts"].get(column, 0)
+                else:
+                    merged["null_counts"][column] += analysis["record_count"]
+            
+            for column, dtype in analysis["data_types"].items():
+                # All-null parts carry no type information (pandas reports float64)
+                if analysis["null_counts"].get(column, 0) < analysis["record_count"]:
+                    typed_columns[column] = self.merge_data_types(typed_columns.get(column), dtype)
+                elif column not in merged["data_types"]:
+                    merged["data_types"][column] = dtype
+            
+            for column, values in analysis["sample_values"].items():
+                samples = merged["sample_values"][column]
+                for value in values:
+                    if len(samples) >= sample_size:
+                        break
+                    if value not in samples:
+                        samples.append(value)
+            
+            for column, sketch in analysis.get("column_sketches", {}).items():
+                sketches = merged.setdefault("column_sketches", {})
+                if column in sketches:
+                    sketches[column].merge(sketch)
+                else:
+                    sketches[column] = sketch
+            
+            for column, value_range in analysis.get("datetime_ranges", {}).items():
+                datetime_ranges[column] = DatetimeDetector.merge_ranges(datetime_ranges.get(column), value_range)
+            
+            # The first part that recognised a column decides its semantic type
+            for column, semantic_type in analysis.get("semantic_types", {}).items():
+                merged.setdefault("semantic_types", {}).setdefault(column, semantic_type)
+            
+            merged["record_count"] += analysis["record_count"]
+            merged["memory_usage_mb"] = max(merged["memory_usage_mb"], analysis["memory_usage_mb"])
+        
+        merged["data_types"].update(typed_columns)
+        merged["datetime_ranges"] = {
+            column: value_range for column, value_range in datetime_ranges.items()
+            if merged["data_types"].get(column, '').startswith(('datetime64', 'timestamp', 'date'))
+        }
+        merged["column_count"] = len(merged["columns_array"])
+        return merged
+    
+    def profile_partitions(self, parts: List[Path], yaml_config: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Profile the part files of a partitioned dataset in parallel and merge them.
+        
+        Parts are profiled on a thread pool: the parsers release the GIL for most
+        of their work, and threads also work when the dataset itself is being
+        extracted inside an extract_many worker process. Unchanged parts are
+        served from the extraction cache.
+        
+        Args:
+            parts: Part files of the dataset
+            yaml_config: Complete YAML configuration dictionary
+            
+        Returns:
+            Tuple of (merged analysis or None, combined file metadata, per-part stats)
+        """
+        workers = max(min(self.partition_workers, len(parts)), 1)
+        print(f"🧩 Profiling {len(parts)} partitions with {workers} threads")
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda part: self.profile_partition(part, yaml_config), parts))
+        
+        file_metadata = {
+            "file_exists": True,
+            "file_size_bytes": 0,
+            "last_modified": None,
+            "read_success": True,
+            "error_message": None,
+            "encoding_used": None,
+            "encoding_confidence": None
+        }
+        partition_stats = []
+        analyses = []
+        encodings = []
+        
+        for part, (df_analysis, part_metadata, cache_hit) in zip(parts, results):
+            if df_analysis is None or not part_metadata["read_success"]:
+                file_metadata["read_success"] = False
+                file_metadata["error_message"] = f"Partition {part}: {part_metadata['error_message']}"
+                return None, file_metadata, []
+            
+            analyses.append(df_analysis)
+            file_metadata["file_size_bytes"] += part_metadata["file_size_bytes"]
+            if file_metadata["last_modified"] is None or part_metadata["last_modified"] > file_metadata["last_modified"]:
+                file_metadata["last_modified"] = part_metadata["last_modified"]
+            if part_metadata["encoding_used"] and part_metadata["encoding_used"] not in encodings:
+                encodings.append(part_metadata["encoding_used"])
+            if part_metadata.get("encoding_confidence") is not None:
+                confidence = file_metadata["encoding_confidence"]
+                file_metadata["encoding_confidence"] = min(
+                    part_metadata["encoding_confidence"], confidence if confidence is not None else 1.0
+                )
+            
+            try:
+                relative_path = str(part.relative_to(self.data_dir))
+            except ValueError:
+                relative_path = str(part)
+            partition_stats.append({
+                "path": relative_path,
+                "partitionValues": self.partition_values(part),
+                "recordCount": df_analysis["record_count"],
+                "fileSizeBytes": part_metadata["file_size_bytes"],
+                "lastModified": part_metadata["last_modified"],
+                "cacheHit": cache_hit
+            })
+        
+        file_metadata["encoding_used"] = ", ".join(encodings) if encodings else None
+        merged = self.merge_analyses(analyses)
+        
+        reused = sum(1 for stats in partition_stats if stats["cacheHit"])
+        print(f"📊 Partitioned analysis completed:")
+        print(f"   Partitions: {len(parts)} ({reused} unchanged, served from cache)")
+        print(f"   Records: {merged['record_count']:,}")
+        print(f"   Columns: {merged['column_count']}")
+        return merged, file_metadata, partition_stats
+    
+    @staticmethod
+    def compute_data_freshness(datetime_ranges: Dict[str, Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """
+        Summarize how current a dataset is from its datetime column ranges.
+        
+        Columns whose latest value lies in the future (e.g. scheduled move
+        dates) are ignored when picking the latest value.
+        
+        Args:
+            datetime_ranges: Column -> {"min", "max"} ISO values
+            
+        Returns:
+            {"latestValue", "latestColumn", "earliestValue"} or None without datetime columns
+        """
+        if not datetime_ranges:
+            return None
+        
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        past_columns = {
+            column: value_range for column, value_range in datetime_ranges.items()
+            if value_range["max"][:26] <= now
+        }
+        if not past_columns:
+            return None
+        latest_column = max(past_columns, key=lambda column: past_columns[column]["max"])
+        return {
+            "latestValue": past_columns[latest_column]["max"],
+            "latestColumn": latest_column,
+            "earliestValue": min(value_range["min"] for value_range in datetime_ranges.values())
+        }
+    
+    def extract_metadata(self, csv_file_path: str, yaml_config: Dict[str, Any]) -> Union[DatasetProfile, Dict[str, Any]]:
+        """
+        Main method to extract complete metadata from CSV file and YAML config.
+        
+        Args:
+            csv_file_path: Path to CSV file, partition directory or glob of part
+                files (relative to data_dir)
             yaml_config: Complete YAML configuration dictionary
             
         Returns:
-            Complete metadata dictionary ready for Weaviate ingestion
+            Validated DatasetProfile ready for Weaviate ingestion, or a dict with
+            success=False and an error message
         """
         print(f"\n📁 Extracting metadata from: {csv_file_path}")
         
@@ -292,19 +2035,43 @@ class CSVExtractor:
         
         print(f"   Full path: {file_path}")
         
-        # Read CSV and analyze
-        df, file_metadata = self.read_csv_safely(file_path)
+        # Serve unchanged datasets (same CSV fingerprint and YAML) from the cache
+        if self.cache and file_path.is_file():
+            cached_metadata = self.cache.get(file_path, yaml_config, self.get_cache_options())
+            if cached_metadata is not None:
+                profile = DatasetProfile.from_dict(cached_metadata)
+                profile.processing_stats["cacheHit"] = True
+                print(f"♻️  Using cached metadata for {file_path.name} (CSV and YAML unchanged)")
+                if self.columnar_cache and self.should_copy_columnar(file_path, yaml_config):
+                    encoding = (profile.processing_stats.get('encodingUsed') or {}).get('encoding') or 'utf-8'
+                    self.ensure_columnar_copy(file_path, encoding)
+                return profile
+        
+        # A glob or directory is a partitioned dataset: profile every part and merge
+        partitions = self.resolve_partitions(file_path, yaml_config)
+        partition_stats = None
+        if partitions is not None:
+            if not partitions:
+                return {
+                    "success": False,
+                    "error": f"No partition files found for {file_path}",
+                    "file_path": str(file_path)
+                }
+            df_analysis, file_metadata, partition_stats = self.profile_partitions(partitions, yaml_config)
+        else:
+            df_analysis, file_metadata = self.profile_file(file_path, yaml_config)
         
-        if not file_metadata["read_success"]:
-            print(f"❌ Failed to read CSV: {file_metadata['error_message']}")
+        if df_analysis is None or not file_metadata["read_success"]:
+            print(f"❌ Failed to read {file_path.name}: {file_metadata['error_message']}")
             return {
                 "success": False,
                 "error": file_metadata["error_message"],
                 "file_path": str(file_path)
             }
         
-        # Analyze DataFrame
-        df_analysis = self.analyze_dataframe(df)
+        # Streamed and schema-only CSV files were not parsed whole; convert them now
+        if self.columnar_cache and partitions is None and self.should_copy_columnar(file_path, yaml_config):
+            self.ensure_columnar_copy(file_path, file_metadata["encoding_used"])
         
         # Extract YAML configuration
         dataset_info = yaml_config.get('dataset_info', {})
@@ -315,69 +2082,123 @@ class CSVExtractor:
         # Create column semantics for search
         column_semantics = self.create_column_semantics_concatenated(detailed_column_info)
         
-        # Prepare answerable questions
-        answerable_questions_json = json.dumps(
-            yaml_config.get('answerable_questions', [])
-        )
-        
-        # Prepare LLM hints
-        llm_hints_json = json.dumps(
-            yaml_config.get('llm_hints', {})
-        )
-        
-        # Combine everything into final metadata
-        complete_metadata = {
-            # Technical metadata from CSV
-            "originalFileName": file_path.name,
-            "recordCount": df_analysis["record_count"],
-            "columnsArray": df_analysis["columns_array"],
-            "detailedColumnInfo": detailed_column_info,
-            "columnSemanticsConcatenated": column_semantics,
-            "dataLastModifiedAt": file_metadata["last_modified"],
-            "metadataCreatedAt": datetime.now(timezone.utc).isoformat(),
-            
-            # Business metadata from YAML
-            "tableName": dataset_info.get('table_name', file_path.stem),
-            "athenaTableName": dataset_info.get('athena_table_name', ''),
-            "zone": dataset_info.get('zone', 'Raw'),
-            "format": dataset_info.get('format', 'CSV'),
-            "description": dataset_info.get('description', ''),
-            "businessPurpose": dataset_info.get('business_purpose', ''),
-            "tags": dataset_info.get('tags', []),
-            "dataOwner": dataset_info.get('data_owner', ''),
-            "sourceSystem": dataset_info.get('source_system', ''),
-            
-            # Enhanced metadata
-            "answerableQuestions": answerable_questions_json,
-            "llmHints": llm_hints_json,
-            
-            # Processing metadata
-            "success": True,
-            "processingStats": {
-                "fileSizeBytes": file_metadata["file_size_bytes"],
-                "memoryUsageMB": df_analysis["memory_usage_mb"],
-                "encodingUsed": file_metadata["encoding_used"],
-                "processingTime": datetime.now(timezone.utc).isoformat()
+        # Answerable questions and LLM hints stay structured until upload
+        answerable_questions = yaml_config.get('answerable_questions', [])
+        llm_hints = yaml_config.get('llm_hints', {})
+        
+        # Combine everything into the final, validated profile
+        try:
+            profile = DatasetProfile(
+                # Technical metadata from CSV
+                original_file_name=file_path.name if partitions is None else dataset_info.get('original_file_name', file_path.name),
+                record_count=df_analysis["record_count"],
+                columns_array=df_analysis["columns_array"],
+                detailed_column_info=detailed_column_info,
+                column_semantics_concatenated=column_semantics,
+                data_last_modified_at=file_metadata["last_modified"],
+                
+                # Business metadata from YAML
+                table_name=dataset_info.get('table_name', file_path.stem),
+                athena_table_name=dataset_info.get('athena_table_name', ''),
+                zone=dataset_info.get('zone', 'Raw'),
+                format=dataset_info.get('format', 'CSV'),
+                description=dataset_info.get('description', ''),
+                business_purpose=dataset_info.get('business_purpose', ''),
+                tags=dataset_info.get('tags', []),
+                data_owner=dataset_info.get('data_owner', ''),
+                source_system=dataset_info.get('source_system', ''),
+                
+                # Enhanced metadata
+                answerable_questions=answerable_questions,
+                llm_hints=llm_hints,
+                
+                # Processing metadata
+                processing_stats={
+                    "fileSizeBytes": file_metadata["file_size_bytes"],
+                    "memoryUsageMB": df_analysis["memory_usage_mb"],
+                    "memorySavedMB": file_metadata.get("memory_saved_mb", 0),
+                    "encodingUsed": {
+                        "encoding": file_metadata["encoding_used"],
+                        "confidence": file_metadata.get("encoding_confidence")
+                    },
+                    "processingTime": datetime.now(timezone.utc).isoformat(),
+                    "cacheHit": False
+                },
+                partition_stats=partition_stats,
+                data_freshness=self.compute_data_freshness(df_analysis.get('datetime_ranges', {}))
+            )
+        except ProfileValidationError as e:
+            print(f"❌ Invalid metadata for {file_path.name}: {e}")
+            return {
+                "success": False,
+                "error": f"Invalid metadata: {e}",
+                "file_path": str(file_path)
             }
-        }
+        
+        if self.cache and partitions is None:
+            self.cache.put(file_path, yaml_config, self.get_cache_options(), profile.to_dict())
         
         print(f"✅ Metadata extraction completed for {file_path.name}")
-        print(f"   Table Name: {complete_metadata['tableName']}")
-        print(f"   Zone: {complete_metadata['zone']}")
-        print(f"   Records: {complete_metadata['recordCount']:,}")
-        print(f"   Columns: {len(complete_metadata['columnsArray'])}")
+        print(f"   Table Name: {profile.table_name}")
+        print(f"   Zone: {profile.zone}")
+        print(f"   Records: {profile.record_count:,}")
+        print(f"   Columns: {profile.column_count}")
+        
+        return profile
+    
+    def extract_many(self, jobs: List[Tuple[str, Dict[str, Any]]],
+                     max_workers: Optional[int] = None) -> List[Union[DatasetProfile, Dict[str, Any]]]:
+        """
+        Extract metadata for several datasets, optionally across worker processes.
+        
+        Each dataset is independent CPU-bound pandas work, so with max_workers > 1
+        the jobs are fanned out over a process pool. Results are always returned
+        in job order, and a failure (including a crashed worker) only affects its
+        own dataset.
+        
+        Args:
+            jobs: List of (csv_file_path, yaml_config) tuples
+            max_workers: Number of worker processes (None or 1 runs sequentially)
+            
+        Returns:
+            List of DatasetProfile objects or failure dicts, one per job, in job order
+        """
+        if not max_workers or max_workers <= 1 or len(jobs) <= 1:
+            return [_extract_metadata_worker(self, csv_path, yaml_config) for csv_path, yaml_config in jobs]
+        
+        workers = min(max_workers, len(jobs))
+        print(f"⚙️  Extracting {len(jobs)} datasets with {workers} worker processes")
+        
+        results = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_extract_metadata_worker, self, csv_path, yaml_config): index
+                for index, (csv_path, yaml_config) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. out of memory)
+                    results[index] = {
+                        "success": False,
+                        "error": f"Worker failed: {str(e)}",
+                        "file_path": jobs[index][0]
+                    }
         
-        return complete_metadata
+        return results
     
-    def extract_all_from_config_dir(self, config_dir: str) -> List[Dict[str, Any]]:
+    def extract_all_from_config_dir(self, config_dir: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Extract metadata for all datasets defined in config directory.
         
         Args:
             config_dir: Directory containing YAML configuration files
+            max_workers: Number of worker processes for extraction (None or 1 runs sequentially)
             
         Returns:
-            List of metadata dictionaries
+            List of DatasetProfile objects for the successful extractions
         """
         import yaml
         
@@ -390,11 +2211,13 @@ class CSVExtractor:
         
         print(f"🔍 Scanning for YAML configurations in: {dataset_configs_path}")
         
-        all_metadata = []
-        yaml_files = list(dataset_configs_path.glob('*.yaml')) + list(dataset_configs_path.glob('*.yml'))
+        yaml_files = sorted(list(dataset_configs_path.glob('*.yaml')) + list(dataset_configs_path.glob('*.yml')))
         
         print(f"📁 Found {len(yaml_files)} YAML configuration files")
         
+        # Load configs up front (cheap), then run the expensive extraction as one batch
+        job_files = []
+        jobs = []
         for yaml_file in yaml_files:
             try:
                 print(f"\n📄 Processing: {yaml_file.name}")
@@ -411,30 +2234,58 @@ class CSVExtractor:
                     print(f"⚠️  No original_file_name specified in {yaml_file.name}")
                     continue
                 
-                # Extract metadata
                 csv_path = f"raw/{csv_filename}"  # Assuming CSV files are in raw/ subdirectory
-                metadata = self.extract_metadata(csv_path, yaml_config)
-                
-                if metadata.get('success'):
-                    all_metadata.append(metadata)
-                    print(f"✅ Successfully processed {yaml_file.name}")
-                else:
-                    print(f"❌ Failed to process {yaml_file.name}: {metadata.get('error')}")
+                job_files.append(yaml_file)
+                jobs.append((csv_path, yaml_config))
                     
             except Exception as e:
                 print(f"❌ Error processing {yaml_file.name}: {e}")
         
+        all_metadata = []
+        for yaml_file, metadata in zip(job_files, self.extract_many(jobs, max_workers)):
+            if metadata.get('success'):
+                all_metadata.append(metadata)
+                print(f"✅ Successfully processed {yaml_file.name}")
+            else:
+                print(f"❌ Failed to process {yaml_file.name}: {metadata.get('error')}")
+        
         print(f"\n📊 Total successful extractions: {len(all_metadata)}")
         return all_metadata
 
 
+def _extract_metadata_worker(extractor: CSVExtractor, csv_file_path: str,
+                             yaml_config: Dict[str, Any]) -> Union[DatasetProfile, Dict[str, Any]]:
+    """
+    Run a single extraction, turning unexpected exceptions into a failure result.
+    
+    Module-level so it can be pickled and executed in a worker process.
+    
+    Args:
+        extractor: Configured CSVExtractor (pickled into the worker)
+        csv_file_path: Path to CSV file (relative to data_dir)
+        yaml_config: Complete YAML configuration dictionary
+        
+    Returns:
+        DatasetProfile from extract_metadata or a failure result
+    """
+    try:
+        return extractor.extract_metadata(csv_file_path, yaml_config)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Unexpected error: {str(e)}",
+            "file_path": csv_file_path
+        }
+
+
 def main():
     """Test the CSV extractor with sample data."""
     try:
         extractor = CSVExtractor("data_sources")
         
         # Test extracting all configurations
-        all_metadata = extractor.extract_all_from_config_dir("config")
+        max_workers = int(os.getenv('INGESTION_MAX_WORKERS', '1'))
+        all_metadata = extractor.extract_all_from_config_dir("config", max_workers=max_workers)
         
         print(f"\n🎯 Extraction Summary:")
         print(f"   Total datasets processed: {len(all_metadata)}")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+CSV Record Scanner for Weaviate Knowledge Base
+
+This module finds CSV record boundaries by scanning a memory-mapped file for
+record terminators, without parsing any fields. A newline only ends a record
+when it is outside a quoted field, so multi-line values such as the free-text
+Comments columns are handled correctly. Doubled quotes ("") inside a quoted
+field toggle the quote state twice and therefore need no special handling.
+
+Blank lines are skipped, like pandas does with skip_blank_lines=True.
+
+Only single-byte-delimiter, ASCII-compatible encodings are supported (UTF-8,
+latin-1, cp1252); UTF-16 files must be counted by a real parser.
+
+Usage:
+    from ingestion.csv_scanner import CSVRecordScanner
+    scanner = CSVRecordScanner()
+    result = scanner.scan(Path('data_sources/raw/Customer.csv'))
+    print(result["record_count"], result["header"])
+"""
+
+import csv
+import io
+import mmap
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+QUOTE = ord('"')
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+
+
+class CSVRecordScanner:
+    """Counts CSV records and locates their byte offsets via a memory map."""
+
+    def __init__(self, block_size: int = 16 * 1024 * 1024):
+        """
+        Initialize scanner.
+
+        Args:
+            block_size: Bytes processed per vectorized step (bounds temporary memory)
+        """
+        self.block_size = block_size
+
+    def scan(self, file_path: Path, encoding: str = 'utf-8',
+             collect_offsets: bool = False) -> Dict[str, Any]:
+        """
+        Scan a CSV file for its header and record boundaries.
+
+        Args:
+            file_path: Path to CSV file
+            encoding: Encoding used to decode the header line
+            collect_offsets: Also return the start and end byte offset of every
+                data record (8 bytes per record each)
+
+        Returns:
+            Dictionary with header (column names), record_count (data records,
+            header excluded), header_end (byte offset where data starts) and,
+            when requested, record_starts / record_ends as int64 arrays
+        """
+        result = {
+            "header": [],
+            "record_count": 0,
+            "header_end": 0,
+            "record_starts": None,
+            "record_ends": None
+        }
+
+        if file_path.stat().st_size == 0:
+            if collect_offsets:
+                result["record_starts"] = np.empty(0, dtype=np.int64)
+                result["record_ends"] = np.empty(0, dtype=np.int64)
+            return result
+
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # numpy views into the map must be gone before it closes, so the
+            # scan runs in its own frame
+            header_span, record_count, starts_parts, ends_parts = self._scan_mapped(mm, collect_offsets)
+            if header_span is not None:
+                header_bytes = bytes(mm[header_span[0]:header_span[1]])
+                result["header"] = self.parse_header(header_bytes, encoding)
+                result["header_end"] = header_span[1]
+
+        result["record_count"] = record_count
+        if collect_offsets:
+            result["record_starts"] = np.concatenate(starts_parts) if starts_parts else np.empty(0, dtype=np.int64)
+            result["record_ends"] = np.concatenate(ends_parts) if ends_parts else np.empty(0, dtype=np.int64)
+        return result
+
+    def _scan_mapped(self, mm: mmap.mmap, collect_offsets: bool):
+        """Block-wise terminator scan over a memory map (see scan)."""
+        data = np.frombuffer(mm, dtype=np.uint8)
+        size = len(data)
+
+        starts_parts = []
+        ends_parts = []
+        record_count = 0
+        header_span = None
+        previous_terminator = -1
+        in_quotes = 0
+
+        for block_start in range(0, size, self.block_size):
+            block = data[block_start:block_start + self.block_size]
+
+            # Quote state after each byte; uint8 wraparound keeps parity intact
+            parity = (np.cumsum(block == QUOTE, dtype=np.uint8) + in_quotes) & 1
+            in_quotes = int(parity[-1])
+            terminators = np.flatnonzero((block == NEWLINE) & (parity == 0)) + block_start
+            del parity
+
+            if len(terminators) == 0:
+                continue
+
+            starts = np.empty(len(terminators), dtype=np.int64)
+            starts[0] = previous_terminator + 1
+            starts[1:] = terminators[:-1] + 1
+            ends = self._strip_carriage_returns(data, starts, terminators)
+            previous_terminator = int(terminators[-1])
+
+            non_blank = ends > starts
+            starts, ends = starts[non_blank], ends[non_blank]
+
+            if header_span is None and len(starts):
+                header_span = (int(starts[0]), int(ends[0]))
+                starts, ends = starts[1:], ends[1:]
+
+            record_count += len(starts)
+            if collect_offsets:
+                starts_parts.append(starts)
+                ends_parts.append(ends)
+
+        # A last record without a trailing newline
+        tail_start = previous_terminator + 1
+        if tail_start < size:
+            tail_end = size
+            while tail_end > tail_start and data[tail_end - 1] == CARRIAGE_RETURN:
+                tail_end -= 1
+            if tail_end > tail_start:
+                if header_span is None:
+                    header_span = (tail_start, tail_end)
+                else:
+                    record_count += 1
+                    if collect_offsets:
+                        starts_parts.append(np.array([tail_start], dtype=np.int64))
+                        ends_parts.append(np.array([tail_end], dtype=np.int64))
+
+        return header_span, record_count, starts_parts, ends_parts
+
+    def count_records(self, file_path: Path) -> int:
+        """
+        Count data records (header excluded) in a CSV file.
+
+        Args:
+            file_path: Path to CSV file
+
+        Returns:
+            Number of data records
+        """
+        return self.scan(file_path)["record_count"]
+
+    @staticmethod
+    def _strip_carriage_returns(data: np.ndarray, starts: np.ndarray, terminators: np.ndarray) -> np.ndarray:
+        """End offsets of records, excluding a '\\r' that precedes the newline."""
+        ends = terminators.copy()
+        has_cr = ends > starts
+        has_cr[has_cr] = data[ends[has_cr] - 1] == CARRIAGE_RETURN
+        ends[has_cr] -= 1
+        return ends
+
+    @staticmethod
+    def parse_header(header_bytes: bytes, encoding: str = 'utf-8') -> List[str]:
+        """
+        Parse a header record into column names, de-duplicated like pandas.
+
+        Args:
+            header_bytes: Raw bytes of the header record
+            encoding: Encoding of the file
+
+        Returns:
+            List of column names
+        """
+        text = header_bytes.decode(encoding, errors='replace')
+        if text.startswith('\ufeff'):
+            text = text[1:]
+        names = next(csv.reader(io.StringIO(text)), [])
+
+        # pandas renames duplicate columns to name.1, name.2, ...
+        seen = {}
+        unique_names = []
+        for name in names:
+            if name in seen:
+                seen[name] += 1
+                candidate = f"{name}.{seen[name]}"
+                while candidate in seen:
+                    seen[name] += 1
+                    candidate = f"{name}.{seen[name]}"
+                seen[candidate] = 0
+                unique_names.append(candidate)
+            else:
+                seen[name] = 0
+                unique_names.append(name)
+        return unique_names
+
+    @staticmethod
+    def read_record(file_path: Path, start: int, end: int, encoding: str = 'utf-8') -> Optional[List[str]]:
+        """
+        Parse a single record given its byte offsets.
+
+        Args:
+            file_path: Path to CSV file
+            start: Byte offset of the record start
+            end: Byte offset of the record end (exclusive, without terminator)
+            encoding: Encoding of the file
+
+        Returns:
+            List of field values, or None if the record is empty
+        """
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            raw = f.read(end - start)
+        return CSVRecordScanner.parse_record(raw, encoding)
+
+    @staticmethod
+    def parse_record(raw: bytes, encoding: str = 'utf-8') -> Optional[List[str]]:
+        """
+        Parse the raw bytes of a single record.
+
+        Args:
+            raw: Record bytes (without terminator)
+            encoding: Encoding of the file
+
+        Returns:
+            List of field values, or None if the record is empty
+        """
+        return next(csv.reader(io.StringIO(raw.decode(encoding, errors='replace'))), None)
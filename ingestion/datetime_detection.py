@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Datetime Detection for Weaviate Knowledge Base
+
+CSV readers leave date/time columns as text unless told otherwise, so they
+would be reported as VARCHAR. This module recognises such columns from a
+bounded sample of their values and converts them with an explicit format.
+
+Explicit formats are tried first: parsing with a known format is vectorized
+and much faster than pandas' per-value inference. The format that matched a
+column is cached by column name (DateUpdated looks the same in every table)
+and successful formats move to the front of the list. Inference is only used
+as a last resort, for columns whose name suggests a date.
+
+Most text columns are not datetimes, so rejection has to be cheap: a format is
+only parsed against the sample after a loose regex derived from it matched the
+first few values.
+
+Usage:
+    from ingestion.datetime_detection import DatetimeDetector
+    detector = DatetimeDetector()
+    fmt = detector.detect_format('DateCreated', df['DateCreated'])
+    if fmt:
+        df['DateCreated'] = detector.parse(df['DateCreated'], fmt)
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+import pandas as pd
+
+# Most common formats first; the SQL Server export format leads
+DEFAULT_DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y',
+    '%d-%b-%Y',
+    '%Y%m%d %H:%M:%S'
+]
+
+# Every datetime value contains a digit and one of these separators
+DIGIT = re.compile(r'\d')
+SEPARATOR = re.compile(r'[-/:]')
+
+# Loose pattern per strptime directive, for rejecting values without parsing.
+# Looser than the parser (pandas accepts space-padded numbers, signed years and
+# any number of fraction digits), so a value that does not match cannot parse.
+DIRECTIVE_PATTERNS = {
+    **{directive: r'\s*\d+' for directive in 'mdHIMSjUWy'},
+    'Y': r'\s*-?\d+',
+    'f': r'\d*',
+    'b': r'[a-z]+', 'B': r'[a-z]+', 'a': r'[a-z]+', 'A': r'[a-z]+',
+    'p': r'[ap]m',
+    '%': '%'
+}
+
+
+def format_pattern(fmt: str) -> Optional[Pattern]:
+    """
+    Regex that every value parseable with a strptime format matches.
+
+    Args:
+        fmt: strptime format
+
+    Returns:
+        Compiled pattern (for fullmatch), or None if the format uses a directive
+        without a known pattern
+    """
+    parts = []
+    position = 0
+    while position < len(fmt):
+        char = fmt[position]
+        if char == '%':
+            directive_pattern = DIRECTIVE_PATTERNS.get(fmt[position + 1:position + 2])
+            if directive_pattern is None:
+                return None
+            parts.append(directive_pattern)
+            position += 2
+            continue
+        parts.append(r'\s+' if char.isspace() else re.escape(char))
+        position += 1
+    return re.compile(r'\s*' + ''.join(parts) + r'\s*', re.IGNORECASE)
+
+
+# Marker returned by detect_format when only pandas inference could parse the sample
+INFERRED_FORMAT = 'inferred'
+
+
+class DatetimeDetector:
+    """Detects and parses datetime columns stored as text."""
+
+    def __init__(self, formats: Optional[List[str]] = None, sample_size: int = 1000,
+                 infer_name_hint: str = 'Date', probe_size: int = 5):
+        """
+        Initialize datetime detector.
+
+        Args:
+            formats: Explicit strptime formats to try, most likely first
+            sample_size: Maximum number of non-null values checked per column
+            infer_name_hint: Columns whose name contains this may fall back to
+                pandas format inference when no explicit format matches
+            probe_size: Leading sample values a format must match before it is
+                tried on the whole sample
+        """
+        self.formats = list(formats or DEFAULT_DATETIME_FORMATS)
+        self.sample_size = sample_size
+        self.infer_name_hint = infer_name_hint
+        self.probe_size = probe_size
+        # column name -> format that parsed it last time
+        self.column_formats: Dict[str, str] = {}
+        # format -> format_pattern (None: probe with pandas instead)
+        self.format_patterns: Dict[str, Optional[Pattern]] = {}
+
+    @staticmethod
+    def is_text(values: pd.Series) -> bool:
+        """True for object and string columns."""
+        return values.dtype == object or pd.api.types.is_string_dtype(values.dtype)
+
+    def detect_format(self, column_name: str, values: pd.Series) -> Optional[str]:
+        """
+        Find a datetime format that parses every sampled value of a text column.
+
+        Args:
+            column_name: Column name (used for the format cache and the inference hint)
+            values: Column values
+
+        Returns:
+            strptime format, INFERRED_FORMAT, or None if the column is not a datetime
+        """
+        if not self.is_text(values):
+            return None
+        # The leading rows usually hold enough values; the whole column is only
+        # scanned for nulls when they do not
+        sample = values.iloc[:self.sample_size].dropna()
+        if len(sample) < self.sample_size and len(values) > self.sample_size:
+            sample = values.dropna().iloc[:self.sample_size]
+        if sample.empty:
+            return None
+        sample = sample.astype(str)
+
+        # Cheap rejection: datetimes contain digits and a separator. The first
+        # few values are checked here, the whole sample only once a format
+        # passed its probe. A format that fails on the first few values is
+        # rejected without parsing the whole sample (most text columns fail
+        # every format).
+        probe = sample.iloc[:self.probe_size].tolist()
+        if not all(DIGIT.search(value) and SEPARATOR.search(value) for value in probe):
+            return None
+        sample_checked = False
+
+        cached = self.column_formats.get(column_name)
+        candidates = ([cached] if cached else []) + [fmt for fmt in self.formats if fmt != cached]
+        for fmt in candidates:
+            if not self._probe_matches(fmt, probe):
+                continue
+            if not sample_checked:
+                if not self._looks_like_datetimes(sample):
+                    return None
+                sample_checked = True
+            if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
+                self._remember(column_name, fmt)
+                return fmt
+
+        if self.infer_name_hint and self.infer_name_hint in column_name:
+            if (pd.Series(pd.to_datetime(probe, errors='coerce')).notna().all()
+                    and (sample_checked or self._looks_like_datetimes(sample))
+                    and pd.to_datetime(sample, errors='coerce').notna().all()):
+                return INFERRED_FORMAT
+        return None
+
+    @staticmethod
+    def _looks_like_datetimes(sample: pd.Series) -> bool:
+        """True if every sampled value contains a digit and a date/time separator."""
+        text = sample.str
+        return bool(text.contains(DIGIT.pattern, regex=True).all()
+                    and text.contains(SEPARATOR.pattern, regex=True).all())
+
+    def _probe_matches(self, fmt: str, probe: List[str]) -> bool:
+        """True if every probe value may parse with the format (regex, else a pandas parse)."""
+        if fmt not in self.format_patterns:
+            self.format_patterns[fmt] = format_pattern(fmt)
+        pattern = self.format_patterns[fmt]
+        if pattern is None:
+            return bool(pd.Series(pd.to_datetime(probe, format=fmt, errors='coerce')).notna().all())
+        return all(pattern.fullmatch(value) for value in probe)
+
+    def _remember(self, column_name: str, fmt: str) -> None:
+        """Cache the format for the column and move it to the front of the list."""
+        self.column_formats[column_name] = fmt
+        if self.formats[0] != fmt:
+            # Rebuilt rather than mutated, so threads profiling partitions never
+            # see a half-updated list
+            self.formats = [fmt] + [known for known in self.formats if known != fmt]
+
+    @staticmethod
+    def parse(values: pd.Series, fmt: str) -> pd.Series:
+        """
+        Parse a text column with a detected format (unparseable values become NaT).
+
+        Args:
+            values: Column values
+            fmt: Format from detect_format
+
+        Returns:
+            datetime64 Series
+        """
+        if fmt == INFERRED_FORMAT:
+            return pd.to_datetime(values, errors='coerce')
+        return pd.to_datetime(values, format=fmt, errors='coerce')
+
+    def convert(self, column_name: str, values: pd.Series,
+                fmt: Optional[str] = None) -> Tuple[Optional[pd.Series], Optional[str]]:
+        """
+        Detect (unless fmt is given) and parse a datetime column, rejecting the
+        conversion if any non-null value fails to parse.
+
+        Args:
+            column_name: Column name
+            values: Column values
+            fmt: Previously detected format to reuse
+
+        Returns:
+            Tuple of (parsed Series or None, format or None)
+        """
+        fmt = fmt or self.detect_format(column_name, values)
+        if fmt is None:
+            return None, None
+        parsed = self.parse(values, fmt)
+        if int(parsed.isna().sum()) != int(values.isna().sum()):
+            return None, None
+        return parsed, fmt
+
+    @staticmethod
+    def value_range(values: pd.Series) -> Optional[Dict[str, str]]:
+        """
+        ISO-formatted minimum and maximum of a datetime column.
+
+        Args:
+            values: datetime64 Series
+
+        Returns:
+            {"min", "max"} dictionary, or None if the column has no values
+        """
+        if values.isna().all():
+            return None
+        return {"min": values.min().isoformat(), "max": values.max().isoformat()}
+
+    @staticmethod
+    def merge_ranges(current: Optional[Dict[str, str]],
+                     new: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        """Combine two value ranges (ISO strings of the same kind compare correctly)."""
+        if current is None:
+            return new
+        if new is None:
+            return current
+        return {"min": min(current["min"], new["min"]), "max": max(current["max"], new["max"])}
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Client-Side Embeddings for Weaviate Knowledge Base
+
+Without vectors, every DatasetMetadata insert makes Weaviate call Bedrock for
+that one object while the insert waits, which is where the upload timeouts
+come from. The embedding stage instead computes the vectors before upload:
+the vectorizable text of all datasets (description, businessPurpose,
+columnSemanticsConcatenated, tags, answerableQuestions) is embedded in
+batches as large as the model accepts, and the objects are inserted with
+vector= attached, so Weaviate does not call Bedrock at all.
+
+Providers:
+- BedrockEmbeddingProvider: Bedrock runtime. Cohere embed models take up to
+  96 texts per request, so N objects cost N/96 round trips; Titan models take
+  one text per request. Use the model the collection was created with
+  (BEDROCK_MODEL_ID), so near_text queries are embedded into the same space.
+- HashingEmbeddingProvider: deterministic local vectors (feature hashing of
+  the words) for offline runs and tests; not comparable with Bedrock vectors.
+
+Any object with a `batch_size` attribute and an `embed_batch(texts)` method
+can be injected as a provider.
+
+Usage:
+    from ingestion.embeddings import BatchEmbedder, create_embedding_provider, embedding_text
+    embedder = BatchEmbedder(create_embedding_provider('bedrock'))
+    vectors = embedder.embed([embedding_text(properties) for properties in objects])
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Union
+
+from ingestion.rate_limiter import AdaptiveRateLimiter
+from ingestion.retry_policy import RetryPolicy, is_transient_error
+
+# Optional dependency (pip install boto3)
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+# DatasetMetadata properties the collection vectorizes (see schemas/schema_creator.py)
+EMBEDDED_FIELDS = ('description', 'businessPurpose', 'columnSemanticsConcatenated', 'tags', 'answerableQuestions')
+
+# Request limits of the Cohere embed models on Bedrock
+COHERE_MAX_TEXTS = 96
+COHERE_MAX_CHARS = 2048
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def embedding_text(properties: Dict[str, Any], fields: Sequence[str] = EMBEDDED_FIELDS) -> str:
+    """
+    Text of an object's vectorized properties, in one string.
+
+    Lists (tags) and JSON string lists (answerableQuestions) are joined with
+    spaces, using the question text of YAML question entries; empty fields are
+    left out.
+
+    Args:
+        properties: Weaviate properties of the object
+        fields: Properties to include, in order
+
+    Returns:
+        Text to embed
+    """
+    parts = []
+    for name in fields:
+        value = properties.get(name)
+        if isinstance(value, str) and value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        if isinstance(value, list):
+            value = ' '.join(
+                str(element.get('question', '')) if isinstance(element, dict) else str(element)
+                for element in value
+            )
+        if value:
+            parts.append(str(value))
+    return '\n'.join(parts)
+
+
+class HashingEmbeddingProvider:
+    """Deterministic local embeddings: signed feature hashing of lower-cased words, L2-normalized."""
+
+    name = 'hashing'
+
+    def __init__(self, dimensions: int = 1024, batch_size: int = COHERE_MAX_TEXTS):
+        """
+        Initialize hashing embedding provider.
+
+        Args:
+            dimensions: Vector length
+            batch_size: Texts per embed_batch call
+        """
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+                value = int.from_bytes(digest, 'little')
+                vector[value % self.dimensions] += 1.0 if value >> 63 else -1.0
+            norm = math.sqrt(sum(component * component for component in vector))
+            vectors.append([component / norm for component in vector] if norm else vector)
+        return vectors
+
+
+class BedrockEmbeddingProvider:
+    """Embeddings from a Bedrock embedding model (Cohere embed or Titan text embeddings)."""
+
+    name = 'bedrock'
+
+    def __init__(self, model_id: Optional[str] = None, region: Optional[str] = None,
+                 input_type: str = 'search_document', client: Any = None):
+        """
+        Initialize Bedrock embedding provider.
+
+        Args:
+            model_id: Bedrock model ID. Defaults to the BEDROCK_MODEL_ID environment
+                variable, the model the collections are created with.
+            region: AWS region. Defaults to the AWS_REGION environment variable.
+            input_type: Cohere input type ("search_document" for stored objects)
+            client: bedrock-runtime client (created with boto3 if None)
+
+        Raises:
+            ImportError: If no client is given and boto3 is not installed
+        """
+        self.model_id = model_id or os.getenv('BEDROCK_MODEL_ID', 'amazon.titan-embed-text-v2:0')
+        self.input_type = input_type
+        self.is_cohere = self.model_id.startswith('cohere.')
+        self.batch_size = COHERE_MAX_TEXTS if self.is_cohere else 1
+        if client is None:
+            if not BOTO3_AVAILABLE:
+                raise ImportError("boto3 is required for Bedrock embeddings")
+            client = boto3.client('bedrock-runtime', region_name=region or os.getenv('AWS_REGION', 'us-east-1'))
+        self.client = client
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts (at most batch_size) in one request."""
+        if self.is_cohere:
+            body = {
+                "texts": [text[:COHERE_MAX_CHARS] for text in texts],
+                "input_type": self.input_type,
+                "truncate": "END"
+            }
+        else:
+            body = {"inputText": texts[0]}
+        response = self.client.invoke_model(modelId=self.model_id, body=json.dumps(body))
+        result = json.loads(response['body'].read())
+        return result['embeddings'] if self.is_cohere else [result['embedding']]
+
+
+def create_embedding_provider(name: str) -> Optional[Any]:
+    """
+    Create an embedding provider by name.
+
+    Args:
+        name: "bedrock", "hashing", or "" / "off" for none (Weaviate vectorizes)
+
+    Returns:
+        Provider, or None
+
+    Raises:
+        ValueError: For an unknown name
+    """
+    name = (name or '').lower()
+    if name in ('', 'off', 'none', 'false', '0'):
+        return None
+    if name == 'bedrock':
+        return BedrockEmbeddingProvider()
+    if name == 'hashing':
+        return HashingEmbeddingProvider()
+    raise ValueError(f"Unknown embedding provider: {name}")
+
+
+class BatchEmbedder:
+    """Embeds many texts with as few provider requests as possible."""
+
+    def __init__(self, provider: Any, max_concurrency: int = 4,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        Initialize batch embedder.
+
+        Args:
+            provider: Embedding provider (batch_size and embed_batch(texts))
+            max_concurrency: Provider requests in flight
+            retry_policy: Retries requests that fail transiently (default: RetryPolicy())
+            rate_limiter: Paces texts per second sent to the provider
+        """
+        self.provider = provider
+        self.max_concurrency = max(max_concurrency, 1)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.stats = {"texts": 0, "unique_texts": 0, "requests": 0, "failed_texts": 0, "elapsed_seconds": 0.0}
+
+    def _embed_chunk(self, texts: List[str]) -> List[List[float]]:
+        """One provider request, paced by and fed back to the rate limiter."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire(len(texts))
+        started = time.monotonic()
+        try:
+            vectors = self.provider.embed_batch(texts)
+        except Exception as e:
+            if self.rate_limiter and is_transient_error(e):
+                self.rate_limiter.record_overload()
+            raise
+        if self.rate_limiter:
+            self.rate_limiter.record_success(time.monotonic() - started)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Provider returned {len(vectors)} vectors for {len(texts)} texts")
+        return vectors
+
+    def _embed_with_retries(self, texts: List[str]) -> Union[List[List[float]], Exception]:
+        try:
+            return self.retry_policy.call(self._embed_chunk, texts)
+        except Exception as e:
+            return e
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed texts; identical texts are embedded once.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, or None where the provider request failed (those
+            objects are left to Weaviate's vectorizer)
+        """
+        started = time.perf_counter()
+        unique_texts = list(dict.fromkeys(texts))
+        chunk_size = max(self.provider.batch_size, 1)
+        chunks = [unique_texts[start:start + chunk_size] for start in range(0, len(unique_texts), chunk_size)]
+
+        vectors = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            for chunk, outcome in zip(chunks, pool.map(self._embed_with_retries, chunks)):
+                if isinstance(outcome, Exception):
+                    print(f"   ⚠️  Embedding request failed for {len(chunk)} texts: {outcome}")
+                    continue
+                vectors.update(zip(chunk, outcome))
+
+        self.stats["texts"] += len(texts)
+        self.stats["unique_texts"] += len(unique_texts)
+        self.stats["requests"] += len(chunks)
+        self.stats["failed_texts"] += sum(1 for text in texts if text not in vectors)
+        self.stats["elapsed_seconds"] += time.perf_counter() - started
+        return [vectors.get(text) for text in texts]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Texts embedded, provider requests made and time spent."""
+        return {
+            "provider": getattr(self.provider, 'name', type(self.provider).__name__),
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in self.stats.items()}
+        }
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Extraction Cache for Weaviate Knowledge Base
+
+This module persists CSVExtractor.extract_metadata results on disk so that
+datasets whose CSV file and YAML configuration have not changed are not
+re-read and re-profiled on every pipeline run.
+
+An entry is keyed on the source file path and a hash of the YAML configuration,
+so one CSV file described by two configurations keeps an entry for each. It
+stores a fingerprint made of:
+- file size and modification time (always)
+- a BLAKE2b content hash (optional, catches re-copied but identical files)
+- a hash of the YAML configuration
+- the extractor options that influence the result
+
+Usage:
+    from ingestion.extraction_cache import ExtractionCache
+    cache = ExtractionCache('.cache/extraction')
+    metadata = cache.get(csv_path, yaml_config, options)
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Bump when the shape of cached metadata changes so old entries are ignored
+CACHE_FORMAT_VERSION = 4
+
+
+class ExtractionCache:
+    """Persistent on-disk cache of extract_metadata results."""
+
+    def __init__(self, cache_dir: str, use_content_hash: bool = False):
+        """
+        Initialize extraction cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored (created if missing)
+            use_content_hash: Also compare a hash of the file contents. Costs one
+                sequential read of the file, but lets a file whose mtime changed
+                without its contents changing still be served from cache.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.use_content_hash = use_content_hash
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_config(yaml_config: Dict[str, Any]) -> str:
+        """
+        Hash a YAML configuration independent of key order.
+
+        Args:
+            yaml_config: Parsed YAML configuration
+
+        Returns:
+            Hex digest of the configuration
+        """
+        canonical = json.dumps(yaml_config, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_file_contents(file_path: Path, block_size: int = 1024 * 1024) -> str:
+        """
+        Hash file contents in fixed-size blocks.
+
+        Args:
+            file_path: Path to the file
+            block_size: Bytes read per block
+
+        Returns:
+            Hex digest of the file contents
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, file_path: Path, yaml_config: Dict[str, Any],
+                    options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the fingerprint for a source file and its configuration.
+
+        The content hash is left out here; it is only computed when the cheap
+        parts of the fingerprint are not enough to decide (see get).
+
+        Args:
+            file_path: Path to the source file
+            yaml_config: Parsed YAML configuration
+            options: Extractor options that influence the result
+
+        Returns:
+            Fingerprint dictionary
+        """
+        stat = file_path.stat()
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "path": str(file_path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "config_hash": self.hash_config(yaml_config),
+            "options": json.loads(json.dumps(options, sort_keys=True, default=str))
+        }
+
+    def entry_path(self, file_path: Path, yaml_config: Dict[str, Any]) -> Path:
+        """
+        Location of the cache entry for a source file and configuration.
+
+        Args:
+            file_path: Path to the source file
+            yaml_config: Parsed YAML configuration
+
+        Returns:
+            Path of the JSON cache entry
+        """
+        key_source = f"{file_path.resolve()}\0{self.hash_config(yaml_config)}"
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, file_path: Path, yaml_config: Dict[str, Any],
+            options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached metadata if nothing relevant has changed.
+
+        Args:
+            file_path: Path to the source file
+            yaml_config: Parsed YAML configuration
+            options: Extractor options that influence the result
+
+        Returns:
+            Cached metadata dictionary, or None on a miss
+        """
+        entry_file = self.entry_path(file_path, yaml_config)
+        if not entry_file.exists() or not file_path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with open(entry_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable cache entry {entry_file.name}: {e}")
+            self.misses += 1
+            return None
+
+        cached = entry.get("fingerprint", {})
+        current = self.fingerprint(file_path, yaml_config, options)
+
+        # Size, config and options must always match exactly
+        for field in ("version", "path", "size", "config_hash", "options"):
+            if cached.get(field) != current[field]:
+                self.misses += 1
+                return None
+
+        if self.use_content_hash:
+            content_hash = self.hash_file_contents(file_path)
+            if cached.get("content_hash") != content_hash:
+                self.misses += 1
+                return None
+            if cached.get("mtime_ns") != current["mtime_ns"]:
+                # Same bytes, new mtime (e.g. re-copied export): refresh the entry
+                current["content_hash"] = content_hash
+                self._write_entry(entry_file, current, entry["metadata"])
+        elif cached.get("mtime_ns") != current["mtime_ns"]:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["metadata"]
+
+    def put(self, file_path: Path, yaml_config: Dict[str, Any],
+            options: Dict[str, Any], metadata: Dict[str, Any]) -> bool:
+        """
+        Store extraction results for a source file, replacing any older entry.
+
+        Args:
+            file_path: Path to the source file
+            yaml_config: Parsed YAML configuration
+            options: Extractor options that influence the result
+            metadata: Successful extract_metadata result
+
+        Returns:
+            True if the entry was written
+        """
+        try:
+            fingerprint = self.fingerprint(file_path, yaml_config, options)
+            if self.use_content_hash:
+                fingerprint["content_hash"] = self.hash_file_contents(file_path)
+            self._write_entry(self.entry_path(file_path, yaml_config), fingerprint, metadata)
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not write extraction cache for {file_path.name}: {e}")
+            return False
+
+    def invalidate(self, file_path: Path, yaml_config: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Drop the cache entries for a source file.
+
+        Args:
+            file_path: Path to the source file
+            yaml_config: Drop only the entry for this configuration (None drops
+                the entries of every configuration, found by scanning the cache)
+        """
+        if yaml_config is not None:
+            entry_files = [self.entry_path(file_path, yaml_config)]
+        else:
+            resolved = str(file_path.resolve())
+            entry_files = []
+            for entry_file in self.cache_dir.glob('*.json'):
+                try:
+                    with open(entry_file, 'r', encoding='utf-8') as f:
+                        if json.load(f).get("fingerprint", {}).get("path") == resolved:
+                            entry_files.append(entry_file)
+                except (OSError, json.JSONDecodeError):
+                    continue
+        for entry_file in entry_files:
+            try:
+                entry_file.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write_entry(self, entry_file: Path, fingerprint: Dict[str, Any],
+                     metadata: Dict[str, Any]) -> None:
+        """Atomically write a cache entry (safe with parallel extraction workers)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = entry_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": fingerprint, "metadata": metadata}, f, default=str)
+        os.replace(tmp_file, entry_file)
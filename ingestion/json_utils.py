@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+JSON Helpers for Weaviate Knowledge Base
+
+Structured metadata (detailed column info, answerable questions, LLM hints) is
+kept as Python objects throughout extraction and only turned into JSON text at
+the Weaviate upload boundary. This module provides that one serialization step:
+compact output (no indentation or spaces) using orjson when it is installed
+and the standard library otherwise.
+
+Usage:
+    from ingestion.json_utils import dumps_compact, ensure_json_string
+    text = dumps_compact({"columns": columns})
+"""
+
+import json
+from typing import Any
+
+# Optional fast encoder (pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_compact(value: Any) -> str:
+    """
+    Serialize a value to compact JSON text.
+
+    Args:
+        value: JSON-compatible value; anything else (datetimes, numpy scalars,
+            paths) is converted with str()
+
+    Returns:
+        JSON string without insignificant whitespace
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits; the standard encoder handles them
+            pass
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def ensure_json_string(value: Any, default: str = "") -> str:
+    """
+    JSON text for a structured field, serializing it only if it is not text yet.
+
+    Args:
+        value: dict/list to serialize, or an already serialized JSON string
+        default: Returned for None
+
+    Returns:
+        JSON string
+    """
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return default
+    return dumps_compact(value)
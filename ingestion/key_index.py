@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Key Indexes for Weaviate Knowledge Base
+
+Point lookups such as "email address of the customer with id 1234567890"
+would otherwise mean rescanning the CSV file. A KeyIndex maps the values of a
+key column to the byte offsets of their CSV records (found with
+CSVRecordScanner), so a lookup is a binary search over a sorted array plus a
+read of one record from the memory-mapped file.
+
+Keys are stored as sorted values for numeric and date columns (so ranges can
+be looked up too) and as sorted 64-bit hashes for text and composite keys.
+Candidates for hashed and numeric keys are verified against the record: hashes
+can collide, and float64 keys cannot tell integers above 2**53 apart. Each index is a directory of
+.npy arrays that are memory-mapped on load, plus a small JSON header with the
+source file's size and modification time; an index whose file changed is
+rebuilt.
+
+Indexes are built for the columns in relationships_config.yaml
+`optimization_hints.indexes_recommended`.
+
+Usage:
+    from ingestion.key_index import KeyIndexStore
+    store = KeyIndexStore('.cache/key_index')
+    record = store.lookup('raw_customer_master', 'ID', 1234567890, columns=['EmailAddress'])
+"""
+
+import json
+import mmap
+import sys
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ingestion.csv_scanner import CSVRecordScanner
+from ingestion.datetime_detection import DatetimeDetector
+from ingestion.sketches import hash_series
+
+INDEX_FORMAT_VERSION = 1
+# Multiplier used to combine the column hashes of composite keys
+_COMBINE = np.uint64(0x100000001B3)
+
+
+def combine_hashes(hashes: Sequence[np.ndarray]) -> np.ndarray:
+    """Combine aligned per-column hashes into one hash per row (composite keys)."""
+    combined = hashes[0].copy()
+    with np.errstate(over='ignore'):
+        for column_hashes in hashes[1:]:
+            combined = combined * _COMBINE ^ column_hashes
+    return combined
+
+
+class KeyIndex:
+    """Sorted keys of one (possibly composite) key column with CSV record offsets."""
+
+    def __init__(self, table_name: str, columns: List[str], file_path: Path, encoding: str,
+                 kind: str, header: List[str], keys: np.ndarray, starts: np.ndarray,
+                 ends: np.ndarray, source: Dict[str, Any]):
+        """
+        Initialize key index (use KeyIndex.build or KeyIndex.load).
+
+        Args:
+            table_name: Table the index belongs to
+            columns: Key column(s)
+            file_path: CSV file the offsets point into
+            encoding: Encoding of the CSV file
+            kind: "numeric" (float64 values), "datetime" (int64 ns) or "hash"
+            header: Column names of the CSV file
+            keys: Sorted keys, one per indexed record
+            starts: Record start offsets, aligned with keys
+            ends: Record end offsets, aligned with keys
+            source: File size and mtime the index was built from
+        """
+        self.table_name = table_name
+        self.columns = columns
+        self.file_path = Path(file_path)
+        self.encoding = encoding
+        self.kind = kind
+        self.header = header
+        self.keys = keys
+        self.starts = starts
+        self.ends = ends
+        self.source = source
+        self._file = None
+        self._map = None
+
+    @staticmethod
+    def source_fingerprint(file_path: Path) -> Dict[str, Any]:
+        stat = Path(file_path).stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @classmethod
+    def build(cls, table_name: str, file_path: Path, columns: Union[str, List[str]],
+              encoding: str = 'utf-8', index_type: str = '', chunk_rows: int = 500_000) -> 'KeyIndex':
+        """
+        Build an index in one scan for offsets and one chunked read of the key column(s).
+
+        Args:
+            table_name: Table the index belongs to
+            file_path: Path to CSV file
+            columns: Key column or columns (composite key)
+            encoding: Encoding of the CSV file (ASCII-compatible)
+            index_type: Index type from the optimization hints; "DATE" types index
+                parsed datetimes so ranges can be looked up
+            chunk_rows: Rows per chunk when reading the key column(s)
+
+        Returns:
+            KeyIndex
+
+        Raises:
+            ValueError: If the key columns are missing or records cannot be aligned
+        """
+        file_path = Path(file_path)
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        scan = CSVRecordScanner().scan(file_path, encoding=encoding, collect_offsets=True)
+        missing = [column for column in columns if column not in scan["header"]]
+        if missing:
+            raise ValueError(f"Key columns not in {file_path.name}: {missing}")
+
+        key_parts = []
+        present_parts = []
+        kind, date_format = None, None
+        rows = 0
+        # Keys are read as text so hashed keys match the CSV fields exactly
+        with pd.read_csv(file_path, usecols=columns, dtype=str, encoding=encoding,
+                         chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                if kind is None:
+                    kind, date_format = cls._key_kind(chunk, columns, index_type)
+                keys, present = cls._chunk_keys(chunk, columns, kind, date_format)
+                key_parts.append(keys)
+                present_parts.append(present)
+                rows += len(chunk)
+
+        if rows != scan["record_count"]:
+            raise ValueError(
+                f"Parsed {rows} rows but scanned {scan['record_count']} records in {file_path.name}"
+            )
+        present = np.concatenate(present_parts) if present_parts else np.zeros(0, dtype=bool)
+        keys = np.concatenate(key_parts) if key_parts else np.empty(0, dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+
+        return cls(
+            table_name=table_name,
+            columns=columns,
+            file_path=file_path,
+            encoding=encoding,
+            kind=kind or 'hash',
+            header=scan["header"],
+            keys=keys[order],
+            starts=scan["record_starts"][present][order],
+            ends=scan["record_ends"][present][order],
+            source=cls.source_fingerprint(file_path)
+        )
+
+    @staticmethod
+    def _key_kind(chunk: pd.DataFrame, columns: List[str],
+                  index_type: str) -> Tuple[Optional[str], Optional[str]]:
+        """Key representation (and date format), decided from the first chunk with values."""
+        if len(columns) > 1:
+            return 'hash', None
+        values = chunk[columns[0]].dropna()
+        if values.empty:
+            return None, None
+        if pd.to_numeric(values, errors='coerce').notna().all():
+            return 'numeric', None
+        if 'DATE' in index_type.upper():
+            parsed, date_format = DatetimeDetector().convert(columns[0], values)
+            if parsed is not None:
+                return 'datetime', date_format
+        return 'hash', None
+
+    @staticmethod
+    def _chunk_keys(chunk: pd.DataFrame, columns: List[str], kind: Optional[str],
+                    date_format: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Keys of one chunk and the mask of rows that have one.
+
+        Rows with a missing key part, or a value that does not parse as the
+        key's number or date, are not indexed.
+        """
+        if kind == 'numeric':
+            values = pd.to_numeric(chunk[columns[0]], errors='coerce')
+            present = values.notna().to_numpy()
+            return values[present].to_numpy(dtype=np.float64), present
+        if kind == 'datetime':
+            values = DatetimeDetector.parse(chunk[columns[0]], date_format)
+            present = values.notna().to_numpy()
+            return values[present].to_numpy(dtype='datetime64[ns]').view(np.int64), present
+        present = chunk[columns].notna().all(axis=1).to_numpy()
+        values = chunk.loc[present, columns]
+        return combine_hashes([hash_series(values[column]) for column in columns]), present
+
+    def key_of(self, value: Any) -> Any:
+        """Lookup value converted to the stored key representation."""
+        if self.kind == 'numeric':
+            return np.float64(value)
+        if self.kind == 'datetime':
+            return pd.Timestamp(value).as_unit('ns').value
+        values = value if isinstance(value, (tuple, list)) else (value,)
+        return combine_hashes([hash_series(pd.Series([str(part)])) for part in values])[0]
+
+    # Persistence
+
+    def save(self, index_dir: Path) -> Path:
+        """
+        Write the index to a directory (arrays as .npy, header as JSON).
+
+        Args:
+            index_dir: Directory for this index
+
+        Returns:
+            The index directory
+        """
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        np.save(index_dir / 'keys.npy', self.keys)
+        np.save(index_dir / 'starts.npy', self.starts)
+        np.save(index_dir / 'ends.npy', self.ends)
+        meta = {
+            "version": INDEX_FORMAT_VERSION,
+            "table_name": self.table_name,
+            "columns": self.columns,
+            "file_path": str(self.file_path),
+            "encoding": self.encoding,
+            "kind": self.kind,
+            "header": self.header,
+            "source": self.source
+        }
+        with open(index_dir / 'index.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        return index_dir
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional['KeyIndex']:
+        """
+        Open a saved index; its arrays are memory-mapped, not read.
+
+        Returns:
+            KeyIndex, or None if the index is missing or from another format version
+        """
+        index_dir = Path(index_dir)
+        try:
+            with open(index_dir / 'index.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_FORMAT_VERSION:
+                return None
+            return cls(
+                table_name=meta["table_name"],
+                columns=meta["columns"],
+                file_path=Path(meta["file_path"]),
+                encoding=meta["encoding"],
+                kind=meta["kind"],
+                header=meta["header"],
+                keys=np.load(index_dir / 'keys.npy', mmap_mode='r'),
+                starts=np.load(index_dir / 'starts.npy', mmap_mode='r'),
+                ends=np.load(index_dir / 'ends.npy', mmap_mode='r'),
+                source=meta["source"]
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def is_current(self) -> bool:
+        """True if the CSV file is unchanged since the index was built."""
+        try:
+            return self.source_fingerprint(self.file_path) == self.source
+        except OSError:
+            return False
+
+    # Lookups
+
+    def _record(self, position: int) -> List[str]:
+        """Parse the CSV record at an index position from the memory-mapped file."""
+        if self._map is None:
+            self._file = open(self.file_path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        raw = self._map[int(self.starts[position]):int(self.ends[position])]
+        return CSVRecordScanner.parse_record(raw, self.encoding)
+
+    def _matches(self, fields: List[str], value: Any) -> bool:
+        """Verify a hash candidate against the record (hash collisions)."""
+        values = value if isinstance(value, (tuple, list)) else (value,)
+        positions = [self.header.index(column) for column in self.columns]
+        return all(fields[position] == str(part) for position, part in zip(positions, values))
+
+    @staticmethod
+    def _exact_number(value: Any) -> Optional[Decimal]:
+        """Number as an exact decimal (None if it is not one), for numeric key checks."""
+        try:
+            return Decimal(str(value).strip())
+        except InvalidOperation:
+            return None
+
+    def _number_between(self, fields: List[str], low: Decimal, high: Decimal) -> bool:
+        """Verify a numeric candidate against the record (float64 keys round large integers)."""
+        number = self._exact_number(fields[self.header.index(self.columns[0])])
+        return number is not None and low <= number <= high
+
+    def _rows(self, first: int, last: int, accept: Optional[Callable[[List[str]], bool]] = None,
+              columns: Optional[List[str]] = None, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        rows = []
+        for position in range(first, last):
+            fields = self._record(position)
+            if accept is not None and not accept(fields):
+                continue
+            row = dict(zip(self.header, fields))
+            rows.append({column: row.get(column) for column in columns} if columns else row)
+            if limit is not None and len(rows) >= limit:
+                break
+        return rows
+
+    def lookup(self, value: Any, columns: Optional[List[str]] = None,
+               limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Records whose key equals value.
+
+        Args:
+            value: Key value (a tuple for composite keys); strings are converted
+                for numeric and date keys
+            columns: Columns to return (default: all)
+            limit: Maximum number of records
+
+        Returns:
+            List of records as {column: raw CSV field}
+        """
+        key = self.key_of(value)
+        first = int(np.searchsorted(self.keys, key, side='left'))
+        last = int(np.searchsorted(self.keys, key, side='right'))
+        accept = None
+        if self.kind == 'hash':
+            accept = lambda fields: self._matches(fields, value)
+        elif self.kind == 'numeric':
+            number = self._exact_number(value)
+            accept = lambda fields: self._number_between(fields, number, number)
+        return self._rows(first, last, accept, columns, limit)
+
+    def lookup_range(self, low: Any, high: Any, columns: Optional[List[str]] = None,
+                     limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Records with low <= key <= high, in key order (numeric and date keys only).
+
+        Raises:
+            ValueError: For hashed (text or composite) keys
+        """
+        if self.kind == 'hash':
+            raise ValueError(f"Range lookups need a numeric or date key, {self.columns} is hashed")
+        first = int(np.searchsorted(self.keys, self.key_of(low), side='left'))
+        last = int(np.searchsorted(self.keys, self.key_of(high), side='right'))
+        accept = None
+        if self.kind == 'numeric':
+            low, high = self._exact_number(low), self._exact_number(high)
+            accept = lambda fields: self._number_between(fields, low, high)
+        return self._rows(first, last, accept, columns, limit)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+
+class KeyIndexStore:
+    """Directory of key indexes, one subdirectory per table and key."""
+
+    def __init__(self, index_dir: Union[str, Path]):
+        """
+        Initialize key index store.
+
+        Args:
+            index_dir: Directory holding the indexes
+        """
+        self.index_dir = Path(index_dir)
+        self._open: Dict[Tuple[str, Tuple[str, ...]], KeyIndex] = {}
+
+    def path_for(self, table_name: str, columns: Union[str, List[str]]) -> Path:
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        return self.index_dir / table_name / "+".join(columns)
+
+    def ensure(self, table_name: str, file_path: Path, columns: Union[str, List[str]],
+               encoding: str = 'utf-8', index_type: str = '') -> Tuple[KeyIndex, bool]:
+        """
+        Load an up-to-date index, building (and saving) it if needed.
+
+        Returns:
+            Tuple of (index, built now)
+        """
+        index_path = self.path_for(table_name, columns)
+        index = KeyIndex.load(index_path)
+        if index is not None and index.is_current() and index.file_path == Path(file_path):
+            return index, False
+        index = KeyIndex.build(table_name, file_path, columns, encoding, index_type)
+        index.save(index_path)
+        return index, True
+
+    def build_recommended(self, relationships_config: Dict[str, Any],
+                          sources: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build the indexes listed in optimization_hints.indexes_recommended.
+
+        Args:
+            relationships_config: Parsed relationships_config.yaml
+            sources: Table name -> {"path", "format", "encoding"} of extracted datasets
+
+        Returns:
+            One summary per recommended index (status built, current, skipped or error)
+        """
+        hints = (relationships_config.get('optimization_hints') or {}).get('indexes_recommended', []) or []
+        summaries = []
+        for hint in hints:
+            table_name = hint.get('table')
+            columns = hint.get('columns') or []
+            summary = {"table": table_name, "columns": columns, "type": hint.get('type', '')}
+            source = sources.get(table_name)
+            if source is None or not columns:
+                summary.update(status="skipped", reason="dataset not extracted" if source is None else "no columns")
+            elif str(source.get("format", "CSV")).upper() != 'CSV':
+                summary.update(status="skipped", reason="key indexes point into CSV files")
+            elif str(source.get("encoding", "utf-8")).lower().startswith('utf-16'):
+                summary.update(status="skipped", reason="UTF-16 files cannot be scanned")
+            else:
+                try:
+                    index, built = self.ensure(table_name, source["path"], columns,
+                                               source.get("encoding", 'utf-8'), hint.get('type', ''))
+                    summary.update(status="built" if built else "current", keys=len(index.keys), kind=index.kind)
+                except Exception as e:
+                    summary.update(status="error", reason=str(e))
+            summaries.append(summary)
+        return summaries
+
+    def get(self, table_name: str, columns: Union[str, List[str]]) -> Optional[KeyIndex]:
+        """Open a saved index (kept open for further lookups); None if missing or stale."""
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        cache_key = (table_name, tuple(columns))
+        index = self._open.get(cache_key)
+        if index is None:
+            index = KeyIndex.load(self.path_for(table_name, columns))
+            if index is None or not index.is_current():
+                return None
+            self._open[cache_key] = index
+        return index
+
+    def lookup(self, table_name: str, key_columns: Union[str, List[str]], value: Any,
+               columns: Optional[List[str]] = None, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Records of a table whose key equals value (see KeyIndex.lookup).
+
+        Raises:
+            KeyError: If there is no up-to-date index for the key
+        """
+        key_columns = [key_columns] if isinstance(key_columns, str) else list(key_columns)
+        index = self.get(table_name, key_columns)
+        if index is None:
+            raise KeyError(f"No current key index for {table_name}.{'+'.join(key_columns)}")
+        return index.lookup(value, columns, limit)
+
+    def close(self) -> None:
+        for index in self._open.values():
+            index.close()
+        self._open.clear()
+
+
+def main():
+    """Look up records from the command line: python -m ingestion.key_index TABLE COLUMN VALUE [RESULT_COLUMN ...]"""
+    if len(sys.argv) < 4:
+        print("Usage: python -m ingestion.key_index TABLE KEY_COLUMN VALUE [RESULT_COLUMN ...]")
+        sys.exit(1)
+    table_name, key_column, value = sys.argv[1:4]
+    store = KeyIndexStore(Path(__file__).parent.parent / '.cache' / 'key_index')
+    try:
+        rows = store.lookup(table_name, key_column.split('+'), value, sys.argv[4:] or None)
+    except KeyError as e:
+        print(f"❌ {e.args[0]} - run the ingestion pipeline to build it")
+        sys.exit(1)
+    print(f"🔑 {len(rows)} records in {table_name} with {key_column} = {value}")
+    for row in rows:
+        print(f"   {row}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
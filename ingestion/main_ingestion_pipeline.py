@@ -19,7 +19,9 @@ WHY THIS DESIGN:
 - Clear separation of concerns
 
 BEDROCK TIMEOUT FIXES:
-- Individual uploads with retries and backoff
+- Batched concurrent uploads with retries and response-driven back pressure
+- Adaptive (AIMD) rate limit on vectorized writes instead of fixed sleeps
+- Optional client-side embeddings in batches, uploaded with the objects
 - Reduced metadata size for vectorization
 - Extended timeout handling
 - Better error reporting for Bedrock issues
@@ -28,11 +30,12 @@ BEDROCK TIMEOUT FIXES:
 import os
 import sys
 import yaml
+import asyncio
 import json
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 
 # CRITICAL: Add project root to Python path so we can import our custom modules
@@ -43,6 +46,16 @@ sys.path.append(str(project_root))
 try:
     from ingestion.csv_extractor import CSVExtractor      # Reads CSVs + combines with YAML
     from ingestion.weaviate_uploader import WeaviateUploader  # Uploads to Weaviate
+    from ingestion.async_weaviate_uploader import AsyncWeaviateUploader  # Concurrent collection uploads
+    from ingestion.json_utils import dumps_compact  # Upload-boundary JSON
+    from ingestion.models import DatasetProfile, DetailedColumnInfo, ProfileValidationError  # Typed metadata model
+    from ingestion.relationship_discovery import RelationshipDiscovery  # Data-driven join candidates
+    from ingestion.relationship_validation import RelationshipValidator, VALIDATION_POLICIES  # validation_rules
+    from ingestion.key_index import KeyIndexStore  # Local point lookups on key columns
+    from ingestion.upload_engine import UploadEngine, UploadItem  # Batched concurrent uploads
+    from ingestion.rate_limiter import AdaptiveRateLimiter  # Paces Bedrock-vectorized writes
+    from ingestion.retry_policy import RetryPolicy, RetryBudget, classify_error, PERMANENT, THROTTLED  # Retries
+    from ingestion.embeddings import BatchEmbedder, create_embedding_provider, embedding_text  # Client-side vectors
     print("✅ Ingestion modules imported successfully")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -64,22 +77,132 @@ class IngestionPipeline:
     DESIGN PATTERN: Facade pattern - provides simple interface to complex subsystem
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, use_cache: bool = True,
+                 extraction_mode: Optional[str] = None,
+                 discover_relationships: Optional[bool] = None,
+                 validation_policy: Optional[str] = None,
+                 build_key_indexes: Optional[bool] = None,
+                 columnar_copy: Optional[bool] = None,
+                 upload_batch_size: Optional[int] = None,
+                 upload_concurrency: Optional[int] = None,
+                 async_upload: Optional[bool] = None,
+                 embedding_provider: Optional[Any] = None):
         """
         Initialize the pipeline with all necessary paths and components.
         
         SETUP PHASE: Establish file locations, create worker objects, initialize tracking
+        
+        Args:
+            max_workers: Worker processes for metadata extraction. Defaults to the
+                INGESTION_MAX_WORKERS environment variable, or 1 (sequential).
+            use_cache: Serve datasets whose CSV and YAML are unchanged from the
+                on-disk extraction cache (.cache/extraction)
+            extraction_mode: "full" (default) or "schema_only" - header and record
+                count only, for runs where just the YAML business metadata changed.
+                Defaults to the INGESTION_EXTRACTION_MODE environment variable.
+            discover_relationships: Propose relationships from the data after
+                extraction and write them to discovered_relationships.yaml for review.
+                Defaults to the INGESTION_DISCOVER_RELATIONSHIPS environment variable.
+            validation_policy: What failing relationships_config validation_rules do
+                before upload: "warn" (default), "fail" (abort the upload) or "off".
+                Defaults to the INGESTION_VALIDATION_POLICY environment variable.
+            build_key_indexes: Build key indexes (.cache/key_index) for the columns in
+                relationships_config.yaml optimization_hints.indexes_recommended.
+                Defaults to the INGESTION_KEY_INDEXES environment variable, or True.
+            columnar_copy: Keep a typed Parquet copy of each CSV file (data_sources/raw/.columnar)
+                that profiling, discovery and validation read instead of the CSV text.
+                Defaults to the INGESTION_COLUMNAR_COPY environment variable.
+            upload_batch_size: DatasetMetadata objects per insert request. Defaults to
+                the INGESTION_UPLOAD_BATCH_SIZE environment variable, or 16.
+            upload_concurrency: Maximum DatasetMetadata batches in flight. Defaults to
+                the INGESTION_UPLOAD_CONCURRENCY environment variable, or 4.
+            async_upload: Upload the three collections concurrently with the Weaviate
+                async client (AsyncWeaviateUploader). Defaults to the INGESTION_ASYNC_UPLOAD
+                environment variable.
+            embedding_provider: Compute DatasetMetadata vectors client-side in large
+                batches and upload them with the objects: "bedrock", "hashing" (local,
+                offline), a provider object (see ingestion.embeddings), or None / "off"
+                to let Weaviate vectorize each insert. Defaults to the INGESTION_EMBEDDINGS
+                environment variable.
+        
+        Writes that trigger Bedrock vectorization share one AdaptiveRateLimiter. It
+        starts at INGESTION_VECTORIZE_RATE objects per second (default 2) and adapts
+        between INGESTION_VECTORIZE_MIN_RATE (0.1) and INGESTION_VECTORIZE_MAX_RATE (100).
+        
+        Weaviate and Bedrock calls share one RetryPolicy: INGESTION_RETRY_MAX_ATTEMPTS (4)
+        attempts per call, full-jitter backoff from INGESTION_RETRY_BASE_DELAY (0.5s) up to
+        INGESTION_RETRY_MAX_DELAY (20s), no attempt after INGESTION_RETRY_DEADLINE (120s),
+        and at most 10 plus INGESTION_RETRY_BUDGET_RATIO (0.2) retries per request in a run.
         """
         # ESTABLISH FILE STRUCTURE: Where to find configs and data
         self.project_root = Path(__file__).parent.parent  # Directory containing this script
         self.config_dir = self.project_root / 'config'  # YAML configurations
         self.data_dir = self.project_root / 'data_sources'  # CSV files
+        self.cache_dir = self.project_root / '.cache' / 'extraction'  # Extraction cache
+        self.key_index_dir = self.project_root / '.cache' / 'key_index'  # Key indexes
+        
+        # PARALLELISM: Datasets are independent, so extraction can use a process pool
+        if max_workers is None:
+            max_workers = int(os.getenv('INGESTION_MAX_WORKERS', '1'))
+        self.max_workers = max(max_workers, 1)
+        self.extraction_mode = extraction_mode or os.getenv('INGESTION_EXTRACTION_MODE', 'full')
+        if discover_relationships is None:
+            discover_relationships = os.getenv('INGESTION_DISCOVER_RELATIONSHIPS', '').lower() in ('1', 'true', 'yes')
+        self.discover_relationships = discover_relationships
+        self.validation_policy = validation_policy or os.getenv('INGESTION_VALIDATION_POLICY', 'warn')
+        if self.validation_policy not in VALIDATION_POLICIES:
+            raise ValueError(f"Unknown validation policy: {self.validation_policy}")
+        if build_key_indexes is None:
+            build_key_indexes = os.getenv('INGESTION_KEY_INDEXES', 'true').lower() in ('1', 'true', 'yes')
+        self.build_key_indexes = build_key_indexes
+        if columnar_copy is None:
+            columnar_copy = os.getenv('INGESTION_COLUMNAR_COPY', '').lower() in ('1', 'true', 'yes')
         
         # CREATE WORKER COMPONENTS: These do the actual technical work
         # CSVExtractor: Reads CSV files and combines with YAML business knowledge
-        self.csv_extractor = CSVExtractor(str(self.data_dir))
+        self.csv_extractor = CSVExtractor(
+            str(self.data_dir),
+            cache_dir=str(self.cache_dir) if use_cache else None,
+            profile_mode=self.extraction_mode,
+            columnar_copy=columnar_copy
+        )
+        # AdaptiveRateLimiter: Finds the write rate the Bedrock account sustains
+        self.vectorize_limiter = AdaptiveRateLimiter(
+            initial_rate=float(os.getenv('INGESTION_VECTORIZE_RATE', '2')),
+            min_rate=float(os.getenv('INGESTION_VECTORIZE_MIN_RATE', '0.1')),
+            max_rate=float(os.getenv('INGESTION_VECTORIZE_MAX_RATE', '100'))
+        )
+        # RetryPolicy: Which failed calls are retried, when, and how many per run
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.getenv('INGESTION_RETRY_MAX_ATTEMPTS', '4')),
+            base_delay=float(os.getenv('INGESTION_RETRY_BASE_DELAY', '0.5')),
+            max_delay=float(os.getenv('INGESTION_RETRY_MAX_DELAY', '20')),
+            deadline=float(os.getenv('INGESTION_RETRY_DEADLINE', '120')),
+            budget=RetryBudget(ratio=float(os.getenv('INGESTION_RETRY_BUDGET_RATIO', '0.2')))
+        )
         # WeaviateUploader: Handles all Weaviate database operations
-        self.weaviate_uploader = WeaviateUploader()
+        self.weaviate_uploader = WeaviateUploader(rate_limiter=self.vectorize_limiter,
+                                                  retry_policy=self.retry_policy)
+        # UploadEngine: Batches DatasetMetadata inserts with bounded concurrency
+        if upload_batch_size is None:
+            upload_batch_size = int(os.getenv('INGESTION_UPLOAD_BATCH_SIZE', '16'))
+        if upload_concurrency is None:
+            upload_concurrency = int(os.getenv('INGESTION_UPLOAD_CONCURRENCY', '4'))
+        self.upload_engine = UploadEngine(batch_size=upload_batch_size, max_concurrency=upload_concurrency,
+                                          retry_policy=self.retry_policy,
+                                          rate_limiter=self.vectorize_limiter)
+        if async_upload is None:
+            async_upload = os.getenv('INGESTION_ASYNC_UPLOAD', '').lower() in ('1', 'true', 'yes')
+        self.async_upload = async_upload
+        # BatchEmbedder: Vectors computed in provider-sized batches instead of one Bedrock call per insert
+        if embedding_provider is None or isinstance(embedding_provider, str):
+            embedding_provider = create_embedding_provider(
+                embedding_provider if embedding_provider is not None else os.getenv('INGESTION_EMBEDDINGS', '')
+            )
+        self.embedder = None
+        if embedding_provider is not None:
+            self.embedder = BatchEmbedder(embedding_provider, retry_policy=self.retry_policy,
+                                          rate_limiter=self.vectorize_limiter)
         
         # INITIALIZE COMPREHENSIVE TRACKING: Record everything for debugging/reporting
         self.results = {
@@ -97,6 +220,14 @@ class IngestionPipeline:
         print(f"   Project Root: {self.project_root}")
         print(f"   Config Dir: {self.config_dir}")
         print(f"   Data Dir: {self.data_dir}")
+        print(f"   Extraction Workers: {self.max_workers}")
+        print(f"   Extraction Mode: {self.extraction_mode}")
+        print(f"   Relationship Validation: {self.validation_policy}")
+        print(f"   Embeddings: {self.embedder.metrics()['provider'] if self.embedder else 'Weaviate vectorizer'}")
+        if self.embedder and self.embedder.provider.batch_size == 1:
+            print(f"   ⚠️  Embedding model takes one text per request, so every object costs a request;")
+            print(f"      set BEDROCK_MODEL_ID to a Cohere embed model (e.g. cohere.embed-english-v3) "
+                  f"for batches of up to 96 (N/96 requests)")
     
     def test_bedrock_access(self) -> bool:
         """Test if we can access Bedrock directly"""
@@ -129,7 +260,8 @@ class IngestionPipeline:
             # Test with small text
             print("   🧪 Testing Bedrock embedding...")
             
-            response = bedrock.invoke_model(
+            response = self.retry_policy.call(
+                bedrock.invoke_model,
                 modelId='cohere.embed-english-v3',
                 body=json.dumps({
                     "texts": ["test"],
@@ -282,22 +414,26 @@ class IngestionPipeline:
         
         FAILURE HANDLING: Continue processing other files if one fails
         
+        PARALLELISM: YAML configs are loaded sequentially, then the CSV work is
+        fanned out over self.max_workers processes and merged back in config order
+        
         Returns:
             List of complete metadata dictionaries ready for Weaviate upload
         """
         print(f"\n📊 Starting metadata extraction phase...")
         
-        # FIND ALL YAML CONFIGURATION FILES
+        # FIND ALL YAML CONFIGURATION FILES (sorted so results are reported in a stable order)
         dataset_configs_dir = self.config_dir / 'dataset_configs'
-        yaml_files = list(dataset_configs_dir.glob('*.yaml')) + list(dataset_configs_dir.glob('*.yml'))
+        yaml_files = sorted(list(dataset_configs_dir.glob('*.yaml')) + list(dataset_configs_dir.glob('*.yml')))
         
         print(f"Found {len(yaml_files)} YAML configuration files to process")
         
         all_metadata = []  # Collect successful extractions
+        jobs = []  # (yaml_file, csv_filename, yaml_config) for every dataset ready to extract
         
-        # PROCESS EACH YAML CONFIGURATION FILE
+        # PREPARE EACH YAML CONFIGURATION FILE (cheap, always sequential)
         for i, yaml_file in enumerate(yaml_files, 1):
-            print(f"\n📄 Processing {i}/{len(yaml_files)}: {yaml_file.name}")
+            print(f"\n📄 Preparing {i}/{len(yaml_files)}: {yaml_file.name}")
             
             try:
                 # STEP 1: Load the human-supplied business knowledge
@@ -317,45 +453,7 @@ class IngestionPipeline:
                     self.results["failed_datasets"] += 1
                     continue
                 
-                # STEP 3: Construct path to CSV file
-                csv_path = f"raw/{csv_filename}"  # Relative to data_sources directory
-                print(f"   📊 Extracting metadata from: {csv_filename}")
-                
-                # STEP 4: THE MAGIC - Combine technical CSV analysis with business YAML knowledge
-                # This is where CSVExtractor reads the CSV, analyzes columns/data types/samples,
-                # then combines with human descriptions/business context from YAML
-                metadata = self.csv_extractor.extract_metadata(csv_path, yaml_config)
-                
-                # STEP 5: Check if extraction succeeded
-                if metadata.get('success'):
-                    all_metadata.append(metadata)
-                    self.results["successful_datasets"] += 1
-                    
-                    # Log success details
-                    table_name = metadata.get('tableName', 'Unknown')
-                    record_count = metadata.get('recordCount', 0)
-                    column_count = len(metadata.get('columnsArray', []))
-                    
-                    print(f"   ✅ Success: {table_name}")
-                    print(f"      Records: {record_count:,}")
-                    print(f"      Columns: {column_count}")
-                    
-                else:
-                    self.results["failed_datasets"] += 1
-                    error_msg = metadata.get('error', 'Unknown error')
-                    print(f"   ❌ Failed to extract metadata: {error_msg}")
-                
-                # STEP 6: Track detailed results for reporting (success or failure)
-                self.results["extraction_results"].append({
-                    "yaml_file": yaml_file.name,
-                    "csv_file": csv_filename,
-                    "table_name": metadata.get('tableName', 'Unknown'),
-                    "success": metadata.get('success', False),
-                    "error": metadata.get('error'),
-                    "record_count": metadata.get('recordCount', 0),
-                    "column_count": len(metadata.get('columnsArray', [])),
-                    "processing_time": metadata.get('processingStats', {}).get('processingTime')
-                })
+                jobs.append((yaml_file, csv_filename, yaml_config))
                 
             except Exception as e:
                 # UNEXPECTED ERROR: Log it and continue with other files
@@ -367,6 +465,52 @@ class IngestionPipeline:
                     "error": f"Unexpected error: {str(e)}"
                 })
         
+        # STEP 3 + 4: THE MAGIC - Combine technical CSV analysis with business YAML knowledge
+        # This is where CSVExtractor reads the CSV, analyzes columns/data types/samples,
+        # then combines with human descriptions/business context from YAML.
+        # With max_workers > 1 the datasets are extracted in parallel worker processes;
+        # results always come back in job order and failures stay isolated per dataset.
+        extraction_jobs = [
+            (f"raw/{csv_filename}", yaml_config)  # Relative to data_sources directory
+            for _, csv_filename, yaml_config in jobs
+        ]
+        metadata_results = self.csv_extractor.extract_many(extraction_jobs, self.max_workers)
+        
+        for (yaml_file, csv_filename, _), metadata in zip(jobs, metadata_results):
+            print(f"\n📄 Result for {yaml_file.name} ({csv_filename})")
+            
+            # STEP 5: Check if extraction succeeded
+            if metadata.get('success'):
+                all_metadata.append(metadata)
+                self.results["successful_datasets"] += 1
+                
+                # Log success details
+                table_name = metadata.table_name
+                record_count = metadata.record_count
+                column_count = metadata.column_count
+                
+                print(f"   ✅ Success: {table_name}")
+                print(f"      Records: {record_count:,}")
+                print(f"      Columns: {column_count}")
+                
+            else:
+                self.results["failed_datasets"] += 1
+                error_msg = metadata.get('error', 'Unknown error')
+                print(f"   ❌ Failed to extract metadata: {error_msg}")
+            
+            # STEP 6: Track detailed results for reporting (success or failure)
+            self.results["extraction_results"].append({
+                "yaml_file": yaml_file.name,
+                "csv_file": csv_filename,
+                "table_name": metadata.get('tableName', 'Unknown'),
+                "success": metadata.get('success', False),
+                "error": metadata.get('error'),
+                "record_count": metadata.get('recordCount', 0),
+                "column_count": len(metadata.get('columnsArray', [])),
+                "processing_time": metadata.get('processingStats', {}).get('processingTime'),
+                "cache_hit": metadata.get('processingStats', {}).get('cacheHit', False)
+            })
+        
         # UPDATE TOTALS for final reporting
         self.results["total_datasets"] = len(yaml_files)
         
@@ -375,6 +519,9 @@ class IngestionPipeline:
         print(f"   Total configurations processed: {self.results['total_datasets']}")
         print(f"   Successful extractions: {self.results['successful_datasets']}")
         print(f"   Failed extractions: {self.results['failed_datasets']}")
+        cache_hits = sum(1 for r in self.results["extraction_results"] if r.get("cache_hit"))
+        if cache_hits:
+            print(f"   Served from extraction cache: {cache_hits}")
         
         if self.results['successful_datasets'] > 0:
             print(f"   ✅ Ready to upload {len(all_metadata)} dataset metadata objects")
@@ -383,121 +530,262 @@ class IngestionPipeline:
         
         return all_metadata
     
-    def upload_dataset_metadata_individually(self, metadata_list: List[Dict[str, Any]]) -> tuple[bool, Dict[str, Any]]:
+    def dataset_sources(self, metadata_list: List[DatasetProfile]) -> Dict[str, Dict[str, Any]]:
+        """
+        Data files of the extracted datasets, by table name.
+        
+        Partitioned datasets (directories or globs) are not included. CSV files
+        with a current columnar copy also get its path, for stages that only
+        need to read columns.
+        
+        Args:
+            metadata_list: Successfully extracted dataset profiles
+            
+        Returns:
+            Table name -> {"path", "format", "encoding", "record_count", "profile", "columnar_path"}
+        """
+        columnar_cache = self.csv_extractor.columnar_cache
+        sources = {}
+        for profile in metadata_list:
+            file_path = self.data_dir / 'raw' / profile.original_file_name
+            if not file_path.is_file():
+                print(f"   ⚠️  Skipping {profile.table_name} - {file_path.name} is not a single file")
+                continue
+            sources[profile.table_name] = {
+                "path": file_path,
+                "format": profile.format,
+                "encoding": (profile.processing_stats.get('encodingUsed') or {}).get('encoding') or 'utf-8',
+                "record_count": profile.record_count,
+                "profile": profile,
+                "columnar_path": columnar_cache.current(file_path) if columnar_cache else None
+            }
+        return sources
+    
+    def validate_relationships(self, metadata_list: List[DatasetProfile]) -> bool:
+        """
+        VALIDATION PHASE: Run relationships_config.yaml validation_rules before upload.
+        
+        Rules run against the dataset files (DuckDB when installed, otherwise
+        chunked pandas hash joins) and are compared with their expected_result.
+        Rules that reference tables which were not extracted are skipped.
+        
+        Args:
+            metadata_list: Successfully extracted dataset profiles
+            
+        Returns:
+            bool: False if a rule failed and the policy is "fail", True otherwise
+        """
+        if self.validation_policy == 'off':
+            return True
+        relationships_config_path = self.config_dir / 'relationships_config.yaml'
+        if not relationships_config_path.exists():
+            return True
+        relationships_config = self.load_yaml_config(relationships_config_path)
+        if not relationships_config or not relationships_config.get('validation_rules'):
+            return True
+        
+        tables = {}
+        for table_name, source in self.dataset_sources(metadata_list).items():
+            tables[table_name] = {key: value for key, value in source.items() if key != 'profile'}
+            if source["columnar_path"]:
+                tables[table_name].update(path=source["columnar_path"], format='Parquet')
+        results = RelationshipValidator(tables).validate(relationships_config)
+        self.results["validation_results"] = results
+        
+        failed = [result for result in results if result["status"] == "failed"]
+        if failed and self.validation_policy == 'fail':
+            print(f"❌ {len(failed)} validation rules failed - aborting upload (policy: fail)")
+            return False
+        if failed:
+            print(f"⚠️  {len(failed)} validation rules failed - continuing (policy: warn)")
+        return True
+    
+    def build_dataset_key_indexes(self, metadata_list: List[DatasetProfile]) -> List[Dict[str, Any]]:
+        """
+        INDEX PHASE: Build key indexes for optimization_hints.indexes_recommended.
+        
+        Each index maps key values to the byte offsets of their CSV records, so
+        questions like "email of the customer with id X" are answered locally
+        (KeyIndexStore.lookup) without rescanning the file. Indexes of unchanged
+        files are reused; non-CSV and partitioned datasets are skipped.
+        
+        Args:
+            metadata_list: Successfully extracted dataset profiles
+            
+        Returns:
+            One summary per recommended index
+        """
+        relationships_config_path = self.config_dir / 'relationships_config.yaml'
+        if not relationships_config_path.exists():
+            return []
+        relationships_config = self.load_yaml_config(relationships_config_path)
+        if not relationships_config:
+            return []
+        
+        print(f"\n🔑 Building key indexes...")
+        summaries = KeyIndexStore(self.key_index_dir).build_recommended(
+            relationships_config, self.dataset_sources(metadata_list)
+        )
+        self.results["key_indexes"] = summaries
+        for summary in summaries:
+            name = f"{summary['table']}.{'+'.join(summary['columns'])}"
+            if summary["status"] in ("built", "current"):
+                print(f"   ✅ {name}: {summary['keys']:,} keys ({summary['kind']}, {summary['status']})")
+            elif summary["status"] == "error":
+                print(f"   ❌ {name}: {summary['reason']}")
+            else:
+                print(f"   ⏭️  {name}: {summary['reason']}")
+        return summaries
+    
+    def discover_dataset_relationships(self, metadata_list: List[DatasetProfile]) -> List[Dict[str, Any]]:
+        """
+        DISCOVERY PHASE (optional): Propose relationships between the extracted datasets.
+        
+        Column signatures (distinct counts, hashed value samples) are built in one
+        pass per dataset and unique keys are tested for inclusion with Bloom
+        filters - no table is joined. Sparse columns are skipped. The proposals are
+        written to discovered_relationships.yaml for review; they are NOT uploaded,
+        relationships_config.yaml stays the source of truth.
+        
+        Args:
+            metadata_list: Successfully extracted dataset profiles
+            
+        Returns:
+            List of proposed relationships (relationships_config.yaml shape)
+        """
+        print(f"\n🔎 Discovering relationships from data...")
+        discovery = RelationshipDiscovery()
+        
+        for table_name, source in self.dataset_sources(metadata_list).items():
+            detailed = source["profile"].detailed_column_info
+            columns = None
+            if isinstance(detailed, DetailedColumnInfo):
+                columns = [column.name for column in detailed.columns if not column.is_sparse]
+            path, file_format = source["path"], source["format"]
+            if source["columnar_path"]:
+                path, file_format = source["columnar_path"], 'Parquet'
+            try:
+                discovery.add_file(table_name, path, file_format, columns, source["encoding"])
+            except Exception as e:
+                print(f"   ⚠️  Could not read {source['path'].name} for discovery: {e}")
+        
+        relationships = discovery.discover()
+        self.results["discovered_relationships"] = relationships
+        if relationships:
+            output_path = discovery.write_yaml(relationships, self.project_root / 'discovered_relationships.yaml')
+            print(f"   📝 {len(relationships)} proposals written to {output_path.name}")
+            for relationship in relationships:
+                print(f"      - {relationship['from_table']}.{relationship['from_column']} -> "
+                      f"{relationship['to_table']}.{relationship['to_column']} "
+                      f"({relationship['cardinality']}, confidence {relationship['confidence']})")
+        return relationships
+    
+    @staticmethod
+    def reduced_dataset_properties(profile: DatasetProfile) -> Dict[str, Any]:
         """
-        Upload DatasetMetadata objects individually with timeout handling and retries.
+        Weaviate properties of a profile, reduced in size for Bedrock vectorization.
         
-        NEW APPROACH: Instead of batch uploads that timeout, upload one at a time
-        with reduced metadata size and retry logic.
+        Args:
+            profile: Validated dataset profile
+            
+        Returns:
+            Weaviate-ready properties with truncated vectorized fields
+        """
+        reduced_metadata = profile.to_weaviate_properties()
+        
+        # Vectorized fields - REDUCED SIZE to prevent Bedrock timeout
+        reduced_metadata["description"] = profile.description[:800]  # Limit to 800 chars
+        reduced_metadata["businessPurpose"] = profile.business_purpose[:500]  # Limit to 500 chars
+        reduced_metadata["columnSemanticsConcatenated"] = profile.column_semantics_concatenated[:1500]  # Limit to 1500 chars
+        reduced_metadata["tags"] = reduced_metadata["tags"][:10]  # Limit to 10 tags
+        
+        # Simplified complex fields to reduce Bedrock load
+        reduced_metadata["answerableQuestions"] = '["What is the structure of this dataset?"]'  # Simplified
+        reduced_metadata["llmHints"] = '{"note": "Simplified for upload"}'  # Simplified
+        
+        return reduced_metadata
+    
+    def upload_dataset_metadata_individually(self, metadata_list: List[DatasetProfile]) -> tuple[bool, Dict[str, Any]]:
+        """
+        Upload DatasetMetadata objects in concurrent batches with retries.
+        
+        Objects that Weaviate vectorizes are reduced in size for Bedrock; objects
+        embedded client-side keep their full properties. They are sent by the
+        UploadEngine: fixed-size insert_many batches, a bounded number in flight,
+        and back pressure driven by the server's answers (transient failures
+        shrink the in-flight window and are retried) instead of fixed sleeps.
         
         Args:
-            metadata_list: List of metadata objects to upload
+            metadata_list: List of DatasetProfile objects to upload (metadata
+                dictionaries are converted and validated first)
             
         Returns:
             tuple: (success, results_dict)
         """
-        print(f"📤 Uploading {len(metadata_list)} DatasetMetadata objects individually...")
+        print(f"📤 Uploading {len(metadata_list)} DatasetMetadata objects "
+              f"(batches of {self.upload_engine.batch_size}, up to {self.upload_engine.max_concurrency} in flight)...")
         
         collection = self.weaviate_uploader.client.collections.get("DatasetMetadata")
         
-        successful_uploads = []
         failed_uploads = []
+        items = []
+        profiles = []
         
-        for i, metadata in enumerate(metadata_list, 1):
+        for metadata in metadata_list:
             table_name = metadata.get('tableName', 'Unknown')
-            print(f"\n📤 [{i}/{len(metadata_list)}] Uploading {table_name}...")
             
             # Create reduced metadata to avoid timeout
-            reduced_metadata = {
-                "tableName": metadata.get("tableName", ""),
-                "originalFileName": metadata.get("originalFileName", ""),
-                "athenaTableName": metadata.get("athenaTableName", ""),
-                "zone": metadata.get("zone", ""),
-                "format": metadata.get("format", ""),
-                
-                # Vectorized fields - REDUCED SIZE to prevent Bedrock timeout
-                "description": metadata.get("description", "")[:800],  # Limit to 800 chars
-                "businessPurpose": metadata.get("businessPurpose", "")[:500],  # Limit to 500 chars
-                "columnSemanticsConcatenated": metadata.get("columnSemanticsConcatenated", "")[:1500],  # Limit to 1500 chars
-                "tags": metadata.get("tags", [])[:10],  # Limit to 10 tags
-                
-                # Non-vectorized fields (full size OK)
-                "columnsArray": metadata.get("columnsArray", []),
-                "detailedColumnInfo": metadata.get("detailedColumnInfo", ""),
-                "recordCount": metadata.get("recordCount", 0),
-                "dataOwner": metadata.get("dataOwner", ""),
-                "sourceSystem": metadata.get("sourceSystem", ""),
-                
-                # Simplified complex fields to reduce Bedrock load
-                "answerableQuestions": '["What is the structure of this dataset?"]',  # Simplified
-                "llmHints": '{"note": "Simplified for upload"}',  # Simplified
-                
-                # Add required dates
-                "metadataCreatedAt": metadata.get("metadataCreatedAt", datetime.now().isoformat()),
-                "dataLastModifiedAt": metadata.get("dataLastModifiedAt", datetime.now().isoformat())
-            }
+            try:
+                profile = self.weaviate_uploader.as_profile(metadata)
+            except ProfileValidationError as e:
+                print(f"   ❌ Invalid metadata for {table_name}: {e}")
+                failed_uploads.append({
+                    "table_name": table_name,
+                    "errors": e.errors,
+                    "last_error": str(e)
+                })
+                continue
+            # Full properties when embedded client-side, reduced when Weaviate calls Bedrock
+            if self.embedder:
+                properties = profile.to_weaviate_properties()
+            else:
+                properties = self.reduced_dataset_properties(profile)
             
             # Calculate and show metadata size
-            size_kb = len(json.dumps(reduced_metadata, default=str).encode()) / 1024
-            print(f"   📏 Metadata size: {size_kb:.1f} KB (reduced for Bedrock compatibility)")
-            
-            # Upload with retries
-            max_retries = 3
-            success = False
-            
-            for attempt in range(max_retries):
-                try:
-                    print(f"   🔄 Attempt {attempt + 1}/{max_retries}...")
-                    
-                    uuid = collection.data.insert(reduced_metadata)
-                    print(f"   ✅ Success: {uuid}")
-                    
-                    successful_uploads.append({
-                        "table_name": table_name,
-                        "uuid": str(uuid),
-                        "record_count": metadata.get("recordCount", 0),
-                        "attempt": attempt + 1
-                    })
-                    
-                    success = True
-                    break
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"   ❌ Attempt {attempt + 1} failed: {error_msg}")
-                    
-                    if "timeout" in error_msg.lower() or "context canceled" in error_msg.lower():
-                        if attempt < max_retries - 1:
-                            wait_time = (attempt + 1) * 10  # Exponential backoff
-                            print(f"   ⏳ Waiting {wait_time}s before retry...")
-                            time.sleep(wait_time)
-                        else:
-                            failed_uploads.append({
-                                "table_name": table_name,
-                                "errors": [f"All {max_retries} attempts timed out"],
-                                "last_error": error_msg
-                            })
-                    else:
-                        # Non-timeout error, don't retry
-                        failed_uploads.append({
-                            "table_name": table_name,
-                            "errors": [error_msg],
-                            "last_error": error_msg
-                        })
-                        break
+            size_kb = len(dumps_compact(properties).encode()) / 1024
+            print(f"   📏 {profile.table_name}: {size_kb:.1f} KB"
+                  f"{'' if self.embedder else ' (reduced for Bedrock compatibility)'}")
             
-            if not success:
-                print(f"   💥 All upload attempts failed for {table_name}")
-            
-            # Small delay between uploads to avoid overwhelming Weaviate/Bedrock
-            if i < len(metadata_list):
-                time.sleep(2)
+            # Consistent UUIDs make a retried object overwrite, not duplicate, an earlier attempt
+            consistent_uuid = self.weaviate_uploader.generate_consistent_uuid(profile.table_name, profile.zone)
+            items.append(UploadItem(
+                properties=properties,
+                uuid=consistent_uuid,
+                summary={"table_name": profile.table_name, "record_count": profile.record_count}
+            ))
+            profiles.append(profile)
+        
+        # CLIENT-SIDE EMBEDDINGS: One request per provider batch, then insert with vectors attached
+        if self.embedder and items:
+            vectors = self.embedder.embed([embedding_text(item.properties) for item in items])
+            for item, profile, vector in zip(items, profiles, vectors):
+                item.vector = vector
+                if vector is None:
+                    # Failed embedding: Weaviate vectorizes it, so send the reduced properties
+                    item.properties = self.reduced_dataset_properties(profile)
+            print(f"   🧮 Embedded {len(items)} objects client-side ({self.embedder.metrics()['requests']} requests)")
+        
+        report = self.upload_engine.upload(collection, items)
+        successful_uploads = report["successful_uploads"]
+        failed_uploads.extend(report["failed_uploads"])
+        for upload in successful_uploads:
+            self.weaviate_uploader.uploaded_datasets[upload["table_name"]] = upload["uuid"]
         
         # Results summary
         total_successful = len(successful_uploads)
         total_failed = len(failed_uploads)
         
-        print(f"\n📊 Individual Upload Results:")
+        print(f"\n📊 Upload Results ({report['stats']['batches']} batches, {report['stats']['elapsed_seconds']}s):")
         print(f"   Successful: {total_successful}/{len(metadata_list)}")
         print(f"   Failed: {total_failed}/{len(metadata_list)}")
         
@@ -516,7 +804,8 @@ class IngestionPipeline:
             "failed": total_failed,
             "total_attempted": len(metadata_list),
             "successful_uploads": successful_uploads,
-            "failed_uploads": failed_uploads
+            "failed_uploads": failed_uploads,
+            "upload_stats": report["stats"]
         }
         
         return total_successful > 0, results
@@ -525,10 +814,10 @@ class IngestionPipeline:
         """
         WEAVIATE UPLOAD PHASE: Upload all extracted metadata to Weaviate database.
         
-        UPDATED APPROACH: Use individual uploads for DatasetMetadata to handle Bedrock timeouts
+        UPDATED APPROACH: Batched concurrent uploads for DatasetMetadata to handle Bedrock timeouts
         
         UPLOAD SEQUENCE (order matters):
-        1. DatasetMetadata objects (the core dataset descriptions) - INDIVIDUAL UPLOADS
+        1. DatasetMetadata objects (the core dataset descriptions) - BATCHED UPLOADS
         2. DataRelationship objects (how tables join together)  
         3. DomainTag objects (business domain organization)
         
@@ -540,6 +829,9 @@ class IngestionPipeline:
         """
         print(f"\n🚀 Starting Weaviate upload phase...")
         
+        if self.async_upload:
+            return asyncio.run(self.upload_all_data_async(metadata_list))
+        
         # ESTABLISH CONNECTION: Must connect before any upload operations
         if not self.weaviate_uploader.connect():
             print(f"❌ Could not connect to Weaviate")
@@ -550,8 +842,8 @@ class IngestionPipeline:
         try:
             overall_success = True  # Track if all uploads succeed
             
-            # UPLOAD PHASE 1: DatasetMetadata objects (INDIVIDUAL UPLOADS)
-            # Use new individual upload method to handle Bedrock timeouts
+            # UPLOAD PHASE 1: DatasetMetadata objects (BATCHED UPLOADS)
+            # Bounded-concurrency batches with back pressure to handle Bedrock timeouts
             if metadata_list:
                 dataset_success, dataset_results = self.upload_dataset_metadata_individually(metadata_list)
                 
@@ -622,6 +914,10 @@ class IngestionPipeline:
                 print(f"\n   ⚠️  Domain tags config not found: {domain_tags_config_path}")
                 print(f"      Skipping domain tag upload (this is optional)")
             
+            self.report_vectorize_rate()
+            self.report_retries()
+            self.report_embeddings()
+            
             # UPLOAD PHASE SUMMARY
             if overall_success:
                 print(f"\n✅ All upload phases completed successfully!")
@@ -639,6 +935,95 @@ class IngestionPipeline:
             # ALWAYS disconnect from Weaviate, even if errors occurred
             self.weaviate_uploader.disconnect()
     
+    def report_vectorize_rate(self) -> None:
+        """Record and print the adaptive rate limiter's metrics after an upload."""
+        metrics = self.vectorize_limiter.metrics()
+        self.results["upload_results"]["rate_limiter"] = metrics
+        print(f"   🚦 Vectorized write rate: {metrics['rate_per_second']}/s "
+              f"(range {metrics['min_rate_seen']}-{metrics['max_rate_seen']}/s, "
+              f"{metrics['decreases']} slowdowns, waited {metrics['waited_seconds']}s)")
+    
+    def report_retries(self) -> None:
+        """Record and print the retry policy's metrics after an upload."""
+        metrics = self.retry_policy.metrics()
+        self.results["upload_results"]["retries"] = metrics
+        gave_up = metrics['attempts_exhausted'] + metrics['deadline_exceeded'] + metrics['budget_exhausted']
+        print(f"   🔁 Retries: {metrics['retries']} ({metrics['throttled']} throttled), "
+              f"{gave_up} transient failures given up, {metrics['permanent']} permanent failures")
+        if metrics['budget_exhausted']:
+            print(f"   ⚠️  Retry budget spent: {metrics['budget']['retries']} retries "
+                  f"for {metrics['budget']['requests']} requests")
+    
+    def report_embeddings(self) -> None:
+        """Record and print the client-side embedding metrics after an upload."""
+        if not self.embedder:
+            return
+        metrics = self.embedder.metrics()
+        self.results["upload_results"]["embeddings"] = metrics
+        print(f"   🧮 Embeddings ({metrics['provider']}): {metrics['texts']} texts "
+              f"in {metrics['requests']} requests, {metrics['elapsed_seconds']}s")
+    
+    async def upload_all_data_async(self, metadata_list: List[DatasetProfile]) -> bool:
+        """
+        WEAVIATE UPLOAD PHASE (async): Upload the three collections concurrently.
+        
+        DatasetMetadata, DataRelationship and DomainTag objects are independent,
+        so AsyncWeaviateUploader uploads them together, with the insert batches
+        of all collections sharing one bound on requests in flight. Results are
+        stored in the same upload_results shape as upload_all_data.
+        
+        Args:
+            metadata_list: List of rich metadata objects from extraction phase
+            
+        Returns:
+            bool: True if all uploads succeeded, False if any failed
+        """
+        relationships_config = None
+        relationships_config_path = self.config_dir / 'relationships_config.yaml'
+        if relationships_config_path.exists():
+            relationships_config = self.load_yaml_config(relationships_config_path)
+        domain_tags_config = None
+        domain_tags_config_path = self.config_dir / 'domain_tags_config.yaml'
+        if domain_tags_config_path.exists():
+            domain_tags_config = self.load_yaml_config(domain_tags_config_path)
+        
+        uploader = AsyncWeaviateUploader(
+            max_concurrency=self.upload_engine.max_concurrency,
+            batch_size=self.upload_engine.batch_size,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.vectorize_limiter,
+            embedder=self.embedder
+        )
+        outcomes = await uploader.run_upload_all(
+            metadata_list, relationships_config, domain_tags_config,
+            prepare=self.reduced_dataset_properties
+        )
+        if outcomes is None:
+            print(f"❌ Could not connect to Weaviate")
+            print(f"   Check that Weaviate is running: docker-compose ps")
+            return False
+        
+        overall_success = True
+        for upload_name, (success, results) in outcomes.items():
+            self.results["upload_results"][upload_name] = results
+            overall_success &= success
+            print(f"   {'✅' if success else '⚠️ '} {upload_name}: {results.get('successful', 0)} uploaded, "
+                  f"{results.get('failed', 0)} failed")
+        self.weaviate_uploader.uploaded_datasets.update(uploader.uploaded_datasets)
+        
+        self.report_vectorize_rate()
+        self.report_retries()
+        self.report_embeddings()
+        
+        # UPLOAD PHASE SUMMARY
+        if overall_success:
+            print(f"\n✅ All upload phases completed successfully!")
+        else:
+            print(f"\n⚠️  Upload phase completed with some failures")
+            print(f"   Check the detailed results above")
+        
+        return overall_success
+    
     def verify_ingestion(self) -> Dict[str, Any]:
         """
         VERIFICATION PHASE: Confirm that ingestion actually worked.
@@ -835,7 +1220,10 @@ class IngestionPipeline:
                             for failure in results['failed_uploads']:
                                 table_name = failure.get('table_name', 'Unknown')
                                 error = failure.get('last_error', 'Unknown error')
-                                if 'timeout' in error.lower():
+                                error_class = classify_error(error)
+                                if error_class == THROTTLED:
+                                    print(f"      💥 {table_name}: Bedrock throttled (lower INGESTION_VECTORIZE_MAX_RATE)")
+                                elif error_class != PERMANENT:
                                     print(f"      💥 {table_name}: Bedrock timeout (try smaller metadata)")
                                 else:
                                     print(f"      💥 {table_name}: {error}")
@@ -973,14 +1361,14 @@ class IngestionPipeline:
         ENHANCED PIPELINE PHASES:
         1. Pre-flight validation (including Bedrock test)
         2. Metadata extraction  
-        3. Weaviate upload (with individual uploads for timeout handling)
+        3. Weaviate upload (batched, with back pressure for timeout handling)
         4. Verification (including semantic search test)
         5. Comprehensive reporting
         
         ERROR HANDLING STRATEGY:
         - Fail fast on setup issues (no point proceeding if environment is broken)
         - Continue on partial failures (process what we can)
-        - Individual uploads to handle Bedrock timeouts
+        - Batched uploads with back pressure to handle Bedrock timeouts
         - Comprehensive logging (track every success and failure)
         - Clear error messages (user knows exactly what to fix)
         
@@ -1012,10 +1400,26 @@ class IngestionPipeline:
             
             print(f"✅ Extraction phase successful - ready to upload {len(metadata_list)} datasets")
             
-            # PHASE 3: WEAVIATE UPLOAD (Enhanced with individual uploads)
+            # Key indexes for local point lookups on the recommended key columns
+            if self.build_key_indexes:
+                self.build_dataset_key_indexes(metadata_list)
+            
+            # OPTIONAL: Propose relationships from the data (written for review, not uploaded)
+            if self.discover_relationships:
+                self.discover_dataset_relationships(metadata_list)
+            
+            # PHASE 2b: RELATIONSHIP VALIDATION
+            # Run relationships_config.yaml validation_rules against the data before upload
+            if not self.validate_relationships(metadata_list):
+                print(f"❌ Pipeline aborted - relationship validation failed")
+                print(f"   Fix the data or the rules, or set INGESTION_VALIDATION_POLICY=warn")
+                self.save_results_log()
+                return False
+            
+            # PHASE 3: WEAVIATE UPLOAD (Enhanced with batched uploads)
             # Load all metadata into Weaviate database with timeout handling
             print(f"\n🚀 PHASE 3: Weaviate Database Upload")
-            print(f"   Using individual uploads to handle Bedrock timeouts")
+            print(f"   Using batched uploads with back pressure to handle Bedrock timeouts")
             upload_success = self.upload_all_data(metadata_list)
             
             if not upload_success:
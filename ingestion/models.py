@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Metadata Model for Weaviate Knowledge Base
+
+Typed, slotted objects for the dataset metadata that flows from CSVExtractor
+through the ingestion pipeline into WeaviateUploader:
+- ColumnProfile: technical profile and YAML business metadata of one column
+- DetailedColumnInfo: all column profiles of a dataset plus column groups
+- DatasetProfile: everything uploaded as one DatasetMetadata object
+
+Objects are validated once, when they are constructed; consumers can rely on
+the field types afterwards. to_dict() produces the camelCase dictionaries used
+by the extraction cache and results logs, and DatasetProfile supports
+read-only dict-style access (profile.get('tableName')) for existing scripts.
+
+Usage:
+    from ingestion.models import DatasetProfile
+    profile = DatasetProfile.from_dict(metadata_dict)
+    properties = profile.to_weaviate_properties()
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Union
+
+from ingestion.json_utils import ensure_json_string
+
+VALID_ZONES = ('Raw', 'Cleansed', 'Curated')
+
+
+class ProfileValidationError(ValueError):
+    """Raised when metadata does not form a valid DatasetProfile."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@dataclass(slots=True)
+class ColumnProfile:
+    """Profile of a single column."""
+
+    name: str
+    data_type: str
+    pandas_type: Optional[str] = None
+    null_count: Optional[int] = None
+    sample_values: List[str] = field(default_factory=list)
+
+    # Human-supplied metadata from YAML
+    description: str = ""
+    semantic_type: str = "unknown"
+    business_name: str = ""
+    data_classification: str = "Internal"
+    is_primary_key: bool = False
+    is_foreign_key_to_table: Optional[str] = None
+    is_foreign_key_to_column: Optional[str] = None
+
+    # Approximate statistics from column sketches (None when not profiled)
+    approx_distinct_count: Optional[int] = None
+    top_values: Optional[List[Dict[str, Any]]] = None
+    quantiles: Optional[Dict[str, Any]] = None
+
+    # Exact range of datetime columns (ISO strings)
+    min_value: Optional[str] = None
+    max_value: Optional[str] = None
+
+    # Mostly-empty column (null ratio above the extractor's sparse threshold)
+    is_sparse: bool = False
+    null_ratio: Optional[float] = None
+
+    # semantic_type was detected from the values, not taken from YAML
+    semantic_type_detected: bool = False
+
+    # camelCase key -> attribute, in output order
+    KEYS = {
+        "name": "name",
+        "dataType": "data_type",
+        "pandasType": "pandas_type",
+        "nullCount": "null_count",
+        "sampleValues": "sample_values",
+        "description": "description",
+        "semanticType": "semantic_type",
+        "businessName": "business_name",
+        "dataClassification": "data_classification",
+        "isPrimaryKey": "is_primary_key",
+        "isForeignKeyToTable": "is_foreign_key_to_table",
+        "isForeignKeyToColumn": "is_foreign_key_to_column",
+        "approxDistinctCount": "approx_distinct_count",
+        "topValues": "top_values",
+        "quantiles": "quantiles",
+        "minValue": "min_value",
+        "maxValue": "max_value",
+        "isSparse": "is_sparse",
+        "nullRatio": "null_ratio",
+        "semanticTypeDetected": "semantic_type_detected"
+    }
+    # Keys left out of to_dict() when their value is None
+    OPTIONAL_KEYS = ("approxDistinctCount", "topValues", "quantiles", "minValue", "maxValue", "nullRatio")
+    # Flags left out of to_dict() when False
+    FLAG_KEYS = ("isSparse", "semanticTypeDetected")
+    # Keys always kept for sparse columns; other keys only when they differ from the defaults
+    SPARSE_KEYS = ("name", "dataType", "nullCount", "nullRatio", "isSparse")
+    SPARSE_DEFAULTS = {
+        "semanticType": "unknown",
+        "dataClassification": "Internal",
+        "isPrimaryKey": False,
+        "semanticTypeDetected": False
+    }
+
+    def __post_init__(self):
+        if not isinstance(self.name, str) or not self.name:
+            raise ProfileValidationError([f"Column name must be a non-empty string, got {self.name!r}"])
+        if self.null_count is not None:
+            self.null_count = int(self.null_count)
+        if not self.business_name:
+            self.business_name = self.name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """camelCase dictionary in the detailedColumnInfo column shape."""
+        if self.is_sparse:
+            return self.to_compact_dict()
+        result = {}
+        for key, attribute in self.KEYS.items():
+            value = getattr(self, attribute)
+            if value is None and key in self.OPTIONAL_KEYS:
+                continue
+            if key in self.FLAG_KEYS and not value:
+                continue
+            result[key] = value
+        return result
+
+    def to_compact_dict(self) -> Dict[str, Any]:
+        """
+        Compact dictionary for sparse columns: name, type and null statistics,
+        plus only those descriptive fields that carry information (non-empty
+        samples, YAML metadata that differs from the defaults). Approximate
+        statistics over a handful of values are dropped.
+        """
+        result = {key: getattr(self, self.KEYS[key]) for key in self.SPARSE_KEYS}
+        if self.sample_values:
+            result["sampleValues"] = self.sample_values
+        if self.description and self.description != f"Column {self.name}":
+            result["description"] = self.description
+        if self.business_name != self.name:
+            result["businessName"] = self.business_name
+        for key, default in self.SPARSE_DEFAULTS.items():
+            value = getattr(self, self.KEYS[key])
+            if value != default:
+                result[key] = value
+        for key in ("isForeignKeyToTable", "isForeignKeyToColumn", "minValue", "maxValue"):
+            value = getattr(self, self.KEYS[key])
+            if value is not None:
+                result[key] = value
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ColumnProfile':
+        """Build a column profile from its camelCase (full or compact) dictionary."""
+        values = {attribute: data[key] for key, attribute in cls.KEYS.items() if key in data}
+        if values.get("is_sparse") and "description" not in values:
+            values["description"] = f"Column {values.get('name')}"
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class DetailedColumnInfo:
+    """Column profiles of a dataset."""
+
+    columns: List[ColumnProfile] = field(default_factory=list)
+    column_groups: Dict[str, Any] = field(default_factory=dict)
+    profile_mode: str = "full"
+    generated_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    error: Optional[str] = None
+    # Null ratio above which columns were flagged sparse (None: not checked)
+    sparse_null_ratio: Optional[float] = None
+
+    @property
+    def total_columns(self) -> int:
+        return len(self.columns)
+
+    @property
+    def sparse_columns(self) -> List[str]:
+        return [column.name for column in self.columns if column.is_sparse]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """camelCase dictionary in the detailedColumnInfo shape."""
+        result = {
+            "columns": [column.to_dict() for column in self.columns],
+            "columnGroups": self.column_groups,
+            "totalColumns": self.total_columns,
+            "profileMode": self.profile_mode,
+            "generatedAt": self.generated_at
+        }
+        if self.sparse_null_ratio is not None:
+            result["sparseNullRatio"] = self.sparse_null_ratio
+            result["sparseColumns"] = self.sparse_columns
+        if self.error:
+            result["error"] = self.error
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DetailedColumnInfo':
+        """Build detailed column info from its camelCase dictionary."""
+        return cls(
+            columns=[ColumnProfile.from_dict(column) for column in data.get("columns", [])],
+            column_groups=data.get("columnGroups", {}),
+            profile_mode=data.get("profileMode", "full"),
+            generated_at=data.get("generatedAt") or datetime.now(timezone.utc).isoformat(),
+            error=data.get("error"),
+            sparse_null_ratio=data.get("sparseNullRatio")
+        )
+
+
+@dataclass(slots=True)
+class DatasetProfile:
+    """Metadata of one dataset, as uploaded to the DatasetMetadata collection."""
+
+    table_name: str
+    original_file_name: str
+    record_count: int
+    columns_array: List[str]
+    detailed_column_info: Union[DetailedColumnInfo, str]
+    zone: str = "Raw"
+    column_semantics_concatenated: str = ""
+    data_last_modified_at: Optional[str] = None
+    metadata_created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    # Business metadata from YAML
+    athena_table_name: str = ""
+    format: str = "CSV"
+    description: str = ""
+    business_purpose: str = ""
+    tags: List[str] = field(default_factory=list)
+    data_owner: str = ""
+    source_system: str = ""
+    answerable_questions: Union[List[Any], str] = field(default_factory=list)
+    llm_hints: Union[Dict[str, Any], str] = field(default_factory=dict)
+
+    # Processing metadata (not uploaded)
+    processing_stats: Dict[str, Any] = field(default_factory=dict)
+    partition_stats: Optional[List[Dict[str, Any]]] = None
+    # Latest datetime value in the data: {"latestValue", "latestColumn", "earliestValue"}
+    data_freshness: Optional[Dict[str, str]] = None
+
+    # camelCase key -> attribute, in output order
+    KEYS = {
+        "originalFileName": "original_file_name",
+        "recordCount": "record_count",
+        "columnsArray": "columns_array",
+        "detailedColumnInfo": "detailed_column_info",
+        "columnSemanticsConcatenated": "column_semantics_concatenated",
+        "dataLastModifiedAt": "data_last_modified_at",
+        "metadataCreatedAt": "metadata_created_at",
+        "tableName": "table_name",
+        "athenaTableName": "athena_table_name",
+        "zone": "zone",
+        "format": "format",
+        "description": "description",
+        "businessPurpose": "business_purpose",
+        "tags": "tags",
+        "dataOwner": "data_owner",
+        "sourceSystem": "source_system",
+        "answerableQuestions": "answerable_questions",
+        "llmHints": "llm_hints",
+        "processingStats": "processing_stats",
+        "partitionStats": "partition_stats",
+        "dataFreshness": "data_freshness"
+    }
+
+    def __post_init__(self):
+        errors = []
+        if not isinstance(self.table_name, str) or not self.table_name:
+            errors.append("Missing required field: tableName")
+        if not isinstance(self.original_file_name, str) or not self.original_file_name:
+            errors.append("Missing required field: originalFileName")
+        if isinstance(self.record_count, bool) or not isinstance(self.record_count, (int, float)):
+            errors.append("Field recordCount must be a number")
+        if not isinstance(self.columns_array, list):
+            errors.append("Field columnsArray must be a list")
+        if not isinstance(self.detailed_column_info, (DetailedColumnInfo, str)):
+            errors.append("Field detailedColumnInfo must be DetailedColumnInfo or a JSON string")
+        if self.zone not in VALID_ZONES:
+            errors.append(f"Zone must be one of: {list(VALID_ZONES)}")
+        if errors:
+            raise ProfileValidationError(errors)
+
+        self.record_count = int(self.record_count)
+        if isinstance(self.tags, str):
+            self.tags = [self.tags]
+
+    @property
+    def success(self) -> bool:
+        """Profiles only exist for successful extractions."""
+        return True
+
+    @property
+    def column_count(self) -> int:
+        return len(self.columns_array)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read access by camelCase key (e.g. 'tableName')."""
+        if key == "success":
+            return True
+        attribute = self.KEYS.get(key)
+        if attribute is None:
+            return default
+        value = getattr(self, attribute)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key != "success" and key not in self.KEYS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key == "success" or key in self.KEYS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """camelCase dictionary (the complete metadata shape), JSON-compatible."""
+        result = {}
+        for key, attribute in self.KEYS.items():
+            value = getattr(self, attribute)
+            if key in ("partitionStats", "dataFreshness") and value is None:
+                continue
+            if isinstance(value, DetailedColumnInfo):
+                value = value.to_dict()
+            result[key] = value
+        result["success"] = True
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DatasetProfile':
+        """
+        Build (and validate) a profile from a camelCase metadata dictionary.
+
+        Args:
+            data: Metadata dictionary; structured fields may be objects or JSON text
+
+        Returns:
+            DatasetProfile
+
+        Raises:
+            ProfileValidationError: If required fields are missing or invalid
+        """
+        values = {attribute: data[key] for key, attribute in cls.KEYS.items() if data.get(key) is not None}
+        if isinstance(values.get("tags"), str):
+            try:
+                tags = json.loads(values["tags"])
+                values["tags"] = tags if isinstance(tags, list) else [values["tags"]]
+            except json.JSONDecodeError:
+                values["tags"] = [values["tags"]]
+        detailed = values.get("detailed_column_info")
+        if isinstance(detailed, dict):
+            values["detailed_column_info"] = DetailedColumnInfo.from_dict(detailed)
+
+        missing = [
+            key for key in ("tableName", "originalFileName", "recordCount", "columnsArray", "detailedColumnInfo")
+            if cls.KEYS[key] not in values
+        ]
+        if missing:
+            raise ProfileValidationError([f"Missing required field: {key}" for key in missing])
+        return cls(**values)
+
+    def to_weaviate_properties(self) -> Dict[str, Any]:
+        """
+        DatasetMetadata properties, with structured fields serialized (once) to
+        compact JSON.
+
+        Returns:
+            Weaviate-ready properties dictionary
+        """
+        detailed = self.detailed_column_info
+        if isinstance(detailed, DetailedColumnInfo):
+            detailed = detailed.to_dict()
+        now = datetime.now(timezone.utc).isoformat()
+
+        return {
+            # Core identity
+            "tableName": self.table_name,
+            "originalFileName": self.original_file_name,
+            "athenaTableName": self.athena_table_name,
+            "zone": self.zone,
+            "format": self.format,
+
+            # Semantic content
+            "description": self.description,
+            "businessPurpose": self.business_purpose,
+            "tags": [str(tag) for tag in self.tags],
+            "columnSemanticsConcatenated": self.column_semantics_concatenated,
+
+            # Structure
+            "columnsArray": self.columns_array,
+            "detailedColumnInfo": ensure_json_string(detailed, '{}'),
+            "recordCount": self.record_count,
+
+            # Governance
+            "dataOwner": self.data_owner,
+            "sourceSystem": self.source_system,
+
+            # Timestamps
+            "metadataCreatedAt": self.metadata_created_at or now,
+            "dataLastModifiedAt": self.data_last_modified_at or now,
+
+            # LLM enhancement
+            "llmHints": ensure_json_string(self.llm_hints, '{}'),
+            "answerableQuestions": ensure_json_string(self.answerable_questions, '[]')
+        }
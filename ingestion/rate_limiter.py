@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter for Weaviate Knowledge Base
+
+Every object written to a text2vec-aws collection (DatasetMetadata, DomainTag)
+makes Weaviate call Bedrock, and Bedrock accounts throttle at a rate nobody
+configured here. Instead of fixed sleeps and truncation guesses, writes draw
+tokens (one per object) from a token bucket whose refill rate adapts AIMD
+style, like TCP congestion control:
+
+- additive increase: each request answered in time raises the rate by
+  additive_increase objects per second
+- multiplicative decrease: a timeout, throttling error, or a request slower
+  than target_latency multiplies the rate by decrease_factor, at most once per
+  cooldown so one burst of failures counts as a single congestion signal
+
+The rate therefore settles just below what the Bedrock account sustains. The
+current rate and counters are exposed by metrics().
+
+Usage:
+    from ingestion.rate_limiter import AdaptiveRateLimiter
+    limiter = AdaptiveRateLimiter(initial_rate=2.0)
+    limiter.acquire(len(batch))
+    started = time.monotonic()
+    ... insert ...
+    limiter.record_success(time.monotonic() - started)   # or limiter.record_overload()
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, Callable
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with an AIMD-adapted refill rate (tokens per second)."""
+
+    def __init__(self, initial_rate: float = 2.0, min_rate: float = 0.1, max_rate: float = 100.0,
+                 additive_increase: float = 0.5, decrease_factor: float = 0.5,
+                 target_latency: float = 10.0, burst: float = 1.0, cooldown: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize adaptive rate limiter.
+
+        Args:
+            initial_rate: Starting rate in tokens (objects) per second
+            min_rate: Lower bound of the rate
+            max_rate: Upper bound of the rate
+            additive_increase: Rate added after each request answered within target_latency
+            decrease_factor: Rate multiplier on timeouts, throttling or slow requests
+            target_latency: Request latency (seconds) above which the rate is decreased
+            burst: Tokens the bucket holds while idle, in seconds of the current rate
+            cooldown: Minimum seconds between two decreases
+            clock: Monotonic clock (injectable for tests)
+        """
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= initial_rate <= max_rate")
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"decrease_factor must be between 0 and 1: {decrease_factor}")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.target_latency = target_latency
+        self.burst = burst
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._rate = initial_rate
+        self._tokens = initial_rate * burst
+        self._updated = clock()
+        self._last_decrease = float('-inf')
+        self._stats = {"acquired": 0, "waited_seconds": 0.0, "increases": 0, "decreases": 0,
+                       "overloads": 0, "slow_requests": 0, "min_rate_seen": initial_rate,
+                       "max_rate_seen": initial_rate}
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in tokens per second."""
+        return self._rate
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (the bucket may go into debt) and return how long to wait for them."""
+        with self._lock:
+            now = self.clock()
+            capacity = max(self._rate * self.burst, 1.0)
+            self._tokens = min(self._tokens + (now - self._updated) * self._rate, capacity)
+            self._updated = now
+            self._tokens -= tokens
+            wait = max(-self._tokens / self._rate, 0.0)
+            self._stats["acquired"] += tokens
+            self._stats["waited_seconds"] += wait
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until tokens are available.
+
+        Args:
+            tokens: Tokens to take (objects about to be vectorized)
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Wait (without blocking the event loop) until tokens are available."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _set_rate(self, rate: float) -> None:
+        self._rate = min(max(rate, self.min_rate), self.max_rate)
+        self._stats["min_rate_seen"] = min(self._stats["min_rate_seen"], self._rate)
+        self._stats["max_rate_seen"] = max(self._stats["max_rate_seen"], self._rate)
+
+    def _decrease(self) -> None:
+        now = self.clock()
+        if now - self._last_decrease >= self.cooldown:
+            self._last_decrease = now
+            self._set_rate(self._rate * self.decrease_factor)
+            self._stats["decreases"] += 1
+
+    def record_success(self, latency: float) -> None:
+        """
+        Feed back a request that succeeded.
+
+        Args:
+            latency: Seconds the request took; above target_latency it counts
+                as congestion, otherwise the rate is increased
+        """
+        with self._lock:
+            if latency > self.target_latency:
+                self._stats["slow_requests"] += 1
+                self._decrease()
+            else:
+                self._set_rate(self._rate + self.additive_increase)
+                self._stats["increases"] += 1
+
+    def record_overload(self) -> None:
+        """Feed back a timeout or throttling error."""
+        with self._lock:
+            self._stats["overloads"] += 1
+            self._decrease()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current rate and counters."""
+        with self._lock:
+            return {
+                "rate_per_second": round(self._rate, 3),
+                **{key: round(value, 3) if isinstance(value, float) else value
+                   for key, value in self._stats.items()}
+            }
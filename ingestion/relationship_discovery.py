@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Relationship Discovery for Weaviate Knowledge Base
+
+relationships_config.yaml is maintained by hand. This module proposes
+relationships from the data itself, without joining tables:
+
+1. One pass over every dataset builds a signature per candidate column: row
+   and null counts, a HyperLogLog distinct count, a bottom-k sample of value
+   hashes (a uniform sample of the distinct values) and the numeric range.
+2. Columns whose distinct count equals their non-null count are unique-key
+   candidates. A second pass reads only those columns into Bloom filters.
+3. Each other column is tested for inclusion in each key by probing the key's
+   Bloom filter with the column's hash sample. Every probe is O(1), so the
+   cost grows with the number of columns, not with the row counts of the
+   column pairs.
+
+Containment, agreement between the column name and the target table, and
+cardinality (one-to-one vs many-to-one) give each candidate a confidence.
+Results use the `relationships:` shape of relationships_config.yaml.
+
+Usage:
+    from ingestion.relationship_discovery import RelationshipDiscovery
+    discovery = RelationshipDiscovery()
+    discovery.add_csv('raw_customer_master', 'data_sources/raw/Customer.csv')
+    discovery.add_csv('raw_move_orders', 'data_sources/raw/Move.csv')
+    relationships = discovery.discover()
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ingestion.semantic_types import DATE_TEXT_PATTERN
+from ingestion.sketches import HyperLogLog, hash_series
+
+
+class BloomFilter:
+    """Bloom filter over 64-bit value hashes (double hashing for the probes)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            capacity: Expected number of distinct values
+            false_positive_rate: Target false-positive rate at capacity
+        """
+        capacity = max(int(capacity), 1)
+        self.size = max(int(-capacity * np.log(false_positive_rate) / np.log(2) ** 2), 64)
+        self.hash_count = max(int(round(self.size / capacity * np.log(2))), 1)
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.false_positive_rate = false_positive_rate
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Bit positions of every hash, shape (len(hashes), hash_count)."""
+        hashes = hashes.astype(np.uint64, copy=False)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        probes = np.arange(self.hash_count, dtype=np.uint64)
+        return ((low[:, None] + probes[None, :] * high[:, None]) % np.uint64(self.size)).astype(np.int64)
+
+    def add_hashes(self, hashes: np.ndarray, batch_size: int = 1 << 18) -> None:
+        """Add uint64 hashes (in batches, to bound the probe matrix)."""
+        for start in range(0, len(hashes), batch_size):
+            positions = self._positions(hashes[start:start + batch_size]).ravel()
+            np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean array: True where a hash is (probably) in the filter."""
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(hashes)
+        return ((self.bits[positions >> 3] >> (positions & 7)) & 1).all(axis=1).astype(bool)
+
+
+@dataclass
+class ColumnSignature:
+    """One-pass summary of a candidate key column."""
+
+    table_name: str
+    column: str
+    sample_size: int = 1024
+    row_count: int = 0
+    value_count: int = 0
+    numeric: Optional[bool] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    hll: HyperLogLog = field(default_factory=HyperLogLog)
+    # Smallest distinct hashes seen (bottom-k): a uniform sample of the distinct values
+    sample: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))
+
+    def update(self, values: pd.Series) -> None:
+        """Add one chunk of column values."""
+        self.row_count += len(values)
+        values = values.dropna()
+        if values.empty:
+            return
+        self.value_count += len(values)
+
+        is_numeric = pd.api.types.is_numeric_dtype(values.dtype)
+        self.numeric = is_numeric if self.numeric is None else self.numeric and is_numeric
+        if is_numeric:
+            self.min_value = float(values.min()) if self.min_value is None else min(self.min_value, float(values.min()))
+            self.max_value = float(values.max()) if self.max_value is None else max(self.max_value, float(values.max()))
+
+        hashes = hash_series(values)
+        self.hll.add_hashes(hashes)
+        if not self.sample_is_complete:
+            # Only hashes below the current k-th smallest can enter the sample
+            hashes = hashes[hashes < self.sample[-1]]
+        self.sample = np.union1d(self.sample, self._smallest_distinct(hashes))[:self.sample_size]
+
+    def _smallest_distinct(self, hashes: np.ndarray) -> np.ndarray:
+        """The sample_size smallest distinct hashes, without sorting the whole chunk."""
+        pool = 8 * self.sample_size
+        if len(hashes) > pool:
+            cutoff = np.partition(hashes, pool)[pool]
+            candidates = np.unique(hashes[hashes <= cutoff])
+            if len(candidates) >= self.sample_size:
+                return candidates[:self.sample_size]
+        return np.unique(hashes)[:self.sample_size]
+
+    @property
+    def sample_is_complete(self) -> bool:
+        """True if the sample holds every distinct value of the column."""
+        return len(self.sample) < self.sample_size
+
+    @property
+    def distinct_count(self) -> int:
+        if self.sample_is_complete:
+            return len(self.sample)
+        return self.hll.estimate()
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Distinct count matches the non-null count (exactly for small columns,
+        within HyperLogLog error otherwise).
+        """
+        if self.value_count == 0:
+            return False
+        if self.sample_is_complete:
+            return self.distinct_count == self.value_count
+        # About three standard errors of a precision-12 HyperLogLog
+        return self.distinct_count >= self.value_count * (1 - 3 * 1.04 / np.sqrt(len(self.hll.registers)))
+
+
+class RelationshipDiscovery:
+    """Proposes primary-key / foreign-key relationships between datasets."""
+
+    def __init__(self, sample_size: int = 1024, min_distinct: int = 5,
+                 min_confidence: float = 0.7, false_positive_rate: float = 0.001,
+                 chunk_rows: int = 100_000):
+        """
+        Initialize relationship discovery.
+
+        Args:
+            sample_size: Distinct value hashes kept per column (bottom-k sample)
+            min_distinct: Columns with fewer distinct values are not tested (flags
+                and codes are contained in almost any integer key)
+            min_confidence: Candidates below this confidence are dropped
+            false_positive_rate: Bloom filter false-positive rate for key columns
+            chunk_rows: Rows per chunk when reading CSV files
+        """
+        self.sample_size = sample_size
+        self.min_distinct = min_distinct
+        self.min_confidence = min_confidence
+        self.false_positive_rate = false_positive_rate
+        self.chunk_rows = chunk_rows
+        # table name -> function yielding chunks of the requested columns
+        self.sources: Dict[str, Callable[[Optional[List[str]]], Iterator[pd.DataFrame]]] = {}
+        self.signatures: Dict[str, Dict[str, ColumnSignature]] = {}
+
+    @staticmethod
+    def is_candidate(values: pd.Series) -> bool:
+        """Integer-valued and text columns can be keys; floats, dates and flags cannot."""
+        dtype = values.dtype
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+            return False
+        present = values.dropna()
+        if pd.api.types.is_float_dtype(dtype):
+            return bool((present == np.floor(present)).all())
+        if pd.api.types.is_integer_dtype(dtype):
+            return True
+        if pd.api.types.is_string_dtype(dtype) or dtype == object:
+            # Timestamps read as text are unique per row but are not keys
+            return not present.iloc[:100].astype(str).str.fullmatch(DATE_TEXT_PATTERN).all()
+        return False
+
+    def add_source(self, table_name: str,
+                   read_chunks: Callable[[Optional[List[str]]], Iterator[pd.DataFrame]],
+                   columns: Optional[Sequence[str]] = None) -> None:
+        """
+        Register a dataset and build the signatures of its candidate columns.
+
+        Args:
+            table_name: Table name used in the relationships output
+            read_chunks: Function returning an iterator of DataFrame chunks for a
+                list of columns (None: all columns); called again for key columns
+            columns: Columns to consider (default: all candidate columns)
+        """
+        signatures = {}
+        rejected = set()
+        for chunk in read_chunks(list(columns) if columns is not None else None):
+            for column in chunk.columns:
+                if column in rejected:
+                    continue
+                if chunk[column].notna().any() and not self.is_candidate(chunk[column]):
+                    rejected.add(column)
+                    signatures.pop(column, None)
+                    continue
+                signature = signatures.get(column)
+                if signature is None:
+                    signature = signatures[column] = ColumnSignature(table_name, column, self.sample_size)
+                signature.update(chunk[column])
+
+        self.sources[table_name] = read_chunks
+        self.signatures[table_name] = {
+            column: signature for column, signature in signatures.items() if signature.value_count
+        }
+        print(f"🔎 Signatures built for {table_name}: {len(self.signatures[table_name])} candidate columns")
+
+    def add_dataframe(self, table_name: str, df: pd.DataFrame,
+                      columns: Optional[Sequence[str]] = None) -> None:
+        """Register an in-memory dataset."""
+        def read_chunks(selected: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+            yield df if selected is None else df[selected]
+        self.add_source(table_name, read_chunks, columns)
+
+    def add_csv(self, table_name: str, file_path: Any, columns: Optional[Sequence[str]] = None,
+                encoding: str = 'utf-8') -> None:
+        """Register a CSV file; it is read in chunks of chunk_rows rows."""
+        def read_chunks(selected: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+            with pd.read_csv(file_path, encoding=encoding, usecols=selected,
+                             chunksize=self.chunk_rows) as reader:
+                yield from reader
+        self.add_source(table_name, read_chunks, columns)
+
+    def add_file(self, table_name: str, file_path: Any, file_format: str = 'CSV',
+                 columns: Optional[Sequence[str]] = None, encoding: str = 'utf-8') -> None:
+        """
+        Register a CSV, Parquet or Feather file.
+
+        Args:
+            table_name: Table name used in the relationships output
+            file_path: Path to the file
+            file_format: Dataset format as declared in the YAML (CSV, Parquet, Feather)
+            columns: Columns to consider (default: all candidate columns)
+            encoding: Text encoding of CSV files
+        """
+        file_format = file_format.lower()
+        if file_format == 'parquet':
+            self.add_source(table_name, lambda selected: iter([pd.read_parquet(file_path, columns=selected)]), columns)
+        elif file_format in ('feather', 'arrow'):
+            self.add_source(table_name, lambda selected: iter([pd.read_feather(file_path, columns=selected)]), columns)
+        else:
+            self.add_csv(table_name, file_path, columns, encoding)
+
+    def key_candidates(self) -> List[ColumnSignature]:
+        """Unique, non-empty columns with enough distinct values to be keys."""
+        return [
+            signature
+            for signatures in self.signatures.values()
+            for signature in signatures.values()
+            if signature.is_unique and signature.distinct_count >= self.min_distinct
+        ]
+
+    def build_key_filters(self, keys: List[ColumnSignature]) -> Dict[tuple, BloomFilter]:
+        """Second pass: Bloom filters for key columns, reading only those columns."""
+        filters = {}
+        by_table: Dict[str, List[ColumnSignature]] = {}
+        for key in keys:
+            by_table.setdefault(key.table_name, []).append(key)
+
+        for table_name, table_keys in by_table.items():
+            for key in table_keys:
+                filters[(table_name, key.column)] = BloomFilter(key.distinct_count, self.false_positive_rate)
+            for chunk in self.sources[table_name]([key.column for key in table_keys]):
+                for key in table_keys:
+                    filters[(table_name, key.column)].add_hashes(hash_series(chunk[key.column]))
+        return filters
+
+    @staticmethod
+    def _name_tokens(name: str) -> set:
+        """Lowercase word tokens of a table or column name (camelCase and snake_case)."""
+        words = re.findall(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+', name)
+        return {word.lower().rstrip('s') for word in words if len(word) >= 3}
+
+    def name_score(self, column: ColumnSignature, key: ColumnSignature) -> float:
+        """
+        How well the referencing column's name points at the key's table.
+
+        Returns:
+            1.0 if the name (minus its ID suffix) names the key's table, 0.0 for
+            a table's own surrogate key (a bare ID column), 0.5 otherwise
+        """
+        stem = re.sub(r'_?(?:ID|Id|id)$', '', column.column)
+        if not stem:
+            return 0.0
+        if self._name_tokens(stem) & self._name_tokens(key.table_name):
+            return 1.0
+        return 0.5
+
+    def test_inclusion(self, column: ColumnSignature, key: ColumnSignature,
+                       key_filter: BloomFilter) -> Optional[float]:
+        """
+        Estimated share of the column's distinct values found in the key.
+
+        Returns:
+            Containment in [0, 1], or None if the pair is ruled out up front
+        """
+        if column.numeric != key.numeric:
+            return None
+        if column.numeric and (column.min_value < key.min_value or column.max_value > key.max_value):
+            return None
+        if column.distinct_count > key.distinct_count * 1.05:
+            return None
+        hits = float(key_filter.contains(column.sample).mean())
+        fpr = key_filter.false_positive_rate
+        return max(0.0, min(1.0, (hits - fpr) / (1 - fpr)))
+
+    def discover(self) -> List[Dict[str, Any]]:
+        """
+        Find candidate relationships between all registered datasets.
+
+        Returns:
+            Relationship dictionaries in the relationships_config.yaml shape, with
+            a confidence score and the evidence behind it, best first
+        """
+        keys = self.key_candidates()
+        filters = self.build_key_filters(keys)
+        print(f"🔑 {len(keys)} unique-key candidates across {len(self.signatures)} datasets")
+
+        relationships = []
+        for table_name, signatures in self.signatures.items():
+            for column in signatures.values():
+                if column.distinct_count < self.min_distinct:
+                    continue
+                best = None
+                for key in keys:
+                    if key.table_name == table_name:
+                        continue
+                    containment = self.test_inclusion(column, key, filters[(key.table_name, key.column)])
+                    if containment is None:
+                        continue
+                    name_score = self.name_score(column, key)
+                    confidence = round(containment * (0.5 + 0.5 * name_score), 3)
+                    if confidence >= self.min_confidence and (best is None or confidence > best[0]):
+                        best = (confidence, containment, name_score, key)
+                if best is not None:
+                    relationships.append(self.describe(column, *best))
+
+        relationships.sort(key=lambda relationship: -relationship["confidence"])
+        print(f"🔗 Discovered {len(relationships)} candidate relationships")
+        return relationships
+
+    @staticmethod
+    def describe(column: ColumnSignature, confidence: float, containment: float,
+                 name_score: float, key: ColumnSignature) -> Dict[str, Any]:
+        """Relationship entry in the relationships_config.yaml shape."""
+        cardinality = "one-to-one" if column.is_unique else "many-to-one"
+        complete = containment >= 0.999 and column.value_count == column.row_count
+        return {
+            "relationship_name": f"{column.table_name}_{column.column}_to_{key.table_name}".lower(),
+            "from_table": column.table_name,
+            "from_column": column.column,
+            "to_table": key.table_name,
+            "to_column": key.column,
+            "relationship_type": "foreign_key",
+            "cardinality": cardinality,
+            "suggested_join_type": "INNER" if complete else "LEFT",
+            "business_meaning": (
+                f"Discovered from data: about {containment:.0%} of the distinct "
+                f"{column.table_name}.{column.column} values appear in "
+                f"{key.table_name}.{key.column} ({cardinality})."
+            ),
+            "confidence": confidence,
+            "evidence": {
+                "containment": round(containment, 4),
+                "name_match": name_score,
+                "from_distinct": column.distinct_count,
+                "to_distinct": key.distinct_count,
+                "from_null_count": column.row_count - column.value_count
+            }
+        }
+
+    @staticmethod
+    def write_yaml(relationships: List[Dict[str, Any]], output_path: Any) -> Path:
+        """
+        Write discovered relationships as a relationships config file for review.
+
+        Args:
+            relationships: Output of discover()
+            output_path: YAML file to write
+
+        Returns:
+            Path of the written file
+        """
+        output_path = Path(output_path)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("# Relationships discovered from the data - review before merging into\n")
+            f.write("# relationships_config.yaml\n\n")
+            yaml.safe_dump({"relationships": relationships}, f, sort_keys=False, allow_unicode=True)
+        return output_path
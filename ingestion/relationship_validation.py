@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Relationship Validation for Weaviate Knowledge Base
+
+Executes the `validation_rules` of relationships_config.yaml (orphaned
+foreign keys, snapshot coverage, ...) against the dataset files before they
+are uploaded, and compares each result with the rule's expected_result.
+
+Two engines are available:
+- DuckDB (pip install duckdb), when installed: every dataset is registered as
+  a view over its file and the rule's validation_sql runs unchanged. DuckDB
+  streams the files and spills to disk, so memory stays within memory_limit.
+- A pandas fallback for the COUNT(*) rules used in relationships_config.yaml:
+  plain row counts, INNER JOIN counts and LEFT JOIN ... IS NULL orphan counts,
+  alone or as scalar subqueries. Joins are vectorized hash joins: the join key
+  of one side is reduced to sorted unique hashes with their multiplicities,
+  and the other side is streamed in chunks and probed with searchsorted.
+  Memory is bounded by the distinct keys of the build side, not by file size.
+  Other SQL is reported as skipped.
+
+Usage:
+    from ingestion.relationship_validation import RelationshipValidator
+    validator = RelationshipValidator({'raw_move_orders': {'path': 'data_sources/raw/Move.csv'}})
+    results = validator.validate(relationships_config)
+"""
+
+import re
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ingestion.sketches import hash_series
+
+# Optional embedded SQL engine (pip install duckdb)
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+VALIDATION_POLICIES = ('warn', 'fail', 'off')
+
+# SELECT COUNT(*) [AS a] FROM t [x] [LEFT|INNER JOIN u [y] ON x.c = y.d] [WHERE ...]
+_NOT_KEYWORD = r'(?!(?:LEFT|INNER|JOIN|WHERE|ON)\b)'
+COUNT_QUERY = re.compile(
+    r'^\s*SELECT\s+COUNT\(\s*\*\s*\)(?:\s+AS\s+(?P<alias>\w+))?'
+    r'\s+FROM\s+(?P<left>\w+)(?:\s+(?:AS\s+)?' + _NOT_KEYWORD + r'(?P<left_alias>\w+))?'
+    r'(?:\s+(?P<join>LEFT|INNER)\s+(?:OUTER\s+)?JOIN\s+(?P<right>\w+)'
+    r'(?:\s+(?:AS\s+)?' + _NOT_KEYWORD + r'(?P<right_alias>\w+))?'
+    r'\s+ON\s+(?P<on_a>\w+)\.(?P<on_a_col>\w+)\s*=\s*(?P<on_b>\w+)\.(?P<on_b_col>\w+))?'
+    r'(?P<where>\s+WHERE\s+.+?)?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+IS_NULL = re.compile(r'(\w+)\.(\w+)\s+IS\s+(NOT\s+)?NULL', re.IGNORECASE)
+SCALAR_ALIAS = re.compile(r'\s*(?:AS\s+)?(\w+)', re.IGNORECASE)
+
+
+class UnsupportedRuleError(ValueError):
+    """Raised when the pandas engine cannot evaluate a rule's SQL."""
+
+
+class RelationshipValidator:
+    """Runs relationships_config.yaml validation rules against dataset files."""
+
+    def __init__(self, tables: Dict[str, Dict[str, Any]], engine: Optional[str] = None,
+                 memory_limit: str = '2GB', chunk_rows: int = 500_000):
+        """
+        Initialize relationship validator.
+
+        Args:
+            tables: Table name -> {"path", "format" (CSV/Parquet/Feather), "encoding"}
+            engine: "duckdb" or "pandas" (default: duckdb when installed)
+            memory_limit: DuckDB memory limit; larger joins spill to disk
+            chunk_rows: Rows per chunk for the pandas engine
+        """
+        if engine is None:
+            engine = 'duckdb' if DUCKDB_AVAILABLE else 'pandas'
+        if engine not in ('duckdb', 'pandas'):
+            raise ValueError(f"Unknown validation engine: {engine}")
+        if engine == 'duckdb' and not DUCKDB_AVAILABLE:
+            print(f"⚠️  duckdb not installed - using pandas validation engine")
+            engine = 'pandas'
+        self.engine = engine
+        self.tables = tables
+        self.memory_limit = memory_limit
+        self.chunk_rows = chunk_rows
+        self._key_index: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def validate(self, relationships_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run every validation rule of a relationships configuration.
+
+        Args:
+            relationships_config: Parsed relationships_config.yaml
+
+        Returns:
+            One result per rule: rule_name, status (passed, failed, info, skipped,
+            error), result values, expected_result and a message
+        """
+        rules = relationships_config.get('validation_rules', []) or []
+        print(f"\n🧪 Running {len(rules)} relationship validation rules ({self.engine} engine)...")
+
+        connection = self._connect() if self.engine == 'duckdb' and rules else None
+        results = []
+        try:
+            for rule in rules:
+                result = self.run_rule(rule, connection)
+                results.append(result)
+                icon = {"passed": "✅", "failed": "❌", "info": "ℹ️ ", "skipped": "⏭️ ", "error": "⚠️ "}[result["status"]]
+                print(f"   {icon} {result['rule_name']}: {result['message']}")
+        finally:
+            if connection is not None:
+                connection.close()
+            self._key_index.clear()
+        return results
+
+    def run_rule(self, rule: Dict[str, Any], connection: Any = None) -> Dict[str, Any]:
+        """
+        Run one validation rule and compare its result with expected_result.
+
+        Args:
+            rule: Rule with rule_name, validation_sql and expected_result
+            connection: DuckDB connection (duckdb engine only)
+
+        Returns:
+            Result dictionary (see validate)
+        """
+        sql = rule.get('validation_sql', '')
+        result = {
+            "rule_name": rule.get('rule_name', 'unnamed_rule'),
+            "description": rule.get('description', ''),
+            "expected_result": rule.get('expected_result'),
+            "result": None,
+            "status": "error",
+            "message": ""
+        }
+
+        missing = sorted(self.referenced_tables(sql) - set(self.tables))
+        if missing:
+            result["status"] = "skipped"
+            result["message"] = f"Unknown tables: {', '.join(missing)}"
+            return result
+
+        try:
+            if self.engine == 'duckdb':
+                values = self._run_duckdb(sql, connection)
+            else:
+                values = self._run_pandas(sql)
+        except UnsupportedRuleError as e:
+            result["status"] = "skipped"
+            result["message"] = str(e)
+            return result
+        except Exception as e:
+            result["message"] = f"Error running rule: {e}"
+            return result
+
+        result["result"] = values
+        result["status"], result["message"] = self.compare(values, rule.get('expected_result'))
+        return result
+
+    @staticmethod
+    def referenced_tables(sql: str) -> set:
+        """Table names following FROM or JOIN in a SQL statement."""
+        return set(re.findall(r'\b(?:FROM|JOIN)\s+(\w+)', sql, re.IGNORECASE))
+
+    @staticmethod
+    def compare(values: Dict[str, Any], expected: Any) -> Tuple[str, str]:
+        """
+        Compare rule output with expected_result.
+
+        A numeric expectation is compared with the single value the
+        rule returned; text expectations describe a manual check, so the values
+        are reported for information only.
+
+        Returns:
+            Tuple of (status, message)
+        """
+        summary = ", ".join(f"{name}={value}" for name, value in values.items())
+        if isinstance(expected, (int, float)):
+            if len(values) != 1:
+                return "error", f"Expected a single value, got {summary}"
+            actual = next(iter(values.values()))
+            if actual == expected:
+                return "passed", summary
+            return "failed", f"{summary} (expected {expected})"
+        return "info", f"{summary} (expected: {expected})" if expected is not None else summary
+
+    # DuckDB engine
+
+    def _connect(self) -> Any:
+        """DuckDB connection with one view per dataset file."""
+        connection = duckdb.connect()
+        connection.execute(f"SET memory_limit = '{self.memory_limit}'")
+        for table_name, table in self.tables.items():
+            path = str(table["path"]).replace("'", "''")
+            file_format = table.get("format", "CSV").lower()
+            if file_format == 'parquet':
+                source = f"read_parquet('{path}')"
+            elif file_format in ('feather', 'arrow'):
+                # No native Feather reader; Arrow tables are scanned in batches
+                connection.register(f"{table_name}__arrow", _read_feather_dataset(table["path"]))
+                connection.execute(f'CREATE VIEW "{table_name}" AS SELECT * FROM "{table_name}__arrow"')
+                continue
+            else:
+                encoding = (table.get("encoding") or 'utf-8').lower().replace('_', '-')
+                options = "" if encoding in ('utf-8', 'utf-8-sig', 'ascii') else f", encoding='{encoding}'"
+                source = f"read_csv_auto('{path}', header=true{options})"
+            connection.execute(f'CREATE VIEW "{table_name}" AS SELECT * FROM {source}')
+        return connection
+
+    @staticmethod
+    def _run_duckdb(sql: str, connection: Any) -> Dict[str, Any]:
+        cursor = connection.execute(sql)
+        row = cursor.fetchone()
+        names = [column[0] for column in cursor.description]
+        return {name: _plain(value) for name, value in zip(names, row or [None] * len(names))}
+
+    # pandas engine
+
+    def _run_pandas(self, sql: str) -> Dict[str, Any]:
+        """Evaluate a COUNT(*) query, or a SELECT of scalar COUNT(*) subqueries."""
+        sql = sql.strip().rstrip(';')
+        subqueries = _scalar_subqueries(sql)
+        if subqueries:
+            return {alias: self._count(query) for alias, query in subqueries}
+        match = COUNT_QUERY.match(sql)
+        if not match:
+            raise UnsupportedRuleError("SQL not supported by the pandas engine (install duckdb)")
+        return {match.group('alias') or 'count': self._count(sql)}
+
+    def _count(self, sql: str) -> int:
+        match = COUNT_QUERY.match(sql)
+        if not match:
+            raise UnsupportedRuleError("SQL not supported by the pandas engine (install duckdb)")
+
+        left, right = match.group('left'), match.group('right')
+        aliases = {left: left, match.group('left_alias') or left: left}
+        if right:
+            aliases.update({right: right, match.group('right_alias') or right: right})
+
+        conditions = []
+        where = match.group('where')
+        if where:
+            clause = re.sub(r'^\s*WHERE\s+', '', where, flags=re.IGNORECASE)
+            for part in re.split(r'\s+AND\s+', clause.strip(), flags=re.IGNORECASE):
+                condition = IS_NULL.fullmatch(part.strip())
+                if not condition or condition.group(1) not in aliases:
+                    raise UnsupportedRuleError(f"WHERE condition not supported by the pandas engine: {part.strip()}")
+                conditions.append((aliases[condition.group(1)], condition.group(2), bool(condition.group(3))))
+
+        if not right:
+            if conditions:
+                raise UnsupportedRuleError("WHERE on a single-table count needs duckdb")
+            return self.row_count(left)
+
+        # Orient the join condition as left.column = right.column
+        sides = {aliases.get(match.group('on_a')): match.group('on_a_col'),
+                 aliases.get(match.group('on_b')): match.group('on_b_col')}
+        if set(sides) != {left, right}:
+            raise UnsupportedRuleError("Join condition must reference both joined tables")
+        left_key, right_key = sides[left], sides[right]
+
+        join = match.group('join').upper()
+        if join == 'INNER':
+            if conditions:
+                raise UnsupportedRuleError("WHERE on an INNER JOIN count needs duckdb")
+            return self.inner_join_count(left, left_key, right, right_key)
+
+        # LEFT JOIN ... WHERE right.key IS NULL [AND left.key IS NOT NULL]: orphans
+        right_null = (right, right_key, False) in conditions
+        other = [condition for condition in conditions if condition not in ((right, right_key, False), (left, left_key, True))]
+        if not right_null or other:
+            raise UnsupportedRuleError("Only LEFT JOIN orphan counts (right key IS NULL) are supported")
+        return self.orphan_count(left, left_key, right, right_key,
+                                 include_null_keys=(left, left_key, True) not in conditions)
+
+    def _chunks(self, table_name: str, columns: List[str]):
+        """Stream chunks of some columns of a dataset."""
+        table = self.tables[table_name]
+        file_format = table.get("format", "CSV").lower()
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(table["path"]).iter_batches(batch_size=self.chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        elif file_format in ('feather', 'arrow'):
+            yield pd.read_feather(table["path"], columns=columns)
+        else:
+            with pd.read_csv(table["path"], usecols=columns, encoding=table.get("encoding") or 'utf-8',
+                             chunksize=self.chunk_rows) as reader:
+                yield from reader
+
+    def row_count(self, table_name: str) -> int:
+        """COUNT(*) of a dataset (uses the record count from extraction when given)."""
+        known = self.tables[table_name].get("record_count")
+        if known is not None:
+            return int(known)
+        return sum(len(chunk) for chunk in self._chunks(table_name, [0]))
+
+    def key_index(self, table_name: str, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build side of a hash join: sorted unique key hashes and their row counts.
+
+        Chunks are reduced to (hash, count) pairs as they are read, so memory is
+        bounded by the number of distinct keys.
+        """
+        cache_key = (table_name, column)
+        if cache_key not in self._key_index:
+            keys = np.empty(0, dtype=np.uint64)
+            counts = np.empty(0, dtype=np.int64)
+            for chunk in self._chunks(table_name, [column]):
+                chunk_keys, chunk_counts = np.unique(hash_series(chunk.iloc[:, 0]), return_counts=True)
+                merged_keys, inverse = np.unique(np.concatenate([keys, chunk_keys]), return_inverse=True)
+                merged_counts = np.zeros(len(merged_keys), dtype=np.int64)
+                np.add.at(merged_counts, inverse, np.concatenate([counts, chunk_counts]))
+                keys, counts = merged_keys, merged_counts
+            self._key_index[cache_key] = (keys, counts)
+        return self._key_index[cache_key]
+
+    def _probe(self, table_name: str, column: str, keys: np.ndarray, counts: np.ndarray):
+        """
+        Stream the probe side of a hash join.
+
+        Yields:
+            Tuple of (rows in chunk, hashes of non-null keys, build-side matches per key)
+        """
+        for chunk in self._chunks(table_name, [column]):
+            hashes = hash_series(chunk.iloc[:, 0])
+            if len(keys) == 0:
+                yield len(chunk), hashes, np.zeros(len(hashes), dtype=np.int64)
+                continue
+            positions = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+            yield len(chunk), hashes, np.where(keys[positions] == hashes, counts[positions], 0)
+
+    def inner_join_count(self, left: str, left_key: str, right: str, right_key: str) -> int:
+        """Rows of left INNER JOIN right ON left_key = right_key."""
+        keys, counts = self.key_index(right, right_key)
+        return int(sum(int(matches.sum()) for _, _, matches in self._probe(left, left_key, keys, counts)))
+
+    def orphan_count(self, left: str, left_key: str, right: str, right_key: str,
+                     include_null_keys: bool = False) -> int:
+        """Rows of left whose key has no match in right (null keys only if include_null_keys)."""
+        keys, counts = self.key_index(right, right_key)
+        orphans = 0
+        for rows, hashes, matches in self._probe(left, left_key, keys, counts):
+            orphans += int((matches == 0).sum())
+            if include_null_keys:
+                orphans += rows - len(hashes)
+        return orphans
+
+
+def _scalar_subqueries(sql: str) -> List[Tuple[str, str]]:
+    """
+    Split "SELECT (SELECT ...) AS a, (SELECT ...) AS b" into (alias, query) pairs.
+
+    Returns:
+        List of (alias, subquery SQL); empty if sql is not of this form
+    """
+    body = re.match(r'^\s*SELECT\s+(.*)$', sql, re.IGNORECASE | re.DOTALL)
+    if not body or not body.group(1).lstrip().startswith('('):
+        return []
+    text = body.group(1)
+    subqueries = []
+    position = 0
+    while position < len(text):
+        while position < len(text) and text[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(text):
+            break
+        if text[position] != '(':
+            return []
+        depth = 0
+        for end in range(position, len(text)):
+            depth += {'(': 1, ')': -1}.get(text[end], 0)
+            if depth == 0:
+                break
+        else:
+            return []
+        query = text[position + 1:end]
+        alias_match = SCALAR_ALIAS.match(text, end + 1)
+        if not alias_match:
+            return []
+        subqueries.append((alias_match.group(1), query))
+        position = alias_match.end()
+    return subqueries
+
+
+def _read_feather_dataset(path: Any) -> Any:
+    import pyarrow.feather as feather
+    return feather.read_table(str(path), memory_map=True)
+
+
+def _plain(value: Any) -> Any:
+    """numpy/Decimal scalars from DuckDB as plain Python numbers."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Retry Policy for Weaviate Knowledge Base
+
+One place that decides whether a failed Weaviate or Bedrock call is worth
+repeating, and when.
+
+Errors are classified from their type and status code first (Weaviate client
+exceptions, gRPC status codes, HTTP status codes, botocore error codes) and
+from their message only when nothing typed is available, e.g. the per-object
+error strings of insert_many:
+
+- throttled: 429, gRPC RESOURCE_EXHAUSTED, Bedrock ThrottlingException
+- transient: timeouts, connection errors, 408/502/503/504, gRPC UNAVAILABLE,
+  DEADLINE_EXCEEDED and ABORTED, Bedrock ModelTimeoutException and
+  ServiceUnavailableException
+- permanent: everything else (invalid input, authentication, 400/401/403/...)
+
+Only throttled and transient errors are retried, with capped exponential
+backoff and full jitter (a delay drawn uniformly from zero to
+min(max_delay, base_delay * 2 ** (attempt - 1))), so that clients failing
+together do not retry together. A call gives up after max_attempts, when the
+next attempt would start after its deadline, or when the run's RetryBudget is
+spent: retries are limited to min_retries plus ratio times the requests made,
+so an outage cannot multiply the load on Weaviate and Bedrock.
+
+Usage:
+    from ingestion.retry_policy import RetryPolicy, RetryBudget
+    policy = RetryPolicy(max_attempts=4, deadline=120.0, budget=RetryBudget())
+    uuid = policy.call(collection.data.insert, properties)
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Union
+
+# Optional dependencies: classification falls back to messages without them
+try:
+    import grpc
+    GRPC_AVAILABLE = True
+except ImportError:
+    GRPC_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from botocore import exceptions as botocore_exceptions
+    BOTOCORE_AVAILABLE = True
+except ImportError:
+    BOTOCORE_AVAILABLE = False
+
+try:
+    from weaviate import exceptions as weaviate_exceptions
+    WEAVIATE_AVAILABLE = True
+except ImportError:
+    WEAVIATE_AVAILABLE = False
+
+# Error classes
+THROTTLED = 'throttled'
+TRANSIENT = 'transient'
+PERMANENT = 'permanent'
+
+THROTTLED_STATUS_CODES = {429}
+TRANSIENT_STATUS_CODES = {408, 502, 503, 504}
+# Weaviate reports vectorizer failures of every kind as 500: the message decides
+UNDETERMINED_STATUS_CODES = {500}
+
+# gRPC status codes by name and by number (UnexpectedStatusCodeError keeps the number)
+THROTTLED_GRPC_CODES = {'RESOURCE_EXHAUSTED': 8}
+TRANSIENT_GRPC_CODES = {'DEADLINE_EXCEEDED': 4, 'ABORTED': 10, 'UNAVAILABLE': 14}
+
+THROTTLED_AWS_CODES = {
+    'ThrottlingException', 'TooManyRequestsException', 'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded', 'Throttling'
+}
+TRANSIENT_AWS_CODES = {
+    'ModelTimeoutException', 'ModelNotReadyException', 'ServiceUnavailableException',
+    'InternalServerException', 'RequestTimeout', 'RequestTimeoutException'
+}
+
+# Message fallbacks, for errors that only exist as text
+STATUS_CODE_PATTERN = re.compile(r'\bstatus(?:[ _]?code)?\s*[:=]?\s*(\d{3})\b', re.IGNORECASE)
+THROTTLED_MARKERS = (
+    'too many requests', 'throttl', 'rate exceeded', 'resource_exhausted', 'resource exhausted'
+)
+TRANSIENT_MARKERS = (
+    'timeout', 'timed out', 'context canceled', 'deadline exceeded', 'deadline_exceeded',
+    'unavailable', 'connection reset', 'connection refused', 'connection aborted', 'broken pipe',
+    'temporarily'
+)
+
+
+def _classify_status_code(status_code: int) -> Optional[str]:
+    """Class of an HTTP status code, or of a gRPC status code number (below 100); None if undetermined."""
+    if status_code < 100:
+        if status_code in THROTTLED_GRPC_CODES.values():
+            return THROTTLED
+        if status_code in TRANSIENT_GRPC_CODES.values():
+            return TRANSIENT
+        return PERMANENT
+    if status_code in THROTTLED_STATUS_CODES:
+        return THROTTLED
+    if status_code in TRANSIENT_STATUS_CODES:
+        return TRANSIENT
+    if status_code in UNDETERMINED_STATUS_CODES:
+        return None
+    return PERMANENT
+
+
+def _classify_exception(error: BaseException) -> Optional[str]:
+    """Class of an exception from its type and status code (None if it has neither)."""
+    if BOTOCORE_AVAILABLE:
+        if isinstance(error, botocore_exceptions.ClientError):
+            code = error.response.get('Error', {}).get('Code', '')
+            if code in THROTTLED_AWS_CODES:
+                return THROTTLED
+            if code in TRANSIENT_AWS_CODES:
+                return TRANSIENT
+            status_code = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            return _classify_status_code(status_code) if status_code else None
+        if isinstance(error, (botocore_exceptions.ConnectionError, botocore_exceptions.HTTPClientError)):
+            return TRANSIENT
+
+    if WEAVIATE_AVAILABLE:
+        if isinstance(error, weaviate_exceptions.UnexpectedStatusCodeError):
+            return _classify_status_code(error.status_code)
+        if isinstance(error, (weaviate_exceptions.WeaviateTimeoutError,
+                              weaviate_exceptions.WeaviateConnectionError,
+                              weaviate_exceptions.WeaviateGRPCUnavailableError)):
+            return TRANSIENT
+        if isinstance(error, (weaviate_exceptions.AuthenticationFailedError,
+                              weaviate_exceptions.InsufficientPermissionsError,
+                              weaviate_exceptions.WeaviateInvalidInputError,
+                              weaviate_exceptions.ObjectAlreadyExistsError)):
+            return PERMANENT
+
+    if GRPC_AVAILABLE and isinstance(error, grpc.RpcError) and callable(getattr(error, 'code', None)):
+        code = error.code()
+        if code is not None:
+            if code.name in THROTTLED_GRPC_CODES:
+                return THROTTLED
+            if code.name in TRANSIENT_GRPC_CODES:
+                return TRANSIENT
+            return PERMANENT
+
+    if HTTPX_AVAILABLE:
+        if isinstance(error, httpx.HTTPStatusError):
+            return _classify_status_code(error.response.status_code)
+        if isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+            return TRANSIENT
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    return None
+
+
+def _classify_message(message: str) -> str:
+    """Class of an error known only by its message."""
+    match = STATUS_CODE_PATTERN.search(message)
+    if match:
+        error_class = _classify_status_code(int(match.group(1)))
+        if error_class is not None:
+            return error_class
+    message = message.lower()
+    if any(marker in message for marker in THROTTLED_MARKERS):
+        return THROTTLED
+    if any(marker in message for marker in TRANSIENT_MARKERS):
+        return TRANSIENT
+    return PERMANENT
+
+
+def classify_error(error: Union[BaseException, str]) -> str:
+    """
+    Classify an error as THROTTLED, TRANSIENT or PERMANENT.
+
+    Args:
+        error: Exception, or the message of an error returned rather than raised
+
+    Returns:
+        Error class
+    """
+    if isinstance(error, BaseException):
+        cause = error
+        while cause is not None:
+            error_class = _classify_exception(cause)
+            if error_class is not None:
+                return error_class
+            cause = cause.__cause__
+        error = str(error)
+    return _classify_message(error)
+
+
+def is_transient_error(error: Union[BaseException, str]) -> bool:
+    """True if an error describes an overloaded or unreachable server (worth retrying)."""
+    return classify_error(error) != PERMANENT
+
+
+class RetryBudget:
+    """Retries allowed per run: min_retries plus ratio times the requests made."""
+
+    def __init__(self, min_retries: int = 10, ratio: float = 0.2):
+        """
+        Initialize retry budget.
+
+        Args:
+            min_retries: Retries allowed regardless of the number of requests
+            ratio: Additional retries allowed per request made
+        """
+        self.min_retries = min_retries
+        self.ratio = ratio
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self, count: int = 1) -> None:
+        """Count first attempts (they earn retry allowance)."""
+        with self._lock:
+            self.requests += count
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it is spent."""
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Requests, retries and the retries still allowed."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "remaining": max(int(self.min_retries + self.ratio * self.requests) - self.retries, 0)
+            }
+
+
+class RetryPolicy:
+    """Classifies failures and schedules retries with capped, fully jittered exponential backoff."""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 20.0,
+                 deadline: Optional[float] = 120.0, budget: Optional[RetryBudget] = None,
+                 clock: Callable[[], float] = time.monotonic, rng: Optional[random.Random] = None):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff cap (seconds) after the first attempt; doubles per attempt
+            max_delay: Upper bound of the backoff cap
+            deadline: Seconds from a call's first attempt after which no attempt starts
+                (None: no deadline)
+            budget: Retry budget shared by the run (None: unlimited)
+            clock: Monotonic clock (injectable for tests)
+            rng: Random source for the jitter (injectable for tests)
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1: {max_attempts}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.budget = budget
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._stats = {"retries": 0, "throttled": 0, "permanent": 0, "attempts_exhausted": 0,
+                       "deadline_exceeded": 0, "budget_exhausted": 0}
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before the attempt following attempt number `attempt`."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self.rng.uniform(0, cap)
+
+    def record_request(self, count: int = 1) -> None:
+        """Count first attempts against the retry budget."""
+        if self.budget:
+            self.budget.record_request(count)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def retry_delay(self, error: Union[BaseException, str], attempt: int, elapsed: float) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            error: The failure (exception or error message)
+            attempt: Number of the attempt that failed (1 for the first)
+            elapsed: Seconds since the call's first attempt started
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        error_class = classify_error(error)
+        if error_class == PERMANENT:
+            self._count("permanent")
+            return None
+        if attempt >= self.max_attempts:
+            self._count("attempts_exhausted")
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            self._count("deadline_exceeded")
+            return None
+        if self.budget and not self.budget.try_spend():
+            self._count("budget_exhausted")
+            return None
+        self._count("retries")
+        if error_class == THROTTLED:
+            self._count("throttled")
+        return delay
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func, retrying retryable failures.
+
+        The deadline is checked between attempts; an attempt in progress is
+        bounded by the client's own timeouts.
+
+        Returns:
+            func's result
+
+        Raises:
+            The last error, once the call gives up
+        """
+        self.record_request()
+        started = self.clock()
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, self.clock() - started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Await func(*args, **kwargs), retrying retryable failures.
+
+        Each attempt is also cancelled when the call's deadline passes.
+
+        Returns:
+            func's result
+
+        Raises:
+            The last error, once the call gives up (TimeoutError at the deadline)
+        """
+        self.record_request()
+        started = self.clock()
+        attempt = 1
+        while True:
+            remaining = None if self.deadline is None else self.deadline - (self.clock() - started)
+            try:
+                return await asyncio.wait_for(func(*args, **kwargs), timeout=remaining)
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, self.clock() - started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Retry counters, and the budget's state when there is one."""
+        with self._lock:
+            metrics = dict(self._stats)
+        if self.budget:
+            metrics["budget"] = self.budget.metrics()
+        return metrics
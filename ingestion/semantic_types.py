@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Semantic Type Detection for Weaviate Knowledge Base
+
+Most columns have no entry in the YAML `columns:` block, so their semanticType
+would stay 'unknown'. This module guesses a semantic type from the column name
+and the values: email addresses, phone numbers, UUIDs, currency amounts, dates,
+boolean flags, and identifier / foreign-key columns.
+
+Only a bounded, evenly spaced sample of rows is inspected (sample_rows), and
+all value checks are vectorized pandas string/numpy operations, so detection
+costs the same per column whatever the row count.
+
+Usage:
+    from ingestion.semantic_types import SemanticTypeDetector
+    detector = SemanticTypeDetector()
+    semantic_types = detector.detect_frame(df)   # {'EmailAddress': 'email_address', ...}
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+import numpy as np
+import pandas as pd
+
+# Detected types (names follow the vocabulary used in the dataset YAML files)
+EMAIL = 'email_address'
+PHONE = 'phone_number'
+UUID = 'uuid'
+CURRENCY = 'financial_amount'
+TIMESTAMP = 'timestamp'
+DATE = 'business_date'
+BOOLEAN = 'boolean_flag'
+IDENTIFIER = 'identifier'
+FOREIGN_KEY = 'foreign_key'
+
+EMAIL_PATTERN = re.compile(r'[^@\s]+@[^@\s]+\.[A-Za-z]{2,}')
+UUID_PATTERN = re.compile(r'\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?')
+PHONE_PATTERN = re.compile(r'\+?[\d\s().-]{7,20}')
+CURRENCY_TEXT_PATTERN = re.compile(r'[-+]?[$€£]\s?-?[\d,]+(?:\.\d+)?')
+DATE_TEXT_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?')
+HEX_ID_PATTERN = re.compile(r'[0-9a-fA-F]{16,40}')
+BOOLEAN_TEXT_VALUES = {'true', 'false', 't', 'f', 'yes', 'no', 'y', 'n'}
+
+# Column name hints
+ID_NAME = re.compile(r'(?:^|[a-z0-9_])(?:ID|Id|id)$')
+CURRENCY_NAME = re.compile(
+    r'amount|amt|cost|price|charge|fee|revenue|deposit|balance|payment|total', re.IGNORECASE
+)
+BOOLEAN_NAME = re.compile(r'^(?:Is|Has|Can|Should)[A-Z_]|^(?:is|has)_')
+
+
+class SemanticTypeDetector:
+    """Guesses semantic types of columns from a bounded sample of their values."""
+
+    def __init__(self, sample_rows: int = 1000, min_values: int = 3, match_ratio: float = 0.95):
+        """
+        Initialize semantic type detector.
+
+        Args:
+            sample_rows: Maximum number of (evenly spaced) rows inspected per frame
+            min_values: Columns with fewer non-null sampled values are not classified
+            match_ratio: Share of sampled values that must match a value pattern
+        """
+        self.sample_rows = sample_rows
+        self.min_values = min_values
+        self.match_ratio = match_ratio
+
+    def sample_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Evenly spaced rows of df, at most sample_rows of them."""
+        if len(df) <= self.sample_rows:
+            return df
+        positions = np.linspace(0, len(df) - 1, self.sample_rows).astype(np.int64)
+        return df.iloc[positions]
+
+    def detect_frame(self, df: pd.DataFrame,
+                     columns: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Detect semantic types for the columns of a DataFrame (or chunk).
+
+        Args:
+            df: DataFrame; only a bounded row sample is inspected
+            columns: Columns to check (default: all)
+
+        Returns:
+            Dictionary of column -> semantic type, for recognised columns only
+        """
+        sample = self.sample_frame(df)
+        first_column = df.columns[0] if len(df.columns) else None
+        detected = {}
+        for column in (df.columns if columns is None else columns):
+            semantic_type = self.detect(column, sample[column], is_first_column=column == first_column)
+            if semantic_type:
+                detected[column] = semantic_type
+        return detected
+
+    def has_enough_values(self, values: pd.Series) -> bool:
+        """True if a (sampled) column holds enough values to be classified."""
+        return int(values.notna().sum()) >= self.min_values
+
+    def detect(self, column_name: str, values: pd.Series,
+               is_first_column: bool = False) -> Optional[str]:
+        """
+        Detect the semantic type of one column from sampled values.
+
+        Args:
+            column_name: Column name (used for ID, currency and flag hints)
+            values: Sampled column values (at most sample_rows of them)
+            is_first_column: The column leads the table (typical primary key position)
+
+        Returns:
+            Semantic type, or None if nothing was recognised
+        """
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf':
+            # Plain numpy columns skip the Series machinery
+            raw = values.to_numpy()
+            if raw.dtype.kind == 'f':
+                raw = raw[~np.isnan(raw)]
+            if len(raw) < self.min_values:
+                return None
+            return self._numeric_type(column_name, raw, is_first_column)
+
+        values = values.dropna()
+        if len(values) < self.min_values:
+            return None
+        dtype = values.dtype
+
+        if pd.api.types.is_bool_dtype(dtype):
+            return BOOLEAN
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return self._date_type(values)
+        if pd.api.types.is_numeric_dtype(dtype):
+            return self._numeric_type(column_name, values.to_numpy(), is_first_column)
+        return self._text_type(column_name, values.astype(str).str.strip(), is_first_column)
+
+    @staticmethod
+    def _date_type(values: pd.Series) -> str:
+        """Dates without a time of day are business dates; others timestamps."""
+        return DATE if (values == values.dt.normalize()).all() else TIMESTAMP
+
+    def _key_type(self, column_name: str, values: pd.Series, is_first_column: bool) -> str:
+        """Identifier for the table's own key, foreign key for keys of other tables."""
+        own_key = column_name.lower() in ('id', '_id') or is_first_column
+        return IDENTIFIER if own_key and values.is_unique else FOREIGN_KEY
+
+    def _numeric_type(self, column_name: str, raw: np.ndarray, is_first_column: bool) -> Optional[str]:
+        numbers = raw.astype(np.float64)
+        integral = bool(np.all(numbers == np.round(numbers)))
+
+        if integral and ID_NAME.search(column_name):
+            return self._key_type(column_name, pd.Series(raw), is_first_column)
+        distinct = np.unique(numbers)
+        if integral and len(distinct) <= 2 and np.isin(distinct, (0, 1)).all():
+            if len(distinct) == 2 or BOOLEAN_NAME.search(column_name):
+                return BOOLEAN
+        if CURRENCY_NAME.search(column_name):
+            # Whole cents, up to the precision of the stored type (float32 plans)
+            cents = numbers * 100
+            precision = np.finfo(raw.dtype).eps if raw.dtype.kind == 'f' else 0.0
+            if np.all(np.abs(cents - np.round(cents)) <= np.maximum(np.abs(cents) * precision * 4, 1e-6)):
+                return CURRENCY
+        return None
+
+    def _matches(self, strings: List[str], pattern: Pattern) -> bool:
+        """
+        True if at least match_ratio of the strings fully match pattern.
+
+        Stops at the first miss that makes the ratio unreachable, so columns of
+        another type are usually rejected after a few values.
+        """
+        total = len(strings)
+        misses = 0
+        for value in strings:
+            if pattern.fullmatch(value) is None:
+                misses += 1
+                if (total - misses) / total < self.match_ratio:
+                    return False
+        return True
+
+    def _text_type(self, column_name: str, text: pd.Series, is_first_column: bool) -> Optional[str]:
+        lowered = text.str.lower()
+        if lowered.isin(BOOLEAN_TEXT_VALUES).all() and lowered.nunique() <= 2:
+            return BOOLEAN
+        strings = text.tolist()
+        if self._matches(strings, EMAIL_PATTERN):
+            return EMAIL
+        if self._matches(strings, UUID_PATTERN):
+            return UUID if not ID_NAME.search(column_name) else self._key_type(column_name, text, is_first_column)
+        if self._matches(strings, DATE_TEXT_PATTERN):
+            return TIMESTAMP if text.str.len().max() > 10 else DATE
+        if self._matches(strings, CURRENCY_TEXT_PATTERN):
+            return CURRENCY
+        if ID_NAME.search(column_name) and self._matches(strings, HEX_ID_PATTERN):
+            return self._key_type(column_name, text, is_first_column)
+        if self._matches(strings, PHONE_PATTERN):
+            digits = text.str.count(r'\d')
+            if float(digits.between(7, 15).mean()) >= self.match_ratio:
+                return PHONE
+        return None
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Column Sketches for Weaviate Knowledge Base
+
+This module provides small, mergeable summaries of column values so that
+profiling can report cardinality, frequent values and value ranges without
+holding a column in memory or computing exact statistics:
+- HyperLogLog: approximate distinct count (4 KB per column at precision 12)
+- HeavyHitters: Misra-Gries frequent-items summary for the top values
+- QuantileSketch: KLL-style compactor sketch for numeric and datetime quantiles
+
+Every sketch is updated with whole pandas Series (one vectorized step per chunk)
+and two sketches of the same kind can be merged, so statistics gathered per
+chunk or per partition combine into statistics for the whole dataset.
+
+Usage:
+    from ingestion.sketches import ColumnSketch
+    sketch = ColumnSketch()
+    for chunk in chunks:
+        sketch.update(chunk['Weight'])
+    print(sketch.summary())
+"""
+
+import base64
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_series(values: pd.Series, distinct: bool = False) -> np.ndarray:
+    """
+    Hash non-null values of a Series to uint64, independent of chunk dtype.
+
+    Numbers are hashed as float64 so a column read as int64 in one chunk and
+    float64 in the next hashes the same values identically; datetimes are
+    hashed by their nanosecond value and everything else by its string form.
+
+    Args:
+        values: Series of column values
+        distinct: The values are known to be distinct, so strings are hashed
+            directly instead of being factorized first (same hashes, faster)
+
+    Returns:
+        uint64 array with one hash per non-null value
+    """
+    values = values.dropna()
+    if values.empty:
+        return np.empty(0, dtype=np.uint64)
+
+    if pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_numeric_dtype(values.dtype):
+        data = values.to_numpy(dtype=np.float64)
+    elif pd.api.types.is_datetime64_any_dtype(values.dtype):
+        data = values.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    else:
+        data = values.astype(str).to_numpy(dtype=object)
+    return pd.util.hash_array(data, categorize=not distinct)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes."""
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize HyperLogLog sketch.
+
+        Args:
+            precision: Number of index bits; 2**precision one-byte registers are
+                kept and the standard error is about 1.04 / sqrt(2**precision)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Add a batch of uint64 hashes.
+
+        Args:
+            hashes: uint64 array of value hashes
+        """
+        if len(hashes) == 0:
+            return
+
+        p = self.precision
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        remaining = hashes << np.uint64(p)
+
+        # Position of the leftmost 1-bit. The top 53 bits convert to float64
+        # exactly, so frexp gives their bit length without a Python loop.
+        top_bits = (remaining >> np.uint64(11)).astype(np.float64)
+        _, bit_length = np.frexp(top_bits)
+        max_rank = 64 - p + 1
+        rank = np.where(top_bits > 0, 53 - bit_length + 1, max_rank)
+        rank = np.minimum(rank, max_rank).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Add the non-null values of a Series.
+
+        Args:
+            values: Series of column values
+        """
+        self.add_hashes(hash_series(values))
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch built with the same precision
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            Approximate distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        # Linear counting is more accurate for small cardinalities
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'HyperLogLog':
+        """Rebuild a sketch from to_state output."""
+        sketch = cls(state["precision"])
+        sketch.registers = np.frombuffer(base64.b64decode(state["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class HeavyHitters:
+    """Misra-Gries frequent-items summary with a fixed number of counters."""
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize heavy-hitters summary.
+
+        Args:
+            capacity: Number of counters kept. Any value occurring in more than
+                1/(capacity+1) of the rows is guaranteed to be tracked, and each
+                count is underestimated by at most error_bound.
+        """
+        self.capacity = capacity
+        self.counters = {}
+        self.error_bound = 0
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Add the non-null values of a Series.
+
+        Args:
+            values: Series of column values
+        """
+        values = values.dropna()
+        if values.empty:
+            return
+        self.add_counts(*self.count_values(values))
+
+    @staticmethod
+    def count_values(values: pd.Series) -> Tuple[pd.Index, np.ndarray]:
+        """
+        Distinct non-null values of a chunk and how often each occurs (vectorized).
+
+        Numbers come sorted (sorting them is cheaper than hashing); other values
+        come in order of first occurrence, categoricals in category order.
+        """
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iuf':
+            data = values.to_numpy()
+            head = data[:64]
+            if len(data) > 1 and (head[1:] > head[:-1]).all() and (data[1:] > data[:-1]).all():
+                # Already strictly increasing (a key column): every value occurs once
+                return pd.Index(data), np.ones(len(data), dtype=np.int64)
+            if data.dtype.kind == 'f':
+                missing = np.isnan(data)
+                if missing.any():
+                    data = data[~missing]
+            data = np.sort(data)
+            starts = np.flatnonzero(data[1:] != data[:-1]) + 1
+            if len(data):
+                starts = np.concatenate(([0], starts))
+            return pd.Index(data[starts]), np.diff(np.append(starts, len(data)))
+        counts = values.value_counts(sort=False)
+        index, frequencies = counts.index, counts.to_numpy(dtype=np.int64)
+        if not frequencies.all():
+            # Unobserved categories
+            observed = frequencies > 0
+            index, frequencies = index[observed], frequencies[observed]
+        return index, frequencies
+
+    def add_counts(self, values: pd.Index, counts: np.ndarray) -> None:
+        """
+        Add the exact counts of one chunk.
+
+        Args:
+            values: Distinct values
+            counts: Positive count of each value
+        """
+        # Only the top capacity+1 counts can survive the shrink in _merge_counts;
+        # the cut-off count bounds what the dropped values lose (Misra-Gries)
+        if len(counts) > self.capacity and counts.max() == 1:
+            # All distinct: the cut-off count is 1 and nothing survives
+            self.error_bound += 1
+            return
+        if len(counts) > self.capacity:
+            top = np.argpartition(counts, len(counts) - self.capacity - 1)[-(self.capacity + 1):]
+            threshold = int(counts[top].min())
+            top = top[counts[top] > threshold]
+            values, counts = values[top], counts[top] - threshold
+            self.error_bound += threshold
+
+        # Numbers are counted as numbers; only the surviving keys become strings
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            keys = [self.format_number(value) for value in values]
+        else:
+            keys = values.astype(str)
+        chunk_counts = {}
+        for key, count in zip(keys, counts.tolist()):
+            chunk_counts[key] = chunk_counts.get(key, 0) + count
+        self._merge_counts(chunk_counts)
+
+    @staticmethod
+    def format_number(value: Any) -> str:
+        """Key of a number; whole numbers have no fractional part, so int and float chunks share keys."""
+        return str(int(value)) if float(value).is_integer() else str(value)
+
+    def merge(self, other: 'HeavyHitters') -> None:
+        """
+        Merge another summary into this one.
+
+        Args:
+            other: Summary to merge
+        """
+        self.error_bound += other.error_bound
+        self._merge_counts(other.counters)
+
+    def _merge_counts(self, counts: Dict[str, int]) -> None:
+        """Add exact counts, then shrink back to capacity counters."""
+        for value, count in counts.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+
+        if len(self.counters) > self.capacity:
+            # Subtracting the (capacity+1)-th largest count keeps at most
+            # capacity positive counters (mergeable Misra-Gries)
+            ordered = np.sort(np.fromiter(self.counters.values(), dtype=np.int64, count=len(self.counters)))
+            threshold = int(ordered[-(self.capacity + 1)])
+            self.counters = {
+                value: count - threshold
+                for value, count in self.counters.items() if count > threshold
+            }
+            self.error_bound += threshold
+
+    def top(self, k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Most frequent values.
+
+        Args:
+            k: Number of values to return
+
+        Returns:
+            List of {"value", "count"} dicts, most frequent first; counts are
+            lower bounds (true count <= count + error_bound)
+        """
+        ordered = sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))
+        return [{"value": value, "count": int(count)} for value, count in ordered[:k]]
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {"capacity": self.capacity, "counters": dict(self.counters), "error_bound": self.error_bound}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'HeavyHitters':
+        """Rebuild a summary from to_state output."""
+        summary = cls(state["capacity"])
+        summary.counters = dict(state["counters"])
+        summary.error_bound = state["error_bound"]
+        return summary
+
+
+class QuantileSketch:
+    """KLL-style quantile sketch for float64 values."""
+
+    def __init__(self, k: int = 200):
+        """
+        Initialize quantile sketch.
+
+        Args:
+            k: Capacity of the top compactor; rank error is roughly 1.7 / k and
+                memory stays at about 3k values
+        """
+        self.k = k
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.min_value = None
+        self.max_value = None
+        self._compactions = 0
+
+    def add_values(self, values: np.ndarray) -> None:
+        """
+        Add a batch of float64 values (NaN must already be removed).
+
+        Args:
+            values: float64 array
+        """
+        if len(values) == 0:
+            return
+        batch_min, batch_max = float(values.min()), float(values.max())
+        self.min_value = batch_min if self.min_value is None else min(self.min_value, batch_min)
+        self.max_value = batch_max if self.max_value is None else max(self.max_value, batch_max)
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values.astype(np.float64, copy=False)])
+        self._compress()
+
+    def add_counts(self, values: np.ndarray, counts: np.ndarray) -> None:
+        """
+        Add distinct numbers with their counts (NaN must already be removed).
+
+        Gives what adding every value count times and compacting would, without
+        expanding the batch: the sorted batch enters at the lowest level where
+        it fits the top capacity, as evenly spaced ranks, and the leftover
+        weight stays at lower levels (one item per set bit). Only the kept
+        values are converted to float64.
+
+        Args:
+            values: Distinct numbers (any numeric dtype)
+            counts: Positive count of each value
+        """
+        if len(values) == 0:
+            return
+        if not (values[1:] > values[:-1]).all():
+            order = np.argsort(values)
+            values, counts = values[order], counts[order]
+        total = int(counts.sum())
+        self.min_value = float(values[0]) if self.min_value is None else min(self.min_value, float(values[0]))
+        self.max_value = float(values[-1]) if self.max_value is None else max(self.max_value, float(values[-1]))
+        self.count += total
+
+        height = 0
+        while (total >> height) > self.k:
+            height += 1
+        while len(self.levels) <= height:
+            self.levels.append(np.empty(0, dtype=np.float64))
+        if height == 0:
+            self.levels[0] = np.concatenate([self.levels[0], np.repeat(values, counts).astype(np.float64)])
+            self._compress()
+            return
+
+        # Item i of the batch stands for ranks [i * step, (i + 1) * step) and
+        # takes the value at the middle rank (the rank is the position when
+        # every count is 1)
+        cumulative = np.cumsum(counts) if total > len(counts) else None
+        step = 1 << height
+        full = total // step
+        ranks = np.arange(full, dtype=np.int64) * step + step // 2
+        positions = np.searchsorted(cumulative, ranks, side='right') if cumulative is not None else ranks
+        self.levels[height] = np.concatenate([self.levels[height], values[positions].astype(np.float64)])
+        start = full * step
+        for level in range(height - 1, -1, -1):
+            size = 1 << level
+            if total - start >= size:
+                rank = start + size // 2
+                position = np.searchsorted(cumulative, rank, side='right') if cumulative is not None else rank
+                self.levels[level] = np.concatenate([
+                    self.levels[level], values[position:position + 1].astype(np.float64)
+                ])
+                start += size
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+        """
+        if other.count == 0:
+            return
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.count += other.count
+        self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+        self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        self._compress()
+
+    def _capacity(self, height: int) -> int:
+        """Capacity of a level; lower levels shrink geometrically."""
+        depth = len(self.levels) - height - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        """Compact overfull levels, promoting every other sorted item upward."""
+        height = 0
+        while height < len(self.levels):
+            items = self.levels[height]
+            if len(items) > self._capacity(height):
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # An odd item stays behind so the total weight is preserved
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                # Alternate the offset instead of drawing it at random, so
+                # profiles are reproducible
+                offset = self._compactions % 2
+                self._compactions += 1
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], pairs[offset::2]])
+                self.levels[height] = keep
+            height += 1
+
+    def quantiles(self, fractions: List[float]) -> List[Optional[float]]:
+        """
+        Approximate quantiles.
+
+        Args:
+            fractions: Quantile fractions between 0 and 1
+
+        Returns:
+            One value per fraction (None when the sketch is empty)
+        """
+        if self.count == 0:
+            return [None for _ in fractions]
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(items), 2 ** height, dtype=np.float64)
+            for height, items in enumerate(self.levels)
+        ])
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min_value)
+            elif fraction >= 1:
+                results.append(self.max_value)
+            else:
+                position = np.searchsorted(cumulative, fraction * cumulative[-1], side='left')
+                results.append(float(values[min(position, len(values) - 1)]))
+        return results
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        return {
+            "k": self.k,
+            "levels": [items.tolist() for items in self.levels],
+            "count": self.count,
+            "min": self.min_value,
+            "max": self.max_value
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'QuantileSketch':
+        """Rebuild a sketch from to_state output."""
+        sketch = cls(state["k"])
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state["levels"]]
+        sketch.count = state["count"]
+        sketch.min_value = state["min"]
+        sketch.max_value = state["max"]
+        return sketch
+
+
+class ColumnSketch:
+    """Distinct-count, heavy-hitter and quantile sketches for one column."""
+
+    QUANTILE_FRACTIONS = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    def __init__(self, hll_precision: int = 12, top_k_capacity: int = 64, quantile_k: int = 200):
+        """
+        Initialize column sketch.
+
+        Args:
+            hll_precision: HyperLogLog precision (see HyperLogLog)
+            top_k_capacity: Number of heavy-hitter counters (see HeavyHitters)
+            quantile_k: Quantile sketch size (see QuantileSketch)
+        """
+        self.distinct = HyperLogLog(hll_precision)
+        self.heavy_hitters = HeavyHitters(top_k_capacity)
+        self.quantiles = QuantileSketch(quantile_k)
+        # Distinct values of the first chunk, hashed only once a second chunk,
+        # a merge or serialization needs them; until then the count is exact
+        self.pending_distinct = None
+        # "numeric" or "datetime" while every chunk had that kind, else None
+        self.value_kind = None
+        self.quantiles_valid = True
+
+    @staticmethod
+    def value_kind_of(values: pd.Series) -> Optional[str]:
+        """Kind of values that quantiles can be computed for, or None."""
+        if pd.api.types.is_bool_dtype(values.dtype):
+            return None
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            return "numeric"
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            return "datetime"
+        return None
+
+    def update(self, values: pd.Series) -> 'ColumnSketch':
+        """
+        Add one chunk of column values.
+
+        Args:
+            values: Series of column values
+
+        Returns:
+            self, for chaining
+        """
+        # One value_counts serves all three sketches
+        return self.add_counts(*HeavyHitters.count_values(values))
+
+    def add_counts(self, distinct_values: pd.Index, counts: np.ndarray) -> 'ColumnSketch':
+        """
+        Add one chunk given as its distinct non-null values and their counts.
+
+        Args:
+            distinct_values: Distinct values (see HeavyHitters.count_values)
+            counts: Positive count of each value
+
+        Returns:
+            self, for chaining
+        """
+        if len(counts) == 0:
+            return self
+
+        if self.pending_distinct is None and not self.distinct.registers.any():
+            self.pending_distinct = distinct_values
+        else:
+            self._hash_pending()
+            self.distinct.add_hashes(hash_series(distinct_values.to_series(), distinct=True))
+        self.heavy_hitters.add_counts(distinct_values, counts)
+
+        kind = self.value_kind_of(distinct_values)
+        if kind is None or (self.value_kind is not None and kind != self.value_kind):
+            self.quantiles_valid = False
+        elif self.quantiles_valid:
+            self.value_kind = kind
+            if kind == "datetime":
+                data = distinct_values.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            else:
+                data = distinct_values.to_numpy()
+                if data.dtype.kind not in 'iuf':
+                    # Nullable extension types
+                    data = distinct_values.to_numpy(dtype=np.float64)
+            if data.dtype.kind == 'f':
+                finite = np.isfinite(data)
+                if not finite.all():
+                    data, counts = data[finite], counts[finite]
+            self.quantiles.add_counts(data, counts)
+        return self
+
+    def _hash_pending(self) -> None:
+        """Move the deferred first-chunk values into the HyperLogLog."""
+        if self.pending_distinct is not None:
+            self.distinct.add_hashes(hash_series(self.pending_distinct.to_series(), distinct=True))
+            self.pending_distinct = None
+
+    def merge(self, other: 'ColumnSketch') -> 'ColumnSketch':
+        """
+        Merge the sketch of another chunk or partition of the same column.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            self, for chaining
+        """
+        self._hash_pending()
+        other._hash_pending()
+        self.distinct.merge(other.distinct)
+        self.heavy_hitters.merge(other.heavy_hitters)
+
+        if not other.quantiles_valid:
+            self.quantiles_valid = False
+        elif other.value_kind is not None:
+            if self.value_kind is not None and self.value_kind != other.value_kind:
+                self.quantiles_valid = False
+            elif self.quantiles_valid:
+                self.value_kind = other.value_kind
+                self.quantiles.merge(other.quantiles)
+        return self
+
+    def summary(self, top_k: int = 5) -> Dict[str, Any]:
+        """
+        JSON-compatible statistics for detailedColumnInfo.
+
+        Args:
+            top_k: Number of top values to report
+
+        Returns:
+            Dictionary with approxDistinctCount, topValues and, for numeric and
+            datetime columns, quantiles (min, p25, median, p75, max)
+        """
+        if self.pending_distinct is not None:
+            distinct_count = len(self.pending_distinct)
+        else:
+            distinct_count = self.distinct.estimate()
+        summary = {
+            "approxDistinctCount": distinct_count,
+            # Values seen once are not "top" values (e.g. every value of a key column)
+            "topValues": [item for item in self.heavy_hitters.top(top_k) if item["count"] > 1]
+        }
+
+        if self.quantiles_valid and self.value_kind is not None and self.quantiles.count:
+            values = self.quantiles.quantiles(self.QUANTILE_FRACTIONS)
+            if self.value_kind == "datetime":
+                values = [pd.Timestamp(int(value)).isoformat() for value in values]
+            else:
+                values = [int(value) if float(value).is_integer() else round(value, 6) for value in values]
+            summary["quantiles"] = dict(zip(["min", "p25", "median", "p75", "max"], values))
+
+        return summary
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary."""
+        self._hash_pending()
+        return {
+            "distinct": self.distinct.to_state(),
+            "heavy_hitters": self.heavy_hitters.to_state(),
+            "quantiles": self.quantiles.to_state(),
+            "value_kind": self.value_kind,
+            "quantiles_valid": self.quantiles_valid
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ColumnSketch':
+        """Rebuild a column sketch from to_state output."""
+        sketch = cls()
+        sketch.distinct = HyperLogLog.from_state(state["distinct"])
+        sketch.heavy_hitters = HeavyHitters.from_state(state["heavy_hitters"])
+        sketch.quantiles = QuantileSketch.from_state(state["quantiles"])
+        sketch.value_kind = state["value_kind"]
+        sketch.quantiles_valid = state["quantiles_valid"]
+        return sketch
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Upload Engine for Weaviate Knowledge Base
+
+Uploads objects to a Weaviate collection in fixed-size batches
+(collection.data.insert_many) with a bounded number of batches in flight.
+
+Back pressure comes from the server's answers instead of fixed sleeps: a new
+batch is only sent when an in-flight one has been answered, and the number of
+batches allowed in flight (the window) is halved whenever a batch comes back
+with transient failures (timeouts, throttling, unavailable) and grows by one
+after each clean batch. Objects that failed transiently are re-queued after
+the RetryPolicy's jittered backoff until the policy gives up (attempts,
+deadline or run budget spent); permanent failures are reported right away.
+
+Objects carry deterministic UUIDs, so re-sending an object whose earlier
+attempt did reach the server overwrites it instead of duplicating it. For
+vectorized collections an AdaptiveRateLimiter (ingestion.rate_limiter) paces
+the objects sent per second and learns from each batch's latency and errors;
+batches whose objects all carry vectors skip it, as Weaviate does not call
+the vectorizer for them.
+
+Usage:
+    from ingestion.upload_engine import UploadEngine, UploadItem
+    engine = UploadEngine(batch_size=16, max_concurrency=4)
+    report = engine.upload(collection, [UploadItem(properties, uuid, summary={"table_name": name})])
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+from weaviate.classes.data import DataObject
+
+from ingestion.rate_limiter import AdaptiveRateLimiter
+from ingestion.retry_policy import RetryPolicy, is_transient_error
+
+
+@dataclass
+class UploadItem:
+    """One object to upload, with the summary fields reported for it."""
+    properties: Dict[str, Any]
+    uuid: Optional[str] = None
+    vector: Optional[Sequence[float]] = None
+    summary: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    errors: List[str] = field(default_factory=list)
+    first_sent: Optional[float] = None
+
+
+class UploadEngine:
+    """Batched, bounded-concurrency uploads with response-driven back pressure."""
+
+    def __init__(self, batch_size: int = 16, max_concurrency: int = 4,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        Initialize upload engine.
+
+        Args:
+            batch_size: Objects per insert_many request
+            max_concurrency: Maximum number of batches in flight
+            retry_policy: Decides which failed objects are retried and when
+                (default: RetryPolicy())
+            rate_limiter: Paces objects per second for collections that vectorize on
+                insert (None sends as fast as the window allows)
+        """
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be at least 1")
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+
+    def send_batch(self, collection: Any,
+                   batch: List[UploadItem]) -> List[Tuple[Optional[str], Optional[Union[Exception, str]]]]:
+        """
+        Insert one batch.
+
+        Returns:
+            One (uuid, error) pair per item: the error is an object's error message,
+            or the exception of a failed request (which fails every item)
+        """
+        objects = [DataObject(properties=item.properties, uuid=item.uuid, vector=item.vector) for item in batch]
+        limiter = self.rate_limiter if any(item.vector is None for item in batch) else None
+        if limiter:
+            limiter.acquire(len(batch))
+        started = time.monotonic()
+        try:
+            response = collection.data.insert_many(objects)
+        except Exception as e:
+            outcomes = [(None, e)] * len(batch)
+        else:
+            outcomes = []
+            for position in range(len(batch)):
+                error = response.errors.get(position)
+                if error is not None:
+                    outcomes.append((None, error.message))
+                else:
+                    outcomes.append((str(response.uuids.get(position, batch[position].uuid)), None))
+        if limiter:
+            if any(error is not None and is_transient_error(error) for _, error in outcomes):
+                limiter.record_overload()
+            else:
+                limiter.record_success(time.monotonic() - started)
+        return outcomes
+
+    def upload(self, collection: Any, items: List[UploadItem]) -> Dict[str, Any]:
+        """
+        Upload items and account for every one of them.
+
+        Args:
+            collection: Weaviate collection (anything with data.insert_many)
+            items: Objects to upload
+
+        Returns:
+            Dictionary with successful_uploads ({**summary, "uuid", "attempt"}),
+            failed_uploads ({**summary, "errors" of every attempt, "last_error"}) and
+            request stats
+        """
+        pending = deque(items)
+        retries = []  # heap of (not before, sequence, item) waiting out their backoff
+        sequence = itertools.count()
+        in_flight = {}
+        window = self.max_concurrency
+        successful_uploads = []
+        failed_uploads = []
+        stats = {"batches": 0, "retried_objects": 0, "min_window": window}
+        started = time.perf_counter()
+        self.retry_policy.record_request(len(items))
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while pending or retries or in_flight:
+                now = time.monotonic()
+                while retries and retries[0][0] <= now:
+                    pending.append(heapq.heappop(retries)[2])
+
+                # Fill the window; the rest waits for the server to answer
+                while pending and len(in_flight) < window:
+                    batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+                    for item in batch:
+                        if item.first_sent is None:
+                            item.first_sent = now
+                    in_flight[pool.submit(self.send_batch, collection, batch)] = batch
+                    stats["batches"] += 1
+
+                # Wake up for the first answer, or when the next retry is due
+                timeout = max(retries[0][0] - now, 0) if retries else None
+                if not in_flight:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    overloaded = False
+                    answered = time.monotonic()
+                    for item, (uuid, error) in zip(batch, future.result()):
+                        item.attempts += 1
+                        if error is None:
+                            successful_uploads.append({**item.summary, "uuid": uuid, "attempt": item.attempts})
+                            print(f"   ✅ {item.summary.get('table_name', uuid)}: {uuid} (attempt {item.attempts})")
+                            continue
+                        item.errors.append(str(error))
+                        overloaded |= is_transient_error(error)
+                        delay = self.retry_policy.retry_delay(error, item.attempts, answered - item.first_sent)
+                        if delay is not None:
+                            heapq.heappush(retries, (answered + delay, next(sequence), item))
+                            stats["retried_objects"] += 1
+                            continue
+                        failed_uploads.append({**item.summary, "errors": item.errors, "last_error": str(error)})
+                        print(f"   ❌ {item.summary.get('table_name', 'object')}: {error}")
+
+                    # AIMD window: halve on transient failures, grow by one on clean batches
+                    if overloaded:
+                        window = max(window // 2, 1)
+                        stats["min_window"] = min(stats["min_window"], window)
+                    else:
+                        window = min(window + 1, self.max_concurrency)
+
+        stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        stats["retry_policy"] = self.retry_policy.metrics()
+        if self.rate_limiter:
+            stats["rate_limiter"] = self.rate_limiter.metrics()
+        return {
+            "successful_uploads": successful_uploads,
+            "failed_uploads": failed_uploads,
+            "stats": stats
+        }
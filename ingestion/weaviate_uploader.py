@@ -15,10 +15,14 @@ import os
 import json
 import uuid as uuid_lib
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from dotenv import load_dotenv
 
+from ingestion.models import DatasetProfile, ProfileValidationError
+from ingestion.rate_limiter import AdaptiveRateLimiter
+from ingestion.retry_policy import RetryPolicy, is_transient_error
+
 try:
     from weaviate import WeaviateClient
     from weaviate.connect import ConnectionParams
@@ -32,11 +36,22 @@ load_dotenv()
 class WeaviateUploader:
     """Handles uploading metadata to Weaviate collections."""
     
-    def __init__(self):
-        """Initialize Weaviate uploader."""
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Initialize Weaviate uploader.
+        
+        Args:
+            rate_limiter: Paces objects added to the Bedrock-vectorized collections
+                (DatasetMetadata, DomainTag); None adds them as fast as batching allows
+            retry_policy: Retries connection attempts that fail transiently
+                (default: RetryPolicy())
+        """
         self.weaviate_url = os.getenv('WEAVIATE_URL', 'http://localhost:8080')
         self.grpc_port = int(os.getenv('WEAVIATE_GRPC_PORT', '8081'))
         self.client = None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
         
         # Track uploaded objects for relationship building
         self.uploaded_datasets = {}  # tableName -> uuid mapping
@@ -53,7 +68,7 @@ class WeaviateUploader:
             )
             
             self.client = WeaviateClient(connection_params=connection_params)
-            self.client.connect()
+            self.retry_policy.call(self.client.connect)
             
             if self.client.is_ready():
                 print(f"✅ Connected to Weaviate at {self.weaviate_url}")
@@ -92,115 +107,75 @@ class WeaviateUploader:
         
         return str(consistent_uuid)
     
-    def validate_metadata_object(self, metadata: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    def validate_metadata_object(self, metadata: Union[DatasetProfile, Dict[str, Any]]) -> Tuple[bool, List[str]]:
         """
         Validate metadata object before uploading.
         
+        DatasetProfile objects were validated when they were built; dictionaries
+        are validated by building one.
+        
         Args:
-            metadata: Metadata dictionary
+            metadata: DatasetProfile or metadata dictionary
             
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
-        required_fields = [
-            'tableName', 'zone', 'originalFileName', 'recordCount',
-            'columnsArray', 'detailedColumnInfo'
-        ]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in metadata or metadata[field] is None:
-                errors.append(f"Missing required field: {field}")
-            elif field == 'columnsArray' and not isinstance(metadata[field], list):
-                errors.append(f"Field {field} must be a list")
-            elif field == 'recordCount' and not isinstance(metadata[field], (int, float)):
-                errors.append(f"Field {field} must be a number")
+        try:
+            self.as_profile(metadata)
+        except ProfileValidationError as e:
+            return False, e.errors
         
-        # Validate JSON fields
-        json_fields = ['detailedColumnInfo', 'answerableQuestions', 'llmHints']
-        for field in json_fields:
-            if field in metadata and metadata[field]:
+        # Structured fields that arrive as text must at least be valid JSON
+        errors = []
+        for field in ('detailedColumnInfo', 'answerableQuestions', 'llmHints'):
+            value = metadata.get(field)
+            if isinstance(value, str) and value:
                 try:
-                    if isinstance(metadata[field], str):
-                        json.loads(metadata[field])
-                    elif not isinstance(metadata[field], (dict, list)):
-                        errors.append(f"Field {field} must be JSON string or dict/list")
+                    json.loads(value)
                 except json.JSONDecodeError:
                     errors.append(f"Field {field} contains invalid JSON")
         
-        # Validate zone
-        valid_zones = ['Raw', 'Cleansed', 'Curated']
-        if metadata.get('zone') not in valid_zones:
-            errors.append(f"Zone must be one of: {valid_zones}")
-        
         return len(errors) == 0, errors
     
-    def prepare_dataset_metadata_for_weaviate(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def as_profile(metadata: Union[DatasetProfile, Dict[str, Any]]) -> DatasetProfile:
+        """
+        Return metadata as a DatasetProfile, building (and validating) one from a dict.
+        
+        Raises:
+            ProfileValidationError: If a dictionary is not valid metadata
+        """
+        if isinstance(metadata, DatasetProfile):
+            return metadata
+        return DatasetProfile.from_dict(metadata)
+    
+    def prepare_dataset_metadata_for_weaviate(self, metadata: Union[DatasetProfile, Dict[str, Any]]) -> Dict[str, Any]:
         """
         Prepare metadata object for Weaviate ingestion.
         
+        Structured fields (detailedColumnInfo, llmHints, answerableQuestions) are
+        serialized to compact JSON here, the only place they become text.
+        
         Args:
-            metadata: Raw metadata dictionary
+            metadata: DatasetProfile or metadata dictionary
             
         Returns:
             Weaviate-ready properties dictionary
         """
-        # Ensure JSON fields are strings
-        def ensure_json_string(value):
-            if isinstance(value, str):
-                return value
-            elif isinstance(value, (dict, list)):
-                return json.dumps(value)
-            else:
-                return str(value) if value is not None else ""
-        
-        # Ensure lists are properly formatted
-        def ensure_list(value):
-            if isinstance(value, list):
-                return value
-            elif isinstance(value, str):
-                try:
-                    parsed = json.loads(value)
-                    return parsed if isinstance(parsed, list) else [value]
-                except:
-                    return [value]
-            else:
-                return [str(value)] if value is not None else []
-        
-        weaviate_props = {
-            # Core identity
-            "tableName": str(metadata.get('tableName', '')),
-            "originalFileName": str(metadata.get('originalFileName', '')),
-            "athenaTableName": str(metadata.get('athenaTableName', '')),
-            "zone": str(metadata.get('zone', 'Raw')),
-            "format": str(metadata.get('format', 'CSV')),
-            
-            # Semantic content
-            "description": str(metadata.get('description', '')),
-            "businessPurpose": str(metadata.get('businessPurpose', '')),
-            "tags": ensure_list(metadata.get('tags', [])),
-            "columnSemanticsConcatenated": str(metadata.get('columnSemanticsConcatenated', '')),
-            
-            # Structure
-            "columnsArray": ensure_list(metadata.get('columnsArray', [])),
-            "detailedColumnInfo": ensure_json_string(metadata.get('detailedColumnInfo', '{}')),
-            "recordCount": int(metadata.get('recordCount', 0)),
-            
-            # Governance
-            "dataOwner": str(metadata.get('dataOwner', '')),
-            "sourceSystem": str(metadata.get('sourceSystem', '')),
-            
-            # Timestamps - ensure proper format
-            "metadataCreatedAt": metadata.get('metadataCreatedAt', datetime.now(timezone.utc).isoformat()),
-            "dataLastModifiedAt": metadata.get('dataLastModifiedAt', datetime.now(timezone.utc).isoformat()),
-            
-            # LLM enhancement
-            "llmHints": ensure_json_string(metadata.get('llmHints', '{}')),
-            "answerableQuestions": ensure_json_string(metadata.get('answerableQuestions', '[]'))
-        }
+        return self.as_profile(metadata).to_weaviate_properties()
+    
+    def record_batch_outcome(self, collection: Any) -> None:
+        """
+        Feed the failed objects of a finished batch back to the rate limiter.
         
-        return weaviate_props
+        Dynamic batches give no per-request latency, so only timeouts and
+        throttling errors are fed back (as one congestion signal).
+        """
+        if not self.rate_limiter:
+            return
+        failed_objects = getattr(collection.batch, 'failed_objects', None) or []
+        if any(is_transient_error(failed.message) for failed in failed_objects):
+            self.rate_limiter.record_overload()
     
     def upload_dataset_metadata(self, metadata_list: List[Dict[str, Any]]) -> Tuple[bool, Dict[str, Any]]:
         """
@@ -237,7 +212,7 @@ class WeaviateUploader:
                             })
                             continue
                         
-                        # Prepare for Weaviate
+                        # Prepare for Weaviate (a no-op conversion for DatasetProfile)
                         weaviate_props = self.prepare_dataset_metadata_for_weaviate(metadata)
                         
                         # Generate consistent UUID
@@ -245,7 +220,9 @@ class WeaviateUploader:
                         zone = weaviate_props['zone']
                         consistent_uuid = self.generate_consistent_uuid(table_name, zone)
                         
-                        # Add to batch
+                        # Add to batch (each object is one Bedrock embedding call)
+                        if self.rate_limiter:
+                            self.rate_limiter.acquire()
                         batch.add_object(
                             properties=weaviate_props,
                             uuid=consistent_uuid
@@ -271,6 +248,8 @@ class WeaviateUploader:
                             "errors": [f"Upload error: {str(e)}"]
                         })
             
+            self.record_batch_outcome(collection)
+            
             # Batch results
             print(f"✅ Batch upload completed")
             print(f"   Successful: {len(successful_uploads)}")
@@ -411,6 +390,8 @@ class WeaviateUploader:
                         # Generate UUID for tag
                         tag_uuid = str(uuid_lib.uuid5(uuid_lib.NAMESPACE_DNS, tag_props['tagName']))
                         
+                        if self.rate_limiter:
+                            self.rate_limiter.acquire()
                         batch.add_object(
                             properties=tag_props,
                             uuid=tag_uuid
@@ -431,6 +412,8 @@ class WeaviateUploader:
                             "error": str(e)
                         })
             
+            self.record_batch_outcome(collection)
+            
             print(f"✅ Domain tag upload completed")
             print(f"   Successful: {len(successful_uploads)}")
             print(f"   Failed: {len(failed_uploads)}")
@@ -6,7 +6,7 @@ Upload with OPTIMIZED metadata sizes for Bedrock compatibility
 import os
 import sys
 import yaml
-import json
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -15,6 +15,9 @@ project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
 from ingestion.csv_extractor import CSVExtractor
+from ingestion.json_utils import dumps_compact, ensure_json_string
+from ingestion.rate_limiter import AdaptiveRateLimiter
+from ingestion.retry_policy import RetryPolicy, RetryBudget, is_transient_error
 from ingestion.weaviate_uploader import WeaviateUploader
 
 load_dotenv()
@@ -46,7 +49,7 @@ def optimize_metadata_for_bedrock(metadata):
         
         # NON-VECTORIZED FIELDS - Can be larger
         "columnsArray": metadata.get("columnsArray", []),
-        "detailedColumnInfo": metadata.get("detailedColumnInfo", ""),
+        "detailedColumnInfo": ensure_json_string(metadata.get("detailedColumnInfo"), "{}"),
         "recordCount": metadata.get("recordCount", 0),
         "dataOwner": metadata.get("dataOwner", ""),
         "sourceSystem": metadata.get("sourceSystem", ""),
@@ -72,6 +75,24 @@ def main():
     
     csv_extractor = CSVExtractor(str(data_dir))
     weaviate_uploader = WeaviateUploader()
+    # Paces inserts to what Bedrock sustains (replaces the fixed delay between uploads)
+    rate_limiter = AdaptiveRateLimiter(initial_rate=float(os.getenv('INGESTION_VECTORIZE_RATE', '1')))
+    # Retries transient failures (timeouts, throttling, unavailable) with jittered backoff
+    retry_policy = RetryPolicy(max_attempts=3, budget=RetryBudget())
+    
+    def insert_paced(collection, properties):
+        """One insert attempt, paced by and fed back to the rate limiter."""
+        rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            uuid = collection.data.insert(properties)
+        except Exception as e:
+            if is_transient_error(e):
+                rate_limiter.record_overload()
+            print(f"      ❌ Attempt failed: {e}")
+            raise
+        rate_limiter.record_success(time.monotonic() - started)
+        return uuid
     
     # Connect to Weaviate
     if not weaviate_uploader.connect():
@@ -119,7 +140,7 @@ def main():
             upload_data = optimize_metadata_for_bedrock(metadata)
             
             # Calculate sizes
-            total_size_kb = len(json.dumps(upload_data, default=str).encode()) / 1024
+            total_size_kb = len(dumps_compact(upload_data).encode()) / 1024
             vectorized_text = (
                 upload_data["description"] + " " +
                 upload_data["businessPurpose"] + " " +
@@ -131,42 +152,21 @@ def main():
             print(f"   📝 Vectorized text: {len(vectorized_text)} chars")
             print(f"   🎯 Table: {upload_data['tableName']}")
             
-            # Upload with timeout protection
-            max_retries = 2
-            success = False
-            
-            for attempt in range(max_retries):
-                try:
-                    print(f"   📤 Upload attempt {attempt + 1}/{max_retries}...")
-                    
-                    uuid = collection.data.insert(upload_data)
-                    print(f"      ✅ Success: {uuid}")
-                    successful_uploads += 1
-                    success = True
-                    break
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    print(f"      ❌ Attempt {attempt + 1} failed: {error_msg}")
-                    
-                    if "timeout" in error_msg.lower() and attempt < max_retries - 1:
-                        print(f"      ⏳ Waiting 5s before retry...")
-                        import time
-                        time.sleep(5)
-                    else:
-                        print(f"      💥 Upload failed for {upload_data['tableName']}")
-                        break
+            # Upload with retries for transient failures
+            try:
+                print(f"   📤 Uploading (up to {retry_policy.max_attempts} attempts)...")
+                uuid = retry_policy.call(insert_paced, collection, upload_data)
+                print(f"      ✅ Success: {uuid}")
+                successful_uploads += 1
+            except Exception:
+                print(f"      💥 Upload failed for {upload_data['tableName']}")
             
-            # Small delay between uploads
-            if success and i < len(yaml_files):
-                import time
-                time.sleep(1)
-        
         print(f"\n📊 Upload Summary:")
         print(f"   Successful uploads: {successful_uploads}/{len(yaml_files)}")
+        print(f"   Vectorized write rate: {rate_limiter.metrics()['rate_per_second']}/s")
+        print(f"   Retries: {retry_policy.metrics()['retries']}")
         
         # Verify final count
-        import time
         time.sleep(3)  # Wait for indexing
         
         try: